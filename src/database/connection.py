@@ -159,6 +159,11 @@ class DatabaseManager:
         if self._session_factory:
             self._session_factory.remove()
 
+    def dispose_after_fork(self):
+        """Drop pooled connections inherited from the parent process. Call first thing in a forked child."""
+        if self._engine:
+            self._engine.dispose(close=False)
+
 system_db_manager = DatabaseManager(SYSTEM_DB_URL, "SYSTEM")
 data_db_manager = DatabaseManager(DATA_DB_URL, "DATA")
 
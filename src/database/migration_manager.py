@@ -2,7 +2,7 @@ import importlib
 import os
 from sqlalchemy import inspect
 from src.database.connection import system_db_manager, system_session_scope, Base
-from src.database.models import MigrationVersion, SystemConfig, User, UserRole, UserSession, UserPushConfig, ScraperModule, ScraperModuleConfig, ScraperModuleTask, SystemEvent
+from src.database.models import MigrationVersion, SystemConfig, User, UserRole, UserSession, UserPushConfig, ScraperModule, ScraperModuleConfig, ScraperModuleTask, SystemEvent, ScraperTaskRun, ScraperTaskLease
 from src.utils.logger.logger import Log
 from src.utils.event import EventManager
 
@@ -27,7 +27,9 @@ class MigrationManager:
             ScraperModule,
             ScraperModuleConfig,
             ScraperModuleTask,
-            SystemEvent
+            SystemEvent,
+            ScraperTaskRun,
+            ScraperTaskLease
         ]
 
         for model in tables_to_create:
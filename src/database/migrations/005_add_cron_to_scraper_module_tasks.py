@@ -0,0 +1,23 @@
+from src.database.connection import system_db_manager
+from src.database.models import ScraperModuleTask
+from src.utils.logger.logger import Log
+from sqlalchemy import inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Add cron column to scraper_module_tasks table"
+
+TAG = "MIGRATION_005"
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    columns = [c['name'] for c in inspector.get_columns(ScraperModuleTask.__tablename__)]
+    if 'cron' not in columns:
+        Log.i(TAG, f"Adding cron column to {ScraperModuleTask.__tablename__} table")
+        with engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE {ScraperModuleTask.__tablename__} ADD COLUMN cron VARCHAR(100)"))
+            conn.commit()
+    else:
+        Log.i(TAG, f"Column cron already exists in {ScraperModuleTask.__tablename__}.")
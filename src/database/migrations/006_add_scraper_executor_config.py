@@ -0,0 +1,44 @@
+from src.database.connection import system_session_scope
+from src.database.models import SystemConfig
+from src.utils.logger.logger import Log
+
+VERSION_CODE = 1
+DESCRIPTION = "Add scraper task executor configuration"
+
+TAG = "MIGRATION_006"
+
+DEFAULT_CONFIGS = [
+    {
+        "key": "scraper_worker_count",
+        "value": "0",
+        "default": "0",
+        "description": "config.scraper_worker_count.desc",
+        "type": "int",
+        "group": "scraper",
+        "options": None,
+        "is_editable": True,
+        "order": 10
+    }
+]
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    with system_session_scope() as session:
+        for config in DEFAULT_CONFIGS:
+            existing = session.query(SystemConfig).filter_by(key=config["key"]).first()
+            if not existing:
+                Log.i(TAG, f"Adding config: {config['key']}")
+                session.add(SystemConfig(
+                    key=config["key"],
+                    value=config["value"],
+                    default=config["default"],
+                    description=config["description"],
+                    type=config.get("type", "string"),
+                    group=config.get("group", "system"),
+                    options=config.get("options"),
+                    is_editable=config.get("is_editable", True),
+                    is_public=config.get("is_public", False),
+                    order=config.get("order", 0)
+                ))
+            else:
+                Log.i(TAG, f"Config {config['key']} already exists.")
@@ -0,0 +1,13 @@
+from src.database.connection import system_db_manager
+from src.database.models import ScraperTaskRun
+from sqlalchemy import inspect
+
+VERSION_CODE = 1
+DESCRIPTION = "Create scraper_task_runs table"
+
+def upgrade():
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    if not inspector.has_table(ScraperTaskRun.__tablename__):
+        ScraperTaskRun.__table__.create(engine)
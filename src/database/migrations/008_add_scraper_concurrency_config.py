@@ -0,0 +1,77 @@
+from src.database.connection import system_session_scope
+from src.database.models import SystemConfig
+from src.utils.logger.logger import Log
+
+VERSION_CODE = 1
+DESCRIPTION = "Add scraper concurrency and queue configuration"
+
+TAG = "MIGRATION_008"
+
+DEFAULT_CONFIGS = [
+    {
+        "key": "scraper_max_concurrency",
+        "value": "0",
+        "default": "0",
+        "description": "config.scraper_max_concurrency.desc",
+        "type": "int",
+        "group": "scraper",
+        "options": None,
+        "is_editable": True,
+        "order": 11
+    },
+    {
+        "key": "scraper_module_max_concurrency",
+        "value": "1",
+        "default": "1",
+        "description": "config.scraper_module_max_concurrency.desc",
+        "type": "int",
+        "group": "scraper",
+        "options": None,
+        "is_editable": True,
+        "order": 12
+    },
+    {
+        "key": "scraper_queue_size",
+        "value": "100",
+        "default": "100",
+        "description": "config.scraper_queue_size.desc",
+        "type": "int",
+        "group": "scraper",
+        "options": None,
+        "is_editable": True,
+        "order": 13
+    },
+    {
+        "key": "scraper_queue_policy",
+        "value": "coalesce",
+        "default": "coalesce",
+        "description": "config.scraper_queue_policy.desc",
+        "type": "select",
+        "group": "scraper",
+        "options": ["coalesce", "drop_new", "drop_oldest"],
+        "is_editable": True,
+        "order": 14
+    }
+]
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    with system_session_scope() as session:
+        for config in DEFAULT_CONFIGS:
+            existing = session.query(SystemConfig).filter_by(key=config["key"]).first()
+            if not existing:
+                Log.i(TAG, f"Adding config: {config['key']}")
+                session.add(SystemConfig(
+                    key=config["key"],
+                    value=config["value"],
+                    default=config["default"],
+                    description=config["description"],
+                    type=config.get("type", "string"),
+                    group=config.get("group", "system"),
+                    options=config.get("options"),
+                    is_editable=config.get("is_editable", True),
+                    is_public=config.get("is_public", False),
+                    order=config.get("order", 0)
+                ))
+            else:
+                Log.i(TAG, f"Config {config['key']} already exists.")
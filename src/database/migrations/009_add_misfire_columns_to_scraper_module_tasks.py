@@ -0,0 +1,28 @@
+from src.database.connection import system_db_manager
+from src.database.models import ScraperModuleTask
+from src.utils.logger.logger import Log
+from sqlalchemy import inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Add last fire time and misfire policy columns to scraper_module_tasks table"
+
+TAG = "MIGRATION_009"
+
+NEW_COLUMNS = {
+    "last_fire_at": "BIGINT",
+    "misfire_policy": "VARCHAR(20) NOT NULL DEFAULT 'coalesce'",
+    "misfire_grace": "INTEGER NOT NULL DEFAULT 3600"
+}
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    columns = [c['name'] for c in inspector.get_columns(ScraperModuleTask.__tablename__)]
+    with engine.connect() as conn:
+        for name, definition in NEW_COLUMNS.items():
+            if name not in columns:
+                Log.i(TAG, f"Adding {name} column to {ScraperModuleTask.__tablename__} table")
+                conn.execute(text(f"ALTER TABLE {ScraperModuleTask.__tablename__} ADD COLUMN {name} {definition}"))
+        conn.commit()
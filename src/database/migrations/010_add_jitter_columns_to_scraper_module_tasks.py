@@ -0,0 +1,27 @@
+from src.database.connection import system_db_manager
+from src.database.models import ScraperModuleTask
+from src.utils.logger.logger import Log
+from sqlalchemy import inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Add jitter and spread columns to scraper_module_tasks table"
+
+TAG = "MIGRATION_010"
+
+NEW_COLUMNS = {
+    "jitter": "INTEGER NOT NULL DEFAULT 0",
+    "spread": "BOOLEAN NOT NULL DEFAULT FALSE"
+}
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    columns = [c['name'] for c in inspector.get_columns(ScraperModuleTask.__tablename__)]
+    with engine.connect() as conn:
+        for name, definition in NEW_COLUMNS.items():
+            if name not in columns:
+                Log.i(TAG, f"Adding {name} column to {ScraperModuleTask.__tablename__} table")
+                conn.execute(text(f"ALTER TABLE {ScraperModuleTask.__tablename__} ADD COLUMN {name} {definition}"))
+        conn.commit()
@@ -0,0 +1,13 @@
+from src.database.connection import system_db_manager
+from src.database.models import ScraperTaskLease
+from sqlalchemy import inspect
+
+VERSION_CODE = 1
+DESCRIPTION = "Create scraper_task_leases table"
+
+def upgrade():
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    if not inspector.has_table(ScraperTaskLease.__tablename__):
+        ScraperTaskLease.__table__.create(engine)
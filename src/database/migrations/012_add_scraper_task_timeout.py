@@ -0,0 +1,55 @@
+from src.database.connection import system_db_manager, system_session_scope
+from src.database.models import ScraperModuleTask, SystemConfig
+from src.utils.logger.logger import Log
+from sqlalchemy import inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Add per-task timeout column and default scraper task timeout configuration"
+
+TAG = "MIGRATION_012"
+
+DEFAULT_CONFIGS = [
+    {
+        "key": "scraper_task_timeout",
+        "value": "1800",
+        "default": "1800",
+        "description": "config.scraper_task_timeout.desc",
+        "type": "int",
+        "group": "scraper",
+        "options": None,
+        "is_editable": True,
+        "order": 15
+    }
+]
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    columns = [c['name'] for c in inspector.get_columns(ScraperModuleTask.__tablename__)]
+    if 'timeout' not in columns:
+        Log.i(TAG, f"Adding timeout column to {ScraperModuleTask.__tablename__} table")
+        with engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE {ScraperModuleTask.__tablename__} ADD COLUMN timeout INTEGER NOT NULL DEFAULT 0"))
+            conn.commit()
+
+    with system_session_scope() as session:
+        for config in DEFAULT_CONFIGS:
+            existing = session.query(SystemConfig).filter_by(key=config["key"]).first()
+            if not existing:
+                Log.i(TAG, f"Adding config: {config['key']}")
+                session.add(SystemConfig(
+                    key=config["key"],
+                    value=config["value"],
+                    default=config["default"],
+                    description=config["description"],
+                    type=config.get("type", "string"),
+                    group=config.get("group", "system"),
+                    options=config.get("options"),
+                    is_editable=config.get("is_editable", True),
+                    is_public=config.get("is_public", False),
+                    order=config.get("order", 0)
+                ))
+            else:
+                Log.i(TAG, f"Config {config['key']} already exists.")
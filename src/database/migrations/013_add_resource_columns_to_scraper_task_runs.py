@@ -0,0 +1,31 @@
+from src.database.connection import system_db_manager
+from src.database.models import ScraperTaskRun
+from src.utils.logger.logger import Log
+from sqlalchemy import inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Add resource usage columns to scraper_task_runs table"
+
+TAG = "MIGRATION_013"
+
+NEW_COLUMNS = {
+    "cpu_user_ms": "INTEGER",
+    "cpu_sys_ms": "INTEGER",
+    "peak_rss_kb": "INTEGER",
+    "rss_delta_kb": "INTEGER",
+    "io_read_bytes": "BIGINT",
+    "io_write_bytes": "BIGINT"
+}
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    columns = [c['name'] for c in inspector.get_columns(ScraperTaskRun.__tablename__)]
+    with engine.connect() as conn:
+        for name, definition in NEW_COLUMNS.items():
+            if name not in columns:
+                Log.i(TAG, f"Adding {name} column to {ScraperTaskRun.__tablename__} table")
+                conn.execute(text(f"ALTER TABLE {ScraperTaskRun.__tablename__} ADD COLUMN {name} {definition}"))
+        conn.commit()
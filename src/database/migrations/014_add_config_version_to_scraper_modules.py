@@ -0,0 +1,21 @@
+from src.database.connection import system_db_manager
+from src.database.models import ScraperModule
+from src.utils.logger.logger import Log
+from sqlalchemy import inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Add config_version column to scraper_modules table"
+
+TAG = "MIGRATION_014"
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    engine = system_db_manager._engine
+    inspector = inspect(engine)
+
+    columns = [c['name'] for c in inspector.get_columns(ScraperModule.__tablename__)]
+    if 'config_version' not in columns:
+        Log.i(TAG, f"Adding config_version column to {ScraperModule.__tablename__} table")
+        with engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE {ScraperModule.__tablename__} ADD COLUMN config_version INTEGER NOT NULL DEFAULT 0"))
+            conn.commit()
@@ -0,0 +1,55 @@
+from src.database.connection import system_session_scope
+from src.database.models import SystemConfig
+from src.utils.logger.logger import Log
+
+VERSION_CODE = 1
+DESCRIPTION = "Add scraper module sandbox configuration"
+
+TAG = "MIGRATION_016"
+
+DEFAULT_CONFIGS = [
+    {
+        "key": "scraper_module_sandbox",
+        "value": "off",
+        "default": "off",
+        "description": "config.scraper_module_sandbox.desc",
+        "type": "select",
+        "group": "scraper",
+        "options": ["off", "external", "all"],
+        "is_editable": True,
+        "order": 17
+    },
+    {
+        "key": "scraper_sandbox_max_tasks",
+        "value": "100",
+        "default": "100",
+        "description": "config.scraper_sandbox_max_tasks.desc",
+        "type": "int",
+        "group": "scraper",
+        "options": None,
+        "is_editable": True,
+        "order": 18
+    }
+]
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    with system_session_scope() as session:
+        for config in DEFAULT_CONFIGS:
+            existing = session.query(SystemConfig).filter_by(key=config["key"]).first()
+            if not existing:
+                Log.i(TAG, f"Adding config: {config['key']}")
+                session.add(SystemConfig(
+                    key=config["key"],
+                    value=config["value"],
+                    default=config["default"],
+                    description=config["description"],
+                    type=config.get("type", "string"),
+                    group=config.get("group", "system"),
+                    options=config.get("options"),
+                    is_editable=config.get("is_editable", True),
+                    is_public=config.get("is_public", False),
+                    order=config.get("order", 0)
+                ))
+            else:
+                Log.i(TAG, f"Config {config['key']} already exists.")
@@ -0,0 +1,14 @@
+from src.database.connection import data_db_manager
+from src.database.models import NewsItem
+from sqlalchemy import inspect
+
+VERSION_CODE = 1
+DESCRIPTION = "Create news_items table in the data database"
+
+def upgrade():
+    data_db_manager.init_db()
+    engine = data_db_manager._engine
+    inspector = inspect(engine)
+
+    if not inspector.has_table(NewsItem.__tablename__):
+        NewsItem.__table__.create(engine)
@@ -0,0 +1,34 @@
+from src.database.connection import data_db_manager
+from src.database.models import NewsItem
+from sqlalchemy import Index, inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Replace the news_items fingerprint index with a unique (module_id, fingerprint) index"
+
+def upgrade():
+    data_db_manager.init_db()
+    engine = data_db_manager._engine
+    inspector = inspect(engine)
+
+    if not inspector.has_table(NewsItem.__tablename__):
+        NewsItem.__table__.create(engine)
+        return
+
+    indexes = {index["name"] for index in inspector.get_indexes(NewsItem.__tablename__)}
+    if "ix_news_items_module_fingerprint" in indexes:
+        return
+
+    table = NewsItem.__table__
+    with engine.begin() as conn:
+        # Keep the first stored copy of every fingerprint (ids are random, they only break ties). The derived
+        # table lets MySQL delete from the table it reads.
+        conn.execute(text(
+            "DELETE FROM news_items WHERE id IN ("
+            "SELECT id FROM (SELECT later.id FROM news_items later JOIN news_items earlier "
+            "ON earlier.module_id = later.module_id AND earlier.fingerprint = later.fingerprint "
+            "AND (earlier.created_at < later.created_at "
+            "OR (earlier.created_at = later.created_at AND earlier.id < later.id))) AS duplicates)"
+        ))
+        if "ix_news_items_fingerprint" in indexes:
+            Index("ix_news_items_fingerprint", table.c.fingerprint).drop(conn)
+        Index("ix_news_items_module_fingerprint", table.c.module_id, table.c.fingerprint, unique=True).create(conn)
@@ -0,0 +1,15 @@
+from src.database.connection import data_db_manager
+from src.scraper.storage.news_partitions import create_search_index
+from src.utils.logger.logger import Log
+
+VERSION_CODE = 1
+DESCRIPTION = "Create the FTS5 full-text index over news_items"
+TAG = "MIGRATION_019"
+
+def upgrade():
+    data_db_manager.init_db()
+    with data_db_manager._engine.begin() as conn:
+        if create_search_index(conn):
+            Log.i(TAG, "Full-text index news_items_fts created")
+        else:
+            Log.i(TAG, "Full-text index not supported by the data database, search uses LIKE")
@@ -0,0 +1,31 @@
+from src.database.connection import data_db_manager
+from src.database.models import NewsItem
+from src.utils.logger.logger import Log
+from sqlalchemy import Index, inspect, text
+
+VERSION_CODE = 1
+DESCRIPTION = "Add simhash and canonical_id columns to news_items table"
+
+TAG = "MIGRATION_020"
+
+NEW_COLUMNS = {
+    "simhash": "BIGINT",
+    "canonical_id": "VARCHAR(36)"
+}
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    data_db_manager.init_db()
+    engine = data_db_manager._engine
+    inspector = inspect(engine)
+
+    columns = [c['name'] for c in inspector.get_columns(NewsItem.__tablename__)]
+    indexes = {index["name"] for index in inspector.get_indexes(NewsItem.__tablename__)}
+    with engine.connect() as conn:
+        for name, definition in NEW_COLUMNS.items():
+            if name not in columns:
+                Log.i(TAG, f"Adding {name} column to {NewsItem.__tablename__} table")
+                conn.execute(text(f"ALTER TABLE {NewsItem.__tablename__} ADD COLUMN {name} {definition}"))
+        if "ix_news_items_canonical" not in indexes:
+            Index("ix_news_items_canonical", NewsItem.__table__.c.canonical_id).create(conn)
+        conn.commit()
@@ -0,0 +1,49 @@
+from src.database.connection import data_db_manager
+from src.database.models import NewsItem
+from src.scraper.storage.news_partitions import FTS_TABLE, NewsPartitions, row_partition_key
+from src.utils.logger.logger import Log
+from sqlalchemy import inspect, select, text
+from collections import defaultdict
+
+VERSION_CODE = 1
+DESCRIPTION = "Move news_items of the data database into month partitions"
+
+TAG = "MIGRATION_021"
+
+CHUNK_SIZE = 5000
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    data_db_manager.init_db()
+    engine = data_db_manager._engine
+    inspector = inspect(engine)
+
+    if not inspector.has_table(NewsItem.__tablename__):
+        return
+
+    partitions = NewsPartitions()
+    table = NewsItem.__table__
+    moved = 0
+    try:
+        with engine.connect() as source:
+            result = source.execute(select(table).execution_options(yield_per=CHUNK_SIZE))
+            for chunk in result.partitions(CHUNK_SIZE):
+                by_partition = defaultdict(list)
+                for row in chunk:
+                    values = dict(row._mapping)
+                    by_partition[row_partition_key(values)].append(values)
+                for key, rows in by_partition.items():
+                    partition = partitions.get(key, create=True)
+                    with partition.engine.begin() as conn:
+                        conn.execute(partition.table.insert(), rows)
+                moved += len(chunk)
+
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                # Its triggers go with news_items
+                conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+            table.drop(conn)
+    finally:
+        # Opened in the main process, the scraper and web processes must not inherit the connections
+        partitions.close()
+    Log.i(TAG, f"Moved {moved} news items into {len(partitions.keys())} month partitions")
@@ -0,0 +1,54 @@
+from src.database.connection import system_session_scope
+from src.database.models import SystemConfig
+from src.utils.logger.logger import Log
+
+VERSION_CODE = 1
+DESCRIPTION = "Add news item retention configuration"
+
+TAG = "MIGRATION_022"
+
+DEFAULT_CONFIGS = [
+    {
+        "key": "scraper_news_retention_months",
+        "value": "0",
+        "default": "0",
+        "description": "config.scraper_news_retention_months.desc",
+        "type": "int",
+        "group": "scraper",
+        "is_editable": True,
+        "order": 19
+    },
+    {
+        "key": "scraper_news_retention_action",
+        "value": "drop",
+        "default": "drop",
+        "description": "config.scraper_news_retention_action.desc",
+        "type": "select",
+        "group": "scraper",
+        "options": ["drop", "archive"],
+        "is_editable": True,
+        "order": 20
+    }
+]
+
+def upgrade():
+    Log.i(TAG, "Starting upgrade...")
+    with system_session_scope() as session:
+        for config in DEFAULT_CONFIGS:
+            existing = session.query(SystemConfig).filter_by(key=config["key"]).first()
+            if not existing:
+                Log.i(TAG, f"Adding config: {config['key']}")
+                session.add(SystemConfig(
+                    key=config["key"],
+                    value=config["value"],
+                    default=config["default"],
+                    description=config["description"],
+                    type=config.get("type", "string"),
+                    group=config.get("group", "system"),
+                    options=config.get("options"),
+                    is_editable=config.get("is_editable", True),
+                    is_public=config.get("is_public", False),
+                    order=config.get("order", 0)
+                ))
+            else:
+                Log.i(TAG, f"Config {config['key']} already exists.")
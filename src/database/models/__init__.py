@@ -7,3 +7,6 @@ from .scraper_module import ScraperModule
 from .scraper_config import ScraperModuleConfig
 from .scraper_module_task import ScraperModuleTask
 from .system_event import SystemEvent
+from .scraper_task_run import ScraperTaskRun
+from .scraper_task_lease import ScraperTaskLease
+from .news_item import NewsItem
@@ -0,0 +1,60 @@
+from sqlalchemy import Column, String, Text, BigInteger, Index
+from sqlalchemy.dialects.sqlite import JSON
+from src.database.models.base_model import BaseModel
+
+class NewsItem(BaseModel):
+    """
+    A structured result saved by a scraper module. Defines the news_items table of every month partition,
+    see NewsPartitions. Partitions are read with Core, row_to_dict maps their rows.
+    """
+    __tablename__ = 'news_items'
+
+    module_id = Column(String(100), nullable=False)
+    fingerprint = Column(String(255), nullable=True)
+    title = Column(Text, nullable=False, default="")
+    summary = Column(Text, nullable=True)
+    source = Column(String(255), nullable=True)
+    from_url = Column(Text, nullable=True)
+    content = Column(Text, nullable=True)
+    content_type = Column(String(20), nullable=True)
+    # Epoch milliseconds, parsed from the ISO string modules produce
+    datetime_released = Column(BigInteger, nullable=True)
+    quotation = Column(JSON, nullable=True)
+    tags = Column(JSON, nullable=True)
+    meta = Column(JSON, nullable=True)
+    # SimHash of title and content (signed), None for texts too short to compare
+    simhash = Column(BigInteger, nullable=True)
+    # The first item of the same story from any source, None when this item is the canonical one
+    canonical_id = Column(String(36), nullable=True)
+
+    __table_args__ = (
+        Index('ix_news_items_released', 'datetime_released'),
+        Index('ix_news_items_module_released', 'module_id', 'datetime_released'),
+        # Deduplication key, rows without a fingerprint are never considered equal
+        Index('ix_news_items_module_fingerprint', 'module_id', 'fingerprint', unique=True),
+        Index('ix_news_items_canonical', 'canonical_id'),
+        Index('ix_news_items_created', 'created_at'),
+    )
+
+    def to_dict(self):
+        return NewsItem.row_to_dict(self)
+
+    @staticmethod
+    def row_to_dict(row):
+        return {
+            "id": row.id,
+            "module_id": row.module_id,
+            "fingerprint": row.fingerprint,
+            "title": row.title,
+            "summary": row.summary,
+            "source": row.source,
+            "from_url": row.from_url,
+            "content": row.content,
+            "content_type": row.content_type,
+            "datetime_released": row.datetime_released,
+            "quotation": row.quotation,
+            "tags": row.tags,
+            "metadata": row.meta,
+            "canonical_id": row.canonical_id,
+            "created_at": row.created_at
+        }
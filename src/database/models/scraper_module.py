@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text
+from sqlalchemy import Column, String, Boolean, Text, Integer
 from sqlalchemy.dialects.sqlite import JSON
 from src.database.models.base_model import BaseModel
 
@@ -13,3 +13,5 @@ class ScraperModule(BaseModel):
     meta = Column(JSON, nullable=True)
     source = Column(String(20), nullable=True, default="unknown")
     is_enable = Column(Boolean, default=False, nullable=False)
+    # Incremented on every config write so cached config snapshots can tell they are stale
+    config_version = Column(Integer, default=0, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Text, Integer, Boolean, BigInteger, ForeignKey, UniqueConstraint
 from src.database.models.base_model import BaseModel
 
 class ScraperModuleTask(BaseModel):
@@ -8,6 +8,13 @@ class ScraperModuleTask(BaseModel):
     task_key = Column(String(100), nullable=False)
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
+    cron = Column(String(100), nullable=True)
+    last_fire_at = Column(BigInteger, nullable=True)
+    misfire_policy = Column(String(20), nullable=False, default="coalesce")
+    misfire_grace = Column(Integer, nullable=False, default=3600)
+    jitter = Column(Integer, nullable=False, default=0)
+    spread = Column(Boolean, nullable=False, default=False)
+    timeout = Column(Integer, nullable=False, default=0)
 
     __table_args__ = (
         UniqueConstraint('module_id', 'task_key', name='uix_module_task_key'),
@@ -20,6 +27,13 @@ class ScraperModuleTask(BaseModel):
             "task_key": self.task_key,
             "name": self.name,
             "description": self.description,
+            "cron": self.cron,
+            "last_fire_at": self.last_fire_at,
+            "misfire_policy": self.misfire_policy,
+            "misfire_grace": self.misfire_grace,
+            "jitter": self.jitter,
+            "spread": self.spread,
+            "timeout": self.timeout,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
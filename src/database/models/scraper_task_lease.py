@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, Integer, BigInteger, UniqueConstraint, Index
+from src.database.models.base_model import BaseModel
+
+class ScraperTaskLease(BaseModel):
+    __tablename__ = 'scraper_task_leases'
+
+    module_id = Column(String(100), nullable=False)
+    task_key = Column(String(100), nullable=False)
+    fire_at = Column(BigInteger, nullable=False)
+    owner = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default="running")
+    attempts = Column(Integer, nullable=False, default=1)
+    heartbeat_at = Column(BigInteger, nullable=False)
+    expires_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('module_id', 'task_key', 'fire_at', name='uix_task_lease_fire'),
+        Index('ix_scraper_task_leases_status_expires', 'status', 'expires_at'),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "module_id": self.module_id,
+            "task_key": self.task_key,
+            "fire_at": self.fire_at,
+            "owner": self.owner,
+            "status": self.status,
+            "attempts": self.attempts,
+            "heartbeat_at": self.heartbeat_at,
+            "expires_at": self.expires_at
+        }
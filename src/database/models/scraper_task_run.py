@@ -0,0 +1,49 @@
+from sqlalchemy import Column, String, Text, Integer, BigInteger, ForeignKey, Index
+from src.database.models.base_model import BaseModel
+
+class ScraperTaskRun(BaseModel):
+    __tablename__ = 'scraper_task_runs'
+
+    task_id = Column(String(36), ForeignKey('scraper_module_tasks.id'), nullable=False)
+    module_id = Column(String(36), ForeignKey('scraper_modules.id'), nullable=False, index=True)
+    task_key = Column(String(100), nullable=False)
+    scheduled_at = Column(BigInteger, nullable=True)
+    started_at = Column(BigInteger, nullable=False)
+    finished_at = Column(BigInteger, nullable=False)
+    duration_ms = Column(Integer, nullable=False, default=0)
+    item_count = Column(Integer, nullable=False, default=0)
+    bytes_fetched = Column(BigInteger, nullable=False, default=0)
+    cpu_user_ms = Column(Integer, nullable=True)
+    cpu_sys_ms = Column(Integer, nullable=True)
+    peak_rss_kb = Column(Integer, nullable=True)
+    rss_delta_kb = Column(Integer, nullable=True)
+    io_read_bytes = Column(BigInteger, nullable=True)
+    io_write_bytes = Column(BigInteger, nullable=True)
+    status = Column(String(20), nullable=False)
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('ix_scraper_task_runs_task_started', 'task_id', 'started_at'),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "task_id": self.task_id,
+            "module_id": self.module_id,
+            "task_key": self.task_key,
+            "scheduled_at": self.scheduled_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": self.duration_ms,
+            "item_count": self.item_count,
+            "bytes_fetched": self.bytes_fetched,
+            "cpu_user_ms": self.cpu_user_ms,
+            "cpu_sys_ms": self.cpu_sys_ms,
+            "peak_rss_kb": self.peak_rss_kb,
+            "rss_delta_kb": self.rss_delta_kb,
+            "io_read_bytes": self.io_read_bytes,
+            "io_write_bytes": self.io_write_bytes,
+            "status": self.status,
+            "error": self.error
+        }
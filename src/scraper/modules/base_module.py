@@ -26,6 +26,13 @@ class BaseModule(ABC):
         """
         return self._context.set_module_config(key, description, value, value_type, options, force_init, hint, regular)
 
+    def set_module_configs(self, configs: List[Dict[str, Any]]):
+        """
+        Set several configuration parameters in one transaction.
+        :param configs: Dicts with the arguments of set_module_config (key, description, value, value_type, ...)
+        """
+        return self._context.set_module_configs(configs)
+
     def get_module_config(self, key: str) -> str:
         """
         Get configuration from database.
@@ -38,15 +45,32 @@ class BaseModule(ABC):
         """
         return self._context.drop_module_config(key)
 
-    def set_module_schedule_task(self, key: str, description: str, name: str = "", force_init: bool = False):
+    def set_module_schedule_task(self, key: str, description: str, name: str = "", force_init: bool = False, cron: str = "",
+                                 misfire_policy: str = None, misfire_grace: int = None, jitter: int = None,
+                                 spread: bool = None, timeout: int = None):
         """
         Set a scheduled task preset for the module.
         :param key: Task key (unique within module)
         :param description: Task description
         :param name: Human-readable name for the task
         :param force_init: If True, resets the task preset
+        :param cron: Default cron expression (e.g., "0 * * * *"). Empty means the task is never scheduled.
+        :param misfire_policy: What to do with fires missed while the service was down:
+                               "skip", "coalesce" (run once, default) or "catch_up" (run each missed fire)
+        :param misfire_grace: Seconds a missed fire stays eligible to run (default 3600)
+        :param jitter: Seconds each fire is delayed by at most, using a stable per-task offset (default 0)
+        :param spread: If True, the offset is taken from the whole cron interval instead of the jitter window
+        :param timeout: Seconds a run may take before it is stopped, 0 for the service default
+        """
+        return self._context.set_module_schedule_task(key, description, name, force_init, cron,
+                                                      misfire_policy, misfire_grace, jitter, spread, timeout)
+
+    def set_module_schedule_tasks(self, tasks: List[Dict[str, Any]]):
+        """
+        Set several scheduled task presets in one transaction.
+        :param tasks: Dicts with the arguments of set_module_schedule_task (key, description, name, cron, ...)
         """
-        return self._context.set_module_schedule_task(key, description, name, force_init)
+        return self._context.set_module_schedule_tasks(tasks)
 
     def get_module_schedule_task(self, key: str):
         """
@@ -72,6 +96,33 @@ class BaseModule(ABC):
         """
         return self._context.save_structured_results(value, fingerprint)
 
+    def filter_new_fingerprints(self, fingerprints: List[str]) -> List[str]:
+        """
+        Keep the fingerprints this module has not saved yet. Check a page of items before tagging them,
+        so repeats cost no tagging; save_structured_results skips repeats either way.
+        """
+        return self._context.filter_new_fingerprints(fingerprints)
+
+    def report_fetched_bytes(self, size: int):
+        """
+        Add downloaded bytes to the statistics of the running scheduled task.
+        """
+        return self._context.report_fetched_bytes(size)
+
+    @property
+    def deadline(self):
+        """
+        Epoch seconds by which the running scheduled task must finish, None without a limit.
+        """
+        return self._context.deadline
+
+    def should_stop(self) -> bool:
+        """
+        True once the running scheduled task passed its deadline. Long tasks should check it between
+        units of work and return what they have; a task that keeps running is killed shortly after.
+        """
+        return self._context.should_stop()
+
     # ==========================================
     # Listener Interface (To be implemented)
     # ==========================================
@@ -110,6 +161,14 @@ class BaseModule(ABC):
         """
         return True
 
+    async def execute_schedule_task_async(self, cron: str, task_key: str, timestamp: datetime) -> bool:
+        """
+        Optional coroutine variant of execute_schedule_task for I/O-bound modules.
+        When overridden, the scraper service awaits it on its shared event loop instead of
+        running execute_schedule_task in a worker process. Avoid blocking calls inside.
+        """
+        return self.execute_schedule_task(cron, task_key, timestamp)
+
     def generate_html(self, value: Any) -> Optional[str]:
         """
         Generate HTML representation of the data.
@@ -19,24 +19,23 @@ MODULE_META = {
 class TelegramChannelModule(BaseModule):
     def enable_module(self) -> bool:
         list_conf = service.get_init_configs()
+        self.set_module_configs([{
+            "key": conf["key"],
+            "description": conf["description"],
+            "value": conf["value"],
+            "hint": conf["hint"],
+            "regular": conf["regular"],
+            "value_type": conf["value_type"]
+        } for conf in list_conf])
 
-        for conf in list_conf:
-            Log.w(TAG, conf)
-            self.set_module_config(
-                key=conf["key"],
-                description=conf["description"],
-                value=conf["value"],
-                hint=conf["hint"],
-                regular=conf["regular"],
-                value_type=conf["value_type"]
-            )
         list_tasks = service.get_init_schedule_tasks()
-        for task in list_tasks:
-            self.set_module_schedule_task(
-                key=task["key"],
-                description=task["description"],
-                name=task["name"]
-            )
+        self.set_module_schedule_tasks([{
+            "key": task["key"],
+            "description": task["description"],
+            "name": task["name"],
+            "cron": task["cron"],
+            "spread": task.get("spread")
+        } for task in list_tasks])
         Log.i(TAG, "Module enabled")
         return True
 
@@ -56,6 +55,9 @@ class TelegramChannelModule(BaseModule):
     def execute_schedule_task(self, cron: str, task_key: str, timestamp: datetime) -> bool:
         return service.execute_schedule_task(self, cron, task_key, timestamp)
 
+    async def execute_schedule_task_async(self, cron: str, task_key: str, timestamp: datetime) -> bool:
+        return await service.execute_schedule_task_async(self, cron, task_key, timestamp)
+
     def generate_html(self, value) -> None:
         return None
 
@@ -1,3 +1,4 @@
+import asyncio
 import requests
 from bs4 import BeautifulSoup
 import re
@@ -151,58 +152,108 @@ def parse_single_message(msg, channel_display_name, target_tz_offset):
     }
 
 
-def fetch_channel(channel_url, lookback_days, target_tz_offset, max_pages):
-    now_utc = datetime.now(timezone.utc)
-    cutoff_date = now_utc - timedelta(days=lookback_days)
+def scrape_page(current_url, channel_url, channel_display_name, cutoff_date, target_tz_offset, is_first_page):
+    """
+    Fetch and parse one page of a channel.
+    :return: (channel_display_name, items, next_url or None when paging should stop, response size in bytes)
+    """
+    res = requests.get(current_url, headers=headers, timeout=15)
+    fetched_bytes = len(res.content)
+    soup = BeautifulSoup(res.text, 'html.parser')
+
+    if not channel_display_name:
+        title_tag = soup.find('div', class_='tgme_channel_info_header_title')
+        if title_tag:
+            channel_display_name = title_tag.get_text(strip=True)
+        elif is_first_page:
+            channel_display_name = channel_url.split('/')[-1]
+
+    messages = soup.find_all('div', class_='tgme_widget_message')
+    if not messages:
+        return channel_display_name, [], None, fetched_bytes
+
+    items = []
+    first_msg_date = get_message_date(messages[0])
+    for msg in messages:
+        msg_date = get_message_date(msg)
+        if not msg_date or msg_date < cutoff_date:
+            continue
+
+        item = parse_single_message(msg, channel_display_name or channel_url.split('/')[-1], target_tz_offset)
+        if item:
+            items.append(item)
+
+    next_url = None
+    if first_msg_date and first_msg_date > cutoff_date:
+        post_data = messages[0].get('data-post')
+        if post_data and '/' in post_data:
+            next_url = f"{get_base_url(channel_url)}?before={post_data.split('/')[-1]}"
+    return channel_display_name, items, next_url, fetched_bytes
+
+
+def get_base_url(channel_url):
+    return channel_url.replace("t.me/", "t.me/s/") if "/s/" not in channel_url else channel_url
+
+
+def get_cutoff_date(lookback_days):
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=lookback_days)
     Log.i(TAG, f"Start scraping. Cutoff: {cutoff_date.strftime('%Y-%m-%d')}")
-    base_url = channel_url.replace("t.me/", "t.me/s/") if "/s/" not in channel_url else channel_url
-    current_url = base_url
+    return cutoff_date
+
+
+def fetch_channel(channel_url, lookback_days, target_tz_offset, max_pages, on_fetched=None, should_stop=None):
+    """
+    :param should_stop: Checked before each page; once it returns True the pages fetched so far are returned.
+    """
+    cutoff_date = get_cutoff_date(lookback_days)
+    current_url = get_base_url(channel_url)
     page_count = 0
-    items_count = 0
     result_list = []
-    
     channel_display_name = None
-    
+
     while page_count < max_pages:
+        if should_stop and should_stop():
+            Log.w(TAG, f"[{channel_url.split('/')[-1]}] Deadline reached, stopping after {page_count} pages")
+            break
         page_count += 1
-        res = requests.get(current_url, headers=headers, timeout=15)
-        soup = BeautifulSoup(res.text, 'html.parser')
+        channel_display_name, items, next_url, fetched_bytes = scrape_page(
+            current_url, channel_url, channel_display_name, cutoff_date, target_tz_offset, page_count == 1)
+        if on_fetched:
+            on_fetched(fetched_bytes)
+        result_list.extend(items)
+        if not next_url:
+            break
+        current_url = next_url
+        time.sleep(1)
+    Log.i(TAG, f"[{channel_url.split('/')[-1]}] Scraped: {len(result_list)} items")
+    return result_list
 
-        if not channel_display_name:
-            title_tag = soup.find('div', class_='tgme_channel_info_header_title')
-            if title_tag:
-                channel_display_name = title_tag.get_text(strip=True)
-            else:
-                if page_count == 1:
-                    channel_display_name = channel_url.split('/')[-1]
-        
-        messages = soup.find_all('div', class_='tgme_widget_message')
-        if not messages: break
-        
-        time_tag = messages[0].find('time', class_='time')
-        if time_tag:
-            raw_time_str = time_tag.get('datetime')
-            try:
-                first_msg_date = datetime.fromisoformat(raw_time_str)
-            except ValueError:
-                pass
-
-        first_msg_date = get_message_date(messages[0])
-        for msg in messages:
-            msg_date = get_message_date(msg)
-            if not msg_date or msg_date < cutoff_date:
-                continue
-
-            item = parse_single_message(msg, channel_display_name or channel_url.split('/')[-1], target_tz_offset)
-            if item:
-                result_list.append(item)
-                items_count += 1
-        if first_msg_date and first_msg_date > cutoff_date:
-            post_data = messages[0].get('data-post')
-            if post_data and '/' in post_data:
-                current_url = f"{base_url}?before={post_data.split('/')[-1]}"
-                time.sleep(1)
-                continue
-        break
-    Log.i(TAG, f"[{channel_url.split('/')[-1]}] Scraped: {items_count} items")
+
+async def fetch_channel_async(channel_url, lookback_days, target_tz_offset, max_pages, on_fetched=None, should_stop=None):
+    """
+    Same as fetch_channel, but the blocking request and parsing run on the loop's executor
+    and the delay between pages does not hold the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    cutoff_date = get_cutoff_date(lookback_days)
+    current_url = get_base_url(channel_url)
+    page_count = 0
+    result_list = []
+    channel_display_name = None
+
+    while page_count < max_pages:
+        if should_stop and should_stop():
+            Log.w(TAG, f"[{channel_url.split('/')[-1]}] Deadline reached, stopping after {page_count} pages")
+            break
+        page_count += 1
+        channel_display_name, items, next_url, fetched_bytes = await loop.run_in_executor(
+            None, scrape_page, current_url, channel_url, channel_display_name, cutoff_date, target_tz_offset, page_count == 1)
+        if on_fetched:
+            on_fetched(fetched_bytes)
+        result_list.extend(items)
+        if not next_url:
+            break
+        current_url = next_url
+        await asyncio.sleep(1)
+    Log.i(TAG, f"[{channel_url.split('/')[-1]}] Scraped: {len(result_list)} items")
     return result_list
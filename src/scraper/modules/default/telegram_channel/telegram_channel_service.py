@@ -1,4 +1,4 @@
-import json
+import asyncio
 
 import src.scraper.modules.default.telegram_channel.telegram_channel_scraper as scraper
 from src.utils.logger.logger import Log
@@ -49,6 +49,8 @@ task_fetch = {
     "key": "fetch_news",
     "name": "module.telegram_channel.task.fetch_news.name",
     "description": "module.telegram_channel.task.fetch_news.desc",
+    "cron": "0 * * * *",
+    "spread": True,
     "force_init": False
 }
 
@@ -110,45 +112,107 @@ def test_configuration(module, config):
     
     return True, "All channels accessible"
 
+# Channels fetched at the same time by the async task, to stay polite towards t.me.
+MAX_CONCURRENT_CHANNELS = 4
+
+
+def get_configured_channels(module):
+    channels = module.get_module_config("channels")
+    if not channels:
+        return []
+
+    if isinstance(channels, str):
+         channels = [c.strip() for c in channels.split('\n') if c.strip()]
+
+    result = []
+    for channel in channels:
+        channel = str(channel).strip()
+        if not channel: continue
+
+        if not channel.startswith("http"):
+            if channel.startswith("t.me/"):
+                channel = f"https://{channel}"
+            else:
+                channel = f"https://t.me/s/{channel}"
+        if "t.me/" in channel and "/s/" not in channel:
+            channel = channel.replace("t.me/", "t.me/s/")
+        result.append(channel)
+    return result
+
+
+def get_fetch_params(module):
+    return (int(module.get_module_config(lookback_conf.get("key"))),
+            int(module.get_module_config(timezone_conf.get("key"))),
+            int(module.get_module_config(max_pages_conf.get("key"))))
+
+
+def save_messages(module, messages):
+    try:
+        new_urls = set(module.filter_new_fingerprints([message['from_url'] for message in messages]))
+        for message in messages:
+            if message['from_url'] not in new_urls:
+                continue
+            try:
+                tags = module.mark_message_tag(message['content'])
+                message['tags'] = tags
+            except Exception as e:
+                Log.w(TAG, f"Tagging failed: {e}")
+            module.save_structured_results(message, fingerprint=message['from_url'])
+    except Exception as e:
+        Log.e(TAG, e)
+        return False
+    return True
+
+
 def execute_schedule_task(module, cron: str, task_key: str, timestamp: datetime):
     if task_key == task_fetch.get("key"):
         Log.i(TAG, f"Executing task: {task_key}")
-        channels = module.get_module_config("channels")
+        channels = get_configured_channels(module)
         if not channels:
             Log.w(TAG, "No channels configured")
             return False
 
-        if isinstance(channels, str):
-             channels = [c.strip() for c in channels.split('\n') if c.strip()]
-
+        lookback_days, tz_offset, max_pages = get_fetch_params(module)
         for channel in channels:
-            channel = str(channel).strip()
-            if not channel: continue
-
-            if not channel.startswith("http"):
-                if channel.startswith("t.me/"):
-                    channel = f"https://{channel}"
-                else:
-                    channel = f"https://t.me/s/{channel}"
-            if "t.me/" in channel and "/s/" not in channel:
-                channel = channel.replace("t.me/", "t.me/s/")
-
-            messages = scraper.fetch_channel(channel,
-                                             int(module.get_module_config(lookback_conf.get("key"))),
-                                             int(module.get_module_config(timezone_conf.get("key"))),
-                                             int(module.get_module_config(max_pages_conf.get("key"))),
-                                             )
-            try:
-                for message in messages:
-                    try:
-                        tags = module.mark_message_tag(message['content'])
-                        message['tags'] = tags
-                    except Exception as e:
-                        Log.w(TAG, f"Tagging failed: {e}")
-                    module.save_structured_results(message, fingerprint=message['from_url'])
-            except Exception as e:
-                Log.e(TAG, e)
+            if module.should_stop():
+                Log.w(TAG, "Deadline reached, remaining channels skipped")
+                break
+            messages = scraper.fetch_channel(channel, lookback_days, tz_offset, max_pages,
+                                             on_fetched=module.report_fetched_bytes, should_stop=module.should_stop)
+            if not save_messages(module, messages):
                 return False
         Log.i(TAG, "Task completed successfully")
         return True
     return False
+
+
+async def execute_schedule_task_async(module, cron: str, task_key: str, timestamp: datetime):
+    if task_key == task_fetch.get("key"):
+        Log.i(TAG, f"Executing async task: {task_key}")
+        channels = get_configured_channels(module)
+        if not channels:
+            Log.w(TAG, "No channels configured")
+            return False
+
+        lookback_days, tz_offset, max_pages = get_fetch_params(module)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHANNELS)
+
+        async def fetch(channel):
+            async with semaphore:
+                return await scraper.fetch_channel_async(channel, lookback_days, tz_offset, max_pages,
+                                                         on_fetched=module.report_fetched_bytes,
+                                                         should_stop=module.should_stop)
+
+        results = await asyncio.gather(*(fetch(channel) for channel in channels), return_exceptions=True)
+        success = True
+        for channel, messages in zip(channels, results):
+            if isinstance(messages, Exception):
+                Log.e(TAG, f"Failed to fetch {channel}", error=messages)
+                success = False
+                continue
+            # Fingerprint lookups, tagging and the batch inserts block, they run off the shared event loop
+            if not await asyncio.to_thread(save_messages, module, messages):
+                success = False
+        Log.i(TAG, "Task completed successfully" if success else "Task completed with errors")
+        return success
+    return False
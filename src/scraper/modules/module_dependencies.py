@@ -0,0 +1,264 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import zipfile
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.utils.cache_manage import cache_manager
+from src.utils.logger.logger import Log
+
+TAG = "MODULE_DEPENDENCIES"
+
+# Written into a module's libs directory, holds the hash of the requirements it was built from.
+LIBS_STAMP = ".requirements.sha1"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _requirements_hash(req_path: str) -> str:
+    with open(req_path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class ModuleDependencyInstaller:
+    """
+    Installs module requirements through a shared wheelhouse and a content-addressed package store.
+
+    Wheels are resolved into cache/wheelhouse (offline first, PyPI only for what is missing), each wheel is
+    unpacked once into cache/package_store/<sha256>, and a module's libs directory only holds links into
+    the store. Modules depending on the same package share one copy on disk.
+    Installs of different modules run in parallel, the same module is installed by one caller at a time.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ModuleDependencyInstaller, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self.wheelhouse = cache_manager.get_cache_dir("wheelhouse")
+        self.store = cache_manager.get_cache_dir("package_store")
+        self._module_locks: Dict[str, threading.Lock] = {}
+        # Store entries of installs in progress, not linked from any libs yet but not prunable
+        self._pinned: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    def _module_lock(self, module_id: str) -> threading.Lock:
+        with self._lock:
+            return self._module_locks.setdefault(module_id, threading.Lock())
+
+    def install(self, module_id: str, module_dir: str, req_path: str) -> bool:
+        libs_dir = os.path.join(module_dir, "libs")
+        with self._module_lock(module_id):
+            req_hash = _requirements_hash(req_path)
+            if self._read_stamp(libs_dir) == req_hash:
+                Log.i(TAG, f"[{module_id}] Requirements unchanged, libs up to date")
+                return True
+
+            with tempfile.TemporaryDirectory(prefix="wheels-", dir=self.wheelhouse) as resolved_dir:
+                if not self._resolve_wheels(module_id, req_path, resolved_dir):
+                    return False
+                wheels = [os.path.join(resolved_dir, name) for name in sorted(os.listdir(resolved_dir)) if name.endswith(".whl")]
+                entries = []
+                try:
+                    for wheel in wheels:
+                        # Pinned before it is stored, so a concurrent prune cannot remove it in between
+                        entry = self._pin(self._entry_path(wheel))
+                        entries.append(entry)
+                        self._store_wheel(wheel, entry)
+                    self._build_libs(libs_dir, entries, req_hash)
+                finally:
+                    self._unpin(entries)
+
+            Log.i(TAG, f"[{module_id}] Linked {len(entries)} packages into {libs_dir}")
+            return True
+
+    def _pin(self, entry: str) -> str:
+        with self._lock:
+            self._pinned[entry] = self._pinned.get(entry, 0) + 1
+        return entry
+
+    def _unpin(self, entries: List[str]):
+        with self._lock:
+            for entry in entries:
+                count = self._pinned.get(entry, 1) - 1
+                if count > 0:
+                    self._pinned[entry] = count
+                else:
+                    self._pinned.pop(entry, None)
+
+    def _pip_wheel(self, req_path: str, target_dir: str, offline: bool) -> subprocess.CompletedProcess:
+        command = [sys.executable, "-m", "pip", "wheel", "-r", req_path, "-w", target_dir,
+                   "--find-links", self.wheelhouse, "--disable-pip-version-check", "--quiet"]
+        if offline:
+            command.append("--no-index")
+        return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    def _resolve_wheels(self, module_id: str, req_path: str, resolved_dir: str) -> bool:
+        """
+        Put the wheel of every package the requirements resolve to into resolved_dir and add new ones to the wheelhouse.
+        """
+        result = self._pip_wheel(req_path, resolved_dir, offline=True)
+        if result.returncode != 0:
+            Log.i(TAG, f"[{module_id}] Wheelhouse incomplete, fetching missing packages")
+            result = self._pip_wheel(req_path, resolved_dir, offline=False)
+        if result.returncode != 0:
+            Log.e(TAG, f"[{module_id}] Failed to resolve requirements: {result.stderr.strip()[-2000:]}")
+            return False
+
+        for name in os.listdir(resolved_dir):
+            target = os.path.join(self.wheelhouse, name)
+            if name.endswith(".whl") and not os.path.exists(target):
+                # Copy then rename, so other installs never see a partial wheel
+                partial = f"{target}.{os.getpid()}.{threading.get_ident()}.part"
+                shutil.copyfile(os.path.join(resolved_dir, name), partial)
+                os.replace(partial, target)
+        return True
+
+    def _entry_path(self, wheel: str) -> str:
+        """
+        :return: The store directory holding the unpacked wheel.
+        """
+        return os.path.join(self.store, _sha256(wheel))
+
+    def _store_wheel(self, wheel: str, entry: str):
+        """
+        Unpack the wheel into its store entry unless it is already there.
+        """
+        if os.path.isdir(entry):
+            return
+
+        unpack_dir = tempfile.mkdtemp(prefix=".unpack-", dir=self.store)
+        try:
+            with zipfile.ZipFile(wheel) as archive:
+                archive.extractall(unpack_dir)
+            # Files under <name>.data/purelib and platlib belong next to the packages, scripts and headers are not needed
+            for name in os.listdir(unpack_dir):
+                if not name.endswith(".data"):
+                    continue
+                data_dir = os.path.join(unpack_dir, name)
+                for scheme in ("purelib", "platlib"):
+                    scheme_dir = os.path.join(data_dir, scheme)
+                    if os.path.isdir(scheme_dir):
+                        for item in os.listdir(scheme_dir):
+                            os.replace(os.path.join(scheme_dir, item), os.path.join(unpack_dir, item))
+                shutil.rmtree(data_dir)
+            os.rename(unpack_dir, entry)
+        except OSError:
+            # Another install stored the same wheel first
+            shutil.rmtree(unpack_dir, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
+
+    def _link(self, source: str, target: str):
+        try:
+            os.symlink(source, target, target_is_directory=os.path.isdir(source))
+        except OSError:
+            # No symlink privilege (Windows), hard link files and copy what cannot be linked
+            if os.path.isdir(source):
+                shutil.copytree(source, target, copy_function=self._hard_link_or_copy)
+            else:
+                self._hard_link_or_copy(source, target)
+
+    @staticmethod
+    def _hard_link_or_copy(source: str, target: str):
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+    def _merge(self, source: str, target: str):
+        """
+        Link source into target. Directories shared by several packages (namespace packages) become real
+        directories whose children are linked one by one.
+        """
+        if not os.path.lexists(target):
+            self._link(source, target)
+            return
+        if not (os.path.isdir(source) and os.path.isdir(target)):
+            Log.w(TAG, f"{os.path.basename(target)} is provided by several packages, keeping the first one")
+            return
+        if os.path.islink(target):
+            linked = os.path.realpath(target)
+            os.unlink(target)
+            os.mkdir(target)
+            for name in os.listdir(linked):
+                self._link(os.path.join(linked, name), os.path.join(target, name))
+        for name in os.listdir(source):
+            self._merge(os.path.join(source, name), os.path.join(target, name))
+
+    def _build_libs(self, libs_dir: str, entries: List[str], req_hash: str):
+        # Built next to the old libs and swapped in, a running module keeps a complete libs until the swap
+        building = f"{libs_dir}.building"
+        shutil.rmtree(building, ignore_errors=True)
+        os.makedirs(building)
+        for entry in entries:
+            for name in os.listdir(entry):
+                self._merge(os.path.join(entry, name), os.path.join(building, name))
+        with open(os.path.join(building, LIBS_STAMP), "w") as f:
+            f.write(req_hash)
+
+        old = f"{libs_dir}.old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(libs_dir):
+            os.rename(libs_dir, old)
+        os.rename(building, libs_dir)
+        # rmtree removes the links, never the store entries they point to
+        shutil.rmtree(old, ignore_errors=True)
+
+    @staticmethod
+    def _read_stamp(libs_dir: str) -> Optional[str]:
+        try:
+            with open(os.path.join(libs_dir, LIBS_STAMP)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _referenced_entries(self, libs_dirs: Iterable[str]) -> Set[str]:
+        store_prefix = os.path.realpath(self.store) + os.sep
+        referenced = set()
+        for libs_dir in libs_dirs:
+            for root, dirs, files in os.walk(libs_dir):
+                for name in dirs + files:
+                    path = os.path.join(root, name)
+                    if os.path.islink(path):
+                        target = os.path.realpath(path)
+                        if target.startswith(store_prefix):
+                            referenced.add(target[len(store_prefix):].split(os.sep, 1)[0])
+        return referenced
+
+    def prune(self, libs_dirs: Iterable[str]) -> int:
+        """
+        Remove store entries no module links to anymore. The wheelhouse is kept for offline installs.
+        :param libs_dirs: The libs directories of all modules.
+        :return: Number of removed entries.
+        """
+        removed = 0
+        # Walked under the lock: an install unpins its entries only after its libs are swapped in, so every
+        # entry is either still pinned or linked from a libs directory the walk sees
+        with self._lock:
+            referenced = self._referenced_entries(libs_dirs)
+            for name in os.listdir(self.store):
+                entry = os.path.join(self.store, name)
+                if name.startswith(".") or name in referenced or entry in self._pinned:
+                    continue
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        if removed:
+            Log.i(TAG, f"Pruned {removed} unused packages from the package store")
+        return removed
@@ -1,34 +1,88 @@
+import ast
+import hashlib
 import importlib.util
 import os
 import sys
-import subprocess
+import threading
+import time
 from typing import Dict, Any, Tuple
 
 from src.utils.logger.logger import Log
 from src.utils.i18n import i18n
 from src.database.connection import system_session_scope
-from src.database.models import ScraperModule, ScraperModuleConfig, ScraperModuleTask
+from src.database.models import ScraperModule, ScraperModuleConfig, ScraperModuleTask, ScraperTaskRun
 from src.utils.event import EventManager
 from src.utils.cache_manage import cache_manager
+from src.scraper.scheduler.task_run import TaskRun
+from src.scraper.modules.module_dependencies import ModuleDependencyInstaller
+from src.scraper.storage.news_store import SAVE_BATCH_SIZE, save_news_items, filter_new_fingerprints, collect_blobs, \
+    apply_retention
 
 TAG = "MODULE_MANAGER"
 
+# Outside a scheduled task, a cached config snapshot is trusted for this many seconds before its version is checked.
+CONFIG_RECHECK_INTERVAL = 5
+
+
 class ModuleContext:
     def __init__(self, module_id: str, manager: 'ModuleManager'):
         self.module_id = module_id
         self._manager = manager
+        self._config_snapshot = None
+        self._config_version = None
+        self._config_checked_run = None
+        self._config_checked_at = 0.0
 
     def set_module_config(self, key, description, value, value_type, options, force_init, hint, regular):
         self._manager.db_set_config(self.module_id, key, description, value, value_type, options, force_init, hint, regular)
+        self.invalidate_config()
+
+    def set_module_configs(self, items):
+        self._manager.db_set_configs(self.module_id, items)
+        self.invalidate_config()
 
     def get_module_config(self, key):
-        return self._manager.db_get_config(self.module_id, key)
+        return self._get_config_snapshot().get(key)
 
     def drop_module_config(self, key):
         self._manager.db_drop_config(self.module_id, key)
-
-    def set_module_schedule_task(self, key, description, name="", force_init=False):
-        self._manager.db_set_task(self.module_id, key, description, name=name, force_init=force_init)
+        self.invalidate_config()
+
+    def invalidate_config(self):
+        self._config_snapshot = None
+
+    def _get_config_snapshot(self):
+        """
+        All config values of the module, loaded in one query. The snapshot's version is checked once
+        per scheduled task run (or every CONFIG_RECHECK_INTERVAL seconds outside runs), so a run sees
+        one consistent config and repeated reads cost no query.
+        """
+        if self._config_snapshot is not None:
+            run = TaskRun.current()
+            if run is not None:
+                stale_check = run is not self._config_checked_run
+            else:
+                stale_check = time.time() - self._config_checked_at >= CONFIG_RECHECK_INTERVAL
+            if not stale_check:
+                return self._config_snapshot
+            self._config_checked_run = run
+            self._config_checked_at = time.time()
+            if self._manager.db_get_config_version(self.module_id) == self._config_version:
+                return self._config_snapshot
+
+        self._config_version, self._config_snapshot = self._manager.db_get_config_snapshot(self.module_id)
+        self._config_checked_run = TaskRun.current()
+        self._config_checked_at = time.time()
+        return self._config_snapshot
+
+    def set_module_schedule_task(self, key, description, name="", force_init=False, cron="",
+                                 misfire_policy=None, misfire_grace=None, jitter=None, spread=None, timeout=None):
+        self._manager.db_set_task(self.module_id, key, description, name=name, force_init=force_init, cron=cron,
+                                  misfire_policy=misfire_policy, misfire_grace=misfire_grace,
+                                  jitter=jitter, spread=spread, timeout=timeout)
+
+    def set_module_schedule_tasks(self, items):
+        self._manager.db_set_tasks(self.module_id, items)
 
     def get_module_schedule_task(self, key):
         return self._manager.db_get_task(self.module_id, key)
@@ -40,11 +94,61 @@ class ModuleContext:
         # TODO: Call actual AI tagging service
         return [{"tag": "news", "confidence": 0.9}]
 
+    def filter_new_fingerprints(self, fingerprints):
+        return self._manager.db_filter_new_fingerprints(self.module_id, list(fingerprints))
+
     def save_structured_results(self, value, fingerprint=""):
-        Log.i(TAG, f"[{self.module_id}] Data saved: {value.get('title', 'No Title')}")
-        # TODO: Save to actual database
+        """
+        Inside a scheduled task results are buffered and written in batches, the rest is flushed when the run ends.
+        Results whose fingerprint was already saved by the module are skipped: outside a task the result is
+        rejected right away, inside one the fingerprints of a batch are checked together when it is written.
+        """
+        entry = {"item": value, "fingerprint": fingerprint}
+        run = TaskRun.current()
+        if run is None:
+            if fingerprint and not self.filter_new_fingerprints([fingerprint]):
+                return {"status": "duplicate"}
+            self._manager.db_save_news_items(self.module_id, [entry])
+            return {"status": "success"}
+
+        run.pending_items.append(entry)
+        run.on_exit("save_structured_results", lambda: self._flush_results(run))
+        if len(run.pending_items) >= SAVE_BATCH_SIZE:
+            self._flush_results(run)
         return {"status": "success"}
-    
+
+    def _flush_results(self, run):
+        items, run.pending_items = run.pending_items, []
+        # One lookup for the whole batch; a fingerprint repeated inside it keeps its first result
+        new = set(self.filter_new_fingerprints([item["fingerprint"] for item in items if item["fingerprint"]]))
+        batch = []
+        for item in items:
+            fingerprint = item["fingerprint"]
+            if fingerprint:
+                if fingerprint not in new:
+                    continue
+                new.discard(fingerprint)
+            batch.append(item)
+        if batch:
+            run.item_count += self._manager.db_save_news_items(self.module_id, batch)
+
+    @property
+    def deadline(self):
+        """
+        Epoch seconds by which the current scheduled task must finish, None without a limit.
+        """
+        run = TaskRun.current()
+        return run.deadline if run else None
+
+    def should_stop(self):
+        deadline = self.deadline
+        return deadline is not None and time.time() >= deadline
+
+    def report_fetched_bytes(self, size: int):
+        run = TaskRun.current()
+        if run:
+            run.bytes_fetched += size
+
     def install_requirements(self, requirements_file: str):
         return self._manager.install_module_requirements(self.module_id, requirements_file)
 
@@ -70,6 +174,10 @@ class ModuleManager:
         
         self._logged_conflicts = set()
         self._modules_cache = {}
+        self._changed_locale_dirs = set()
+        # Loaded module instances by module ID, reused until the module's files change.
+        self._loaded_modules = {}
+        self._loaded_lock = threading.RLock()
         
         self._load_modules_cache()
         
@@ -85,6 +193,16 @@ class ModuleManager:
         cache_manager.set("modules", self._modules_cache)
 
     def db_set_config(self, module_id, key, description, value, value_type, options, force_init, hint, regular):
+        self.db_set_configs(module_id, [{
+            "key": key, "description": description, "value": value, "value_type": value_type, "options": options,
+            "force_init": force_init, "hint": hint, "regular": regular
+        }])
+
+    def db_set_configs(self, module_id, items):
+        """
+        Upsert several configs in one transaction.
+        :param items: Dicts with the arguments of set_module_config.
+        """
         with system_session_scope() as session:
             # Get module internal ID
             module = session.query(ScraperModule).filter_by(module_id=module_id).first()
@@ -92,41 +210,50 @@ class ModuleManager:
                 Log.e(TAG, f"Module {module_id} not found in DB")
                 return
 
-            config = session.query(ScraperModuleConfig).filter_by(module_id=module.id, config_key=key).first()
-            
-            if config:
-                if force_init:
-                    config.description = description
-                    config.type = value_type
-                    config.options = options
-                    config.value = value
-                    config.hint = hint
-                    config.regex = regular
-                    config.source = "custom"
-                    Log.i(TAG, f"[{module_id}] Config '{key}' reset to default.")
-                else:
-                    config.description = description
-                    config.type = value_type
-                    config.options = options
-                    config.hint = hint
-                    config.regex = regular
-                    if config.value is None:
-                        config.value = value
+            existing = {c.config_key: c for c in session.query(ScraperModuleConfig).filter_by(module_id=module.id).all()}
+            for item in items:
+                config = self._upsert_config(session, module, existing.get(item["key"]), **item)
+                existing[item["key"]] = config
+            if items:
+                self.bump_config_version(module)
+
+    def _upsert_config(self, session, module, config, key, description, value, value_type="string", options=None,
+                       force_init=False, hint="", regular=""):
+        if config:
+            if force_init:
+                config.description = description
+                config.type = value_type
+                config.options = options
+                config.value = value
+                config.hint = hint
+                config.regex = regular
+                config.source = "custom"
+                Log.i(TAG, f"[{module.module_id}] Config '{key}' reset to default.")
             else:
-                new_config = ScraperModuleConfig(
-                    module_id=module.id,
-                    config_key=key,
-                    description=description,
-                    type=value_type,
-                    options=options,
-                    value=value,
-                    hint=hint,
-                    regex=regular,
-                    source="custom",
-                    is_override=False
-                )
-                session.add(new_config)
-                Log.i(TAG, f"[{module_id}] Config '{key}' initialized.")
+                config.description = description
+                config.type = value_type
+                config.options = options
+                config.hint = hint
+                config.regex = regular
+                if config.value is None:
+                    config.value = value
+            return config
+
+        new_config = ScraperModuleConfig(
+            module_id=module.id,
+            config_key=key,
+            description=description,
+            type=value_type,
+            options=options,
+            value=value,
+            hint=hint,
+            regex=regular,
+            source="custom",
+            is_override=False
+        )
+        session.add(new_config)
+        Log.i(TAG, f"[{module.module_id}] Config '{key}' initialized.")
+        return new_config
 
     def db_get_config(self, module_id, key):
         with system_session_scope() as session:
@@ -146,35 +273,96 @@ class ModuleManager:
             config = session.query(ScraperModuleConfig).filter_by(module_id=module.id, config_key=key).first()
             if config:
                 session.delete(config)
+                self.bump_config_version(module)
                 Log.i(TAG, f"[{module_id}] Config '{key}' deleted.")
 
-    def db_set_task(self, module_id, key, description, name, force_init):
+    def db_get_config_snapshot(self, module_id):
+        """
+        :return: (config_version, {config_key: value}) of the module in one query.
+        """
+        with system_session_scope() as session:
+            rows = session.query(ScraperModule.config_version, ScraperModuleConfig.config_key, ScraperModuleConfig.value) \
+                .outerjoin(ScraperModuleConfig, ScraperModuleConfig.module_id == ScraperModule.id) \
+                .filter(ScraperModule.module_id == module_id) \
+                .all()
+            if not rows:
+                return None, {}
+            return rows[0][0], {key: value for _, key, value in rows if key is not None}
+
+    def db_get_config_version(self, module_id):
+        with system_session_scope() as session:
+            return session.query(ScraperModule.config_version).filter(ScraperModule.module_id == module_id).scalar()
+
+    @staticmethod
+    def bump_config_version(module):
+        """
+        Mark the module's configs as changed; call inside the session that writes them.
+        """
+        module.config_version = (module.config_version or 0) + 1
+
+    def invalidate_module_config(self, module_id):
+        """
+        Drop the config snapshot of the loaded instance in this process right away.
+        """
+        entry = self._loaded_modules.get(module_id)
+        context = getattr(entry["instance"], "_context", None) if entry else None
+        if isinstance(context, ModuleContext):
+            context.invalidate_config()
+
+    def db_set_task(self, module_id, key, description, name, force_init, cron="", misfire_policy=None, misfire_grace=None,
+                    jitter=None, spread=None, timeout=None):
+        self.db_set_tasks(module_id, [{
+            "key": key, "description": description, "name": name, "force_init": force_init, "cron": cron,
+            "misfire_policy": misfire_policy, "misfire_grace": misfire_grace, "jitter": jitter, "spread": spread,
+            "timeout": timeout
+        }])
+
+    def db_set_tasks(self, module_id, items):
+        """
+        Upsert several scheduled tasks in one transaction.
+        :param items: Dicts with the arguments of set_module_schedule_task.
+        """
         with system_session_scope() as session:
             module = session.query(ScraperModule).filter_by(module_id=module_id).first()
             if not module:
                 Log.e(TAG, f"Module {module_id} not found in DB")
                 return
 
-            task = session.query(ScraperModuleTask).filter_by(module_id=module.id, task_key=key).first()
-            
-            if task:
-                if force_init:
-                    task.description = description
-                    task.name = name
-                    Log.i(TAG, f"[{module_id}] Task '{key}' reset.")
-                else:
-                    task.description = description
-                    if not task.name:
-                        task.name = name
+            existing = {t.task_key: t for t in session.query(ScraperModuleTask).filter_by(module_id=module.id).all()}
+            for item in items:
+                existing[item["key"]] = self._upsert_task(session, module, existing.get(item["key"]), **item)
+
+    def _upsert_task(self, session, module, task, key, description, name="", force_init=False, cron="",
+                     misfire_policy=None, misfire_grace=None, jitter=None, spread=None, timeout=None):
+        declared = {"misfire_policy": misfire_policy, "misfire_grace": misfire_grace, "jitter": jitter, "spread": spread,
+                    "timeout": timeout}
+        if task:
+            if force_init:
+                task.description = description
+                task.name = name
+                task.cron = cron
+                Log.i(TAG, f"[{module.module_id}] Task '{key}' reset.")
             else:
-                new_task = ScraperModuleTask(
-                    module_id=module.id,
-                    task_key=key,
-                    name=name,
-                    description=description
-                )
-                session.add(new_task)
-                Log.i(TAG, f"[{module_id}] Task '{key}' initialized.")
+                task.description = description
+                if not task.name:
+                    task.name = name
+                if not task.cron:
+                    task.cron = cron
+        else:
+            task = ScraperModuleTask(
+                module_id=module.id,
+                task_key=key,
+                name=name,
+                description=description,
+                cron=cron
+            )
+            session.add(task)
+            Log.i(TAG, f"[{module.module_id}] Task '{key}' initialized.")
+        # Misfire and spreading settings are declared by the module code, so they follow the latest declaration.
+        for field, value in declared.items():
+            if value is not None:
+                setattr(task, field, value)
+        return task
 
     def db_get_task(self, module_id, key):
         with system_session_scope() as session:
@@ -186,7 +374,14 @@ class ModuleManager:
                 return {
                     "key": task.task_key,
                     "name": task.name,
-                    "description": task.description
+                    "description": task.description,
+                    "cron": task.cron,
+                    "last_fire_at": task.last_fire_at,
+                    "misfire_policy": task.misfire_policy,
+                    "misfire_grace": task.misfire_grace,
+                    "jitter": task.jitter,
+                    "spread": task.spread,
+                    "timeout": task.timeout
                 }
             return None
 
@@ -206,19 +401,152 @@ class ModuleManager:
             if not module:
                 return {}
             tasks = session.query(ScraperModuleTask).filter_by(module_id=module.id).all()
-            return {t.task_key: {"name": t.name, "description": t.description} for t in tasks}
+            return {t.task_key: {"name": t.name, "description": t.description, "cron": t.cron} for t in tasks}
     
+    def db_get_scheduled_tasks(self):
+        with system_session_scope() as session:
+            rows = session.query(ScraperModule.module_id, ScraperModuleTask.task_key, ScraperModuleTask.cron,
+                                 ScraperModuleTask.last_fire_at, ScraperModuleTask.misfire_policy,
+                                 ScraperModuleTask.misfire_grace, ScraperModuleTask.jitter, ScraperModuleTask.spread,
+                                 ScraperModuleTask.timeout) \
+                .join(ScraperModuleTask, ScraperModuleTask.module_id == ScraperModule.id) \
+                .filter(ScraperModule.is_enable == True, ScraperModule.is_deleted == False) \
+                .all()
+            return [
+                {
+                    "module_id": module_id,
+                    "task_key": task_key,
+                    "cron": cron,
+                    "last_fire_at": last_fire_at,
+                    "misfire_policy": misfire_policy,
+                    "misfire_grace": misfire_grace,
+                    "jitter": jitter,
+                    "spread": spread,
+                    "timeout": timeout
+                }
+                for module_id, task_key, cron, last_fire_at, misfire_policy, misfire_grace, jitter, spread, timeout in rows
+                if cron
+            ]
+
+    def db_set_task_last_fire(self, module_id, key, fire_at):
+        """
+        :param fire_at: Scheduled fire time in milliseconds.
+        """
+        with system_session_scope() as session:
+            module_pk = session.query(ScraperModule.id).filter(ScraperModule.module_id == module_id).scalar_subquery()
+            session.query(ScraperModuleTask) \
+                .filter(ScraperModuleTask.module_id == module_pk, ScraperModuleTask.task_key == key) \
+                .update({ScraperModuleTask.last_fire_at: fire_at}, synchronize_session=False)
+
+    def db_record_task_run(self, result):
+        with system_session_scope() as session:
+            row = session.query(ScraperModule.id, ScraperModuleTask.id) \
+                .join(ScraperModuleTask, ScraperModuleTask.module_id == ScraperModule.id) \
+                .filter(ScraperModule.module_id == result["module_id"], ScraperModuleTask.task_key == result["task_key"]) \
+                .first()
+            if not row:
+                Log.w(TAG, f"[{result['module_id']}] Task '{result['task_key']}' not found in DB, run not recorded")
+                return
+            module_pk, task_pk = row
+            session.add(ScraperTaskRun(
+                task_id=task_pk,
+                module_id=module_pk,
+                task_key=result["task_key"],
+                scheduled_at=result.get("scheduled_at"),
+                started_at=result["started_at"],
+                finished_at=result["finished_at"],
+                duration_ms=result["duration_ms"],
+                item_count=result.get("item_count", 0),
+                bytes_fetched=result.get("bytes_fetched", 0),
+                cpu_user_ms=result.get("cpu_user_ms"),
+                cpu_sys_ms=result.get("cpu_sys_ms"),
+                peak_rss_kb=result.get("peak_rss_kb"),
+                rss_delta_kb=result.get("rss_delta_kb"),
+                io_read_bytes=result.get("io_read_bytes"),
+                io_write_bytes=result.get("io_write_bytes"),
+                status=result["status"],
+                error=result.get("error")
+            ))
+
+    def db_save_news_items(self, module_id, items):
+        return save_news_items(module_id, items)
+
+    def db_filter_new_fingerprints(self, module_id, fingerprints):
+        return filter_new_fingerprints(module_id, fingerprints)
+
+    def db_apply_news_retention(self, months, action):
+        return apply_retention(months, action)
+
+    def db_collect_blobs(self):
+        return collect_blobs()
+
+    def db_prune_task_runs(self, retention_days):
+        cutoff = int((time.time() - retention_days * 86400) * 1000)
+        with system_session_scope() as session:
+            deleted = session.query(ScraperTaskRun).filter(ScraperTaskRun.started_at < cutoff).delete(synchronize_session=False)
+            if deleted:
+                Log.i(TAG, f"Pruned {deleted} task runs older than {retention_days} days")
+
     def is_module_enabled(self, module_id):
         with system_session_scope() as session:
             module = session.query(ScraperModule).filter_by(module_id=module_id).first()
             return module.is_enable if module else False
 
+    def _module_scan_files(self, module_path):
+        """
+        Files that define what a scan reads from a module: controller.py and its locale files.
+        """
+        module_dir = os.path.dirname(module_path)
+        locales_dir = os.path.join(module_dir, "locales")
+        files = ["controller.py"]
+        if os.path.isdir(locales_dir):
+            files.extend(os.path.join("locales", name) for name in sorted(os.listdir(locales_dir)) if name.endswith(".json"))
+        return module_dir, files
+
+    def _hash_module_files(self, module_dir, files):
+        digest = hashlib.sha1()
+        for file in files:
+            digest.update(file.encode("utf-8"))
+            with open(os.path.join(module_dir, file), "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def _module_fingerprint(self, module_path, previous):
+        """
+        :param previous: Fingerprint stored by the last scan, or None.
+        :return: (fingerprint, controller changed, locales changed)
+        """
+        module_dir, files = self._module_scan_files(module_path)
+        stat = []
+        for file in files:
+            file_stat = os.stat(os.path.join(module_dir, file))
+            stat.append([file, file_stat.st_mtime_ns, file_stat.st_size])
+        if previous and previous.get("stat") == stat:
+            return previous, False, False
+
+        # mtime or size moved, the content hashes decide whether anything really changed
+        code_hash = self._hash_module_files(module_dir, files[:1])
+        locale_hash = self._hash_module_files(module_dir, files[1:])
+        fingerprint = {"stat": stat, "code_hash": code_hash, "locale_hash": locale_hash}
+        if not previous:
+            return fingerprint, True, True
+        return fingerprint, previous.get("code_hash") != code_hash, previous.get("locale_hash") != locale_hash
+
+    def get_changed_locale_dirs(self):
+        """
+        Locale directories of modules whose locale files changed in the last scan.
+        """
+        return list(self._changed_locale_dirs)
+
     def scan_modules(self, force_reload=False):
         if self._modules_cache and not force_reload:
             return self._modules_cache
 
         found_modules = {}
         scan_order = ["default", "external"]
+        previous_by_path = {info["path"]: info for info in self._modules_cache.values()}
+        self._changed_locale_dirs = set()
+        read_count = 0
         
         for source_type in scan_order:
             path = self.dirs.get(source_type)
@@ -228,7 +556,21 @@ class ModuleManager:
                 module_path = os.path.join(path, folder_name, "controller.py")
                 if os.path.isfile(module_path):
                     temp_id = folder_name
-                    meta = self._read_module_meta(module_path, temp_id)
+                    previous = previous_by_path.get(module_path)
+                    try:
+                        fingerprint, code_changed, locales_changed = self._module_fingerprint(
+                            module_path, previous.get("fingerprint") if previous else None)
+                    except OSError as e:
+                        Log.w(TAG, f"Failed to fingerprint module at {module_path}: {e}")
+                        continue
+
+                    if code_changed:
+                        meta = self._read_module_meta(module_path, temp_id)
+                        read_count += 1
+                    else:
+                        meta = previous["meta"]
+                    if locales_changed:
+                        self._changed_locale_dirs.add(os.path.join(os.path.dirname(module_path), "locales"))
 
                     if not meta or "id" not in meta or "name" not in meta or "version" not in meta:
                         Log.w(TAG, f"Skipping invalid module at {module_path}: Missing required meta fields (id, name, version)")
@@ -260,14 +602,48 @@ class ModuleManager:
                     found_modules[module_id] = {
                         "path": module_path,
                         "source": source_type,
-                        "meta": meta
+                        "meta": meta,
+                        "fingerprint": fingerprint
                     }
         
+        Log.i(TAG, f"Scanned {len(found_modules)} modules, {read_count} re-read")
         self._modules_cache = found_modules
         self._save_modules_cache()
         return found_modules
 
+    def _read_module_meta_static(self, path):
+        """
+        Read MODULE_META from the controller source without executing it.
+        :return: The meta dict, or None when it is missing or not a literal.
+        """
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                targets = [node.target]
+            else:
+                continue
+            if any(isinstance(target, ast.Name) and target.id == "MODULE_META" for target in targets):
+                try:
+                    meta = ast.literal_eval(node.value)
+                except ValueError:
+                    return None
+                return meta if isinstance(meta, dict) else None
+        return None
+
     def _read_module_meta(self, path, module_id):
+        try:
+            meta = self._read_module_meta_static(path)
+            if meta is not None:
+                return meta
+        except (OSError, SyntaxError) as e:
+            Log.w(TAG, f"Failed to parse meta for {module_id}: {e}")
+            return {}
+
+        # MODULE_META is built dynamically, only executing the controller can tell
+        Log.w(TAG, f"MODULE_META of {module_id} is not a literal, executing controller to read it")
         try:
             spec = importlib.util.spec_from_file_location(f"meta_{module_id}", path)
             if spec and spec.loader:
@@ -295,7 +671,7 @@ class ModuleManager:
         for info in scanned_modules.values():
             module_dir = os.path.dirname(info["path"])
             locale_dirs.append(os.path.join(module_dir, "locales"))
-        i18n.compile_locales(locale_dirs)
+        i18n.compile_locales(locale_dirs, changed_dirs=self.get_changed_locale_dirs())
 
         with system_session_scope() as session:
             existing_modules = {m.module_id: m for m in session.query(ScraperModule).all()}
@@ -344,10 +720,17 @@ class ModuleManager:
                     module.is_deleted = True
                     module.is_enable = False
                     self.disable_module(module_id)
+                    self.unload_module(module_id)
 
     def get_module_info(self, module_id):
         return self._modules_cache.get(module_id)
 
+    def get_module_ids_in_dirs(self, module_dirs):
+        """
+        IDs of the scanned modules whose folder is one of module_dirs.
+        """
+        return {module_id for module_id, info in self._modules_cache.items() if os.path.dirname(info["path"]) in module_dirs}
+
     def enable_module(self, module_id):
         Log.i(TAG, f"Enabling module: {module_id}")
         module_info = self.get_module_info(module_id)
@@ -361,13 +744,8 @@ class ModuleManager:
             raise Exception(f"Module test failed: {message}")
 
         try:
-            spec = importlib.util.spec_from_file_location(f"setup_{module_id}", module_info["path"])
-            module_lib = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module_lib)
-            
-            ctx = ModuleContext(module_id, self)
-            instance = module_lib.create_module(ctx)
-            
+            instance = self.get_module_instance(module_id)
+
             if instance.enable_module():
                 with system_session_scope() as session:
                     module = session.query(ScraperModule).filter_by(module_id=module_id).first()
@@ -399,14 +777,13 @@ class ModuleManager:
 
         Log.i(TAG, f"[{module_id}] Installing requirements from {requirements_file} to {libs_dir}...")
         try:
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install", "-r", req_path, "-t", libs_dir],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.PIPE
-            )
+            installer = ModuleDependencyInstaller()
+            if not installer.install(module_id, module_dir, req_path):
+                return False
+            installer.prune(os.path.join(os.path.dirname(info["path"]), "libs") for info in self._modules_cache.values())
             Log.i(TAG, f"[{module_id}] Dependencies installed successfully.")
             return True
-        except subprocess.CalledProcessError as e:
+        except Exception as e:
             Log.e(TAG, f"[{module_id}] Failed to install dependencies", error=e)
             return False
 
@@ -438,28 +815,11 @@ class ModuleManager:
 
     def test_module(self, module_id):
         Log.i(TAG, f"Testing module: {module_id}")
-        module_info = self.get_module_info(module_id)
-        if not module_info:
+        if not self.get_module_info(module_id):
             return False, "Module not found"
-            
+
         try:
-            module_path = module_info["path"]
-            module_dir = os.path.dirname(module_path)
-            if module_dir not in sys.path:
-                sys.path.insert(0, module_dir)
-            libs_dir = os.path.join(module_dir, "libs")
-            if os.path.exists(libs_dir) and libs_dir not in sys.path:
-                sys.path.insert(0, libs_dir)
-            
-            spec = importlib.util.spec_from_file_location(f"test_{module_id}", module_path)
-            if spec is None:
-                return False, f"Could not load spec for {module_path}"
-            module_lib = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module_lib)
-            if not hasattr(module_lib, 'create_module'):
-                return False, "Module missing 'create_module' factory function"
-            ctx = ModuleContext(module_id, self)
-            instance = module_lib.create_module(ctx)
+            instance = self.get_module_instance(module_id)
             if hasattr(instance, 'test_module'):
                 return instance.test_module()
             else:
@@ -469,31 +829,105 @@ class ModuleManager:
             return False, str(e)
 
     def test_module_config(self, module_id: str, config: Dict[str, Any]) -> Tuple[bool, str]:
-        module_info = self.get_module_info(module_id)
-        if not module_info:
+        if not self.get_module_info(module_id):
             return False, "Module not found"
-            
+
         try:
-            module_path = module_info["path"]
-            module_dir = os.path.dirname(module_path)
-            if module_dir not in sys.path:
-                sys.path.insert(0, module_dir)
-            libs_dir = os.path.join(module_dir, "libs")
-            if os.path.exists(libs_dir) and libs_dir not in sys.path:
-                sys.path.insert(0, libs_dir)
-
-            spec = importlib.util.spec_from_file_location(f"test_cfg_{module_id}", module_path)
-            if spec is None:
-                return False, f"Could not load spec for {module_path}"
-            module_lib = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module_lib)
-            if not hasattr(module_lib, 'create_module'):
-                return False, "Module missing 'create_module' factory function"
-            ctx = ModuleContext(module_id, self)
-            instance = module_lib.create_module(ctx)
+            instance = self.get_module_instance(module_id)
             if hasattr(instance, 'test_config'):
                 return instance.test_config(config)
             else:
                 return True, "Module does not support config testing (assumed valid)"
         except Exception as e:
             return False, f"Config test error: {str(e)}"
+
+    def _module_source_files(self, module_dir):
+        files = []
+        for root, dirs, names in os.walk(module_dir):
+            # Vendored libs are installed once and never edited in place, and caches change on every import.
+            dirs[:] = [d for d in dirs if d not in ("libs", "__pycache__")]
+            files.extend(os.path.join(root, name) for name in names if name.endswith(".py"))
+        return sorted(files)
+
+    def _module_stat_signature(self, module_path):
+        signature = [module_path]
+        for file in self._module_source_files(os.path.dirname(module_path)):
+            stat = os.stat(file)
+            signature.append((file, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _module_content_hash(self, module_path):
+        digest = hashlib.sha1()
+        for file in self._module_source_files(os.path.dirname(module_path)):
+            digest.update(file.encode("utf-8"))
+            with open(file, "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def _load_module_instance(self, module_id, module_path, context=None):
+        module_dir = os.path.dirname(module_path)
+        if module_dir not in sys.path:
+            sys.path.insert(0, module_dir)
+        libs_dir = os.path.join(module_dir, "libs")
+        if os.path.exists(libs_dir) and libs_dir not in sys.path:
+            sys.path.insert(0, libs_dir)
+
+        # Helpers imported by controller.py by plain name stay in sys.modules, drop them so edits take effect.
+        prefix = module_dir + os.sep
+        for name, loaded in list(sys.modules.items()):
+            file = getattr(loaded, "__file__", None) or ""
+            if file.startswith(prefix) and not file.startswith(libs_dir + os.sep):
+                del sys.modules[name]
+
+        spec = importlib.util.spec_from_file_location(f"module_{module_id}", module_path)
+        if spec is None:
+            raise ImportError(f"Could not load spec for {module_path}")
+        module_lib = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module_lib)
+        if not hasattr(module_lib, 'create_module'):
+            raise ImportError("Module missing 'create_module' factory function")
+        ctx = context or ModuleContext(module_id, self)
+        return module_lib.create_module(ctx)
+
+    def get_module_instance(self, module_id: str):
+        """
+        Return the loaded instance of a module, importing controller.py only on first use or after
+        the module's source files changed (checked by mtime/size, confirmed by content hash).
+        """
+        module_info = self.get_module_info(module_id)
+        if not module_info or not os.path.isfile(module_info["path"]):
+            # The service's module watcher or the web reload may have rescanned since this process started
+            self._load_modules_cache()
+            module_info = self.get_module_info(module_id)
+        if not module_info:
+            raise ValueError(f"Module {module_id} not found")
+        module_path = module_info["path"]
+
+        with self._loaded_lock:
+            stat_signature = self._module_stat_signature(module_path)
+            entry = self._loaded_modules.get(module_id)
+            if entry and entry["stat"] == stat_signature:
+                return entry["instance"]
+
+            content_hash = self._module_content_hash(module_path)
+            if entry and entry["path"] == module_path and entry["hash"] == content_hash:
+                entry["stat"] = stat_signature
+                return entry["instance"]
+
+            if entry:
+                Log.i(TAG, f"[{module_id}] Module files changed, reloading")
+            instance = self._load_module_instance(module_id, module_path)
+            self._loaded_modules[module_id] = {
+                "path": module_path,
+                "stat": stat_signature,
+                "hash": content_hash,
+                "instance": instance
+            }
+            return instance
+
+    def is_module_loaded(self, module_id: str) -> bool:
+        return module_id in self._loaded_modules
+
+    def unload_module(self, module_id: str):
+        with self._loaded_lock:
+            self._loaded_modules.pop(module_id, None)
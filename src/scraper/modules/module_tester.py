@@ -0,0 +1,148 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.scraper.modules.module_manager import ModuleManager
+from src.utils.cache_manage import cache_manager
+from src.utils.logger.logger import Log
+
+TAG = "MODULE_TESTER"
+
+# Seconds a module or config test may take before it is reported as failed.
+TEST_TIMEOUT = 30
+# Seconds a module test result is served from the cache.
+RESULT_TTL = 600
+MAX_TEST_WORKERS = 8
+
+
+class ModuleTester:
+    """
+    Runs test_module / test_config of modules in a thread pool, so callers on an event loop can await them
+    and many modules are tested at once. Module test results are cached per module for RESULT_TTL seconds.
+    A test past its timeout is reported as failed; its thread cannot be interrupted and keeps the module
+    from being tested again until it returns.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ModuleTester, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._pool = ThreadPoolExecutor(max_workers=MAX_TEST_WORKERS, thread_name_prefix="ModuleTest")
+        self._results: Dict[str, Dict] = cache_manager.get("module_tests") or {}
+        # (call, result) futures of the last test of each module, shared by concurrent callers
+        self._running: Dict[str, Tuple[Future, Future]] = {}
+        # Reentrant: a test finishing at once stores its result from inside test_module
+        self._lock = threading.RLock()
+        self._initialized = True
+
+    def _submit(self, fn: Callable[[], Tuple[bool, str]], timeout: float, on_result: Callable[[Dict], None] = None):
+        """
+        :return: (future of the result dict, future of the call itself)
+        """
+        result: Future = Future()
+        started = time.time()
+        finish_lock = threading.Lock()
+
+        def finish(success, message, timed_out=False):
+            with finish_lock:
+                if result.done():
+                    return
+                entry = {
+                    "success": bool(success),
+                    "message": message or "",
+                    "tested_at": int(time.time() * 1000),
+                    "duration_ms": int((time.time() - started) * 1000),
+                    "timed_out": timed_out
+                }
+                if on_result:
+                    on_result(entry)
+                result.set_result(entry)
+
+        def run():
+            try:
+                return fn()
+            except Exception as e:
+                return False, str(e)
+
+        def on_done(call: Future):
+            timer.cancel()
+            success, message = call.result()
+            finish(success, message)
+
+        timer = threading.Timer(timeout, lambda: finish(False, f"Test timed out after {timeout}s", timed_out=True))
+        timer.daemon = True
+        call = self._pool.submit(run)
+        timer.start()
+        call.add_done_callback(on_done)
+        return result, call
+
+    def _store(self, module_id: str, entry: Dict):
+        with self._lock:
+            self._results[module_id] = entry
+            cache_manager.set("module_tests", self._results)
+        if not entry["success"]:
+            Log.w(TAG, f"[{module_id}] Module test failed: {entry['message']}")
+
+    def get_cached(self, module_id: str) -> Optional[Dict]:
+        """
+        :return: The last result while it is younger than RESULT_TTL, otherwise None.
+        """
+        entry = self._results.get(module_id)
+        if entry and time.time() * 1000 - entry["tested_at"] < RESULT_TTL * 1000:
+            return entry
+        return None
+
+    def get_results(self) -> Dict[str, Dict]:
+        """
+        Last result of every tested module, with expired set once it is older than RESULT_TTL.
+        """
+        now_ms = time.time() * 1000
+        with self._lock:
+            return {module_id: dict(entry, expired=now_ms - entry["tested_at"] >= RESULT_TTL * 1000)
+                    for module_id, entry in self._results.items()}
+
+    def invalidate(self, module_id: Optional[str] = None):
+        with self._lock:
+            if module_id is None:
+                self._results.clear()
+            else:
+                self._results.pop(module_id, None)
+            cache_manager.set("module_tests", self._results)
+
+    def test_module(self, module_id: str, use_cache: bool = True, timeout: float = TEST_TIMEOUT) -> Future:
+        """
+        :return: Future of a dict with success, message, tested_at (ms), duration_ms and timed_out.
+        """
+        if use_cache:
+            cached = self.get_cached(module_id)
+            if cached:
+                done: Future = Future()
+                done.set_result(cached)
+                return done
+
+        with self._lock:
+            running = self._running.get(module_id)
+            # Also while a timed out test is still stuck in its thread, which then answers with its timeout result
+            if running and not running[0].done():
+                return running[1]
+            result, call = self._submit(lambda: ModuleManager().test_module(module_id), timeout,
+                                        lambda entry: self._store(module_id, entry))
+            self._running[module_id] = (call, result)
+        return result
+
+    def test_modules(self, module_ids: Iterable[str], use_cache: bool = True) -> List[Future]:
+        return [self.test_module(module_id, use_cache) for module_id in module_ids]
+
+    def test_config(self, module_id: str, config: Dict[str, Any], timeout: float = TEST_TIMEOUT) -> Future:
+        """
+        Config tests depend on the submitted values and are not cached.
+        """
+        result, _ = self._submit(lambda: ModuleManager().test_module_config(module_id, config), timeout)
+        return result
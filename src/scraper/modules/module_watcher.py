@@ -0,0 +1,243 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from src.utils.logger.logger import Log
+
+TAG = "MODULE_WATCHER"
+
+WATCH_AUTO = "auto"        # inotify when available, polling otherwise
+WATCH_POLLING = "polling"
+WATCH_OFF = "off"
+WATCH_MODES = [WATCH_AUTO, WATCH_POLLING, WATCH_OFF]
+
+# Seconds without new changes before a module is reloaded, so an editor or a copy writing several files
+# triggers one reload.
+DEBOUNCE_SECONDS = 1.0
+POLL_INTERVAL = 2.0
+
+# Directories inside a module that never hold its code, see ModuleManager._module_source_files.
+IGNORED_DIRS = {"__pycache__", "libs"}
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_ignored_file(name: str) -> bool:
+    # Bytecode and the temporary / swap files of editors
+    return name.endswith((".pyc", ".swp", ".swx", ".tmp", "~")) or name.startswith((".", "#"))
+
+
+class _PollingBackend:
+    """
+    Compares mtime/size of every file under the roots on each poll.
+    """
+
+    def __init__(self, roots: List[str], poll_interval: float = POLL_INTERVAL):
+        self._roots = roots
+        self._poll_interval = poll_interval
+        self._snapshot = self._scan()
+
+    def _module_signature(self, module_dir: str):
+        signature = []
+        for root, dirs, names in os.walk(module_dir):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+            for name in sorted(names):
+                if _is_ignored_file(name):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for root in self._roots:
+            if not os.path.isdir(root):
+                continue
+            for folder_name in os.listdir(root):
+                module_dir = os.path.join(root, folder_name)
+                if os.path.isdir(module_dir) and folder_name not in IGNORED_DIRS:
+                    snapshot[module_dir] = self._module_signature(module_dir)
+        return snapshot
+
+    def wait(self, timeout: float) -> Set[str]:
+        time.sleep(min(timeout, self._poll_interval))
+        snapshot = self._scan()
+        changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                   if snapshot.get(path) != self._snapshot.get(path)}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class _InotifyBackend:
+    """
+    Linux inotify through libc, one watch per directory since inotify is not recursive.
+    """
+
+    def __init__(self, roots: List[str]):
+        self._roots = roots
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, str] = {}
+        for root in roots:
+            if os.path.isdir(root):
+                self._add_tree(root)
+
+    def _add_watch(self, path: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            Log.w(TAG, f"Failed to watch {path}: {os.strerror(ctypes.get_errno())}")
+            return
+        self._watches[wd] = path
+
+    def _add_tree(self, path: str):
+        for root, dirs, _ in os.walk(path):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+            self._add_watch(root)
+
+    def _module_dir(self, path: str) -> Optional[str]:
+        for root in self._roots:
+            prefix = root + os.sep
+            if path.startswith(prefix):
+                return os.path.join(root, path[len(prefix):].split(os.sep, 1)[0])
+        return None
+
+    def _all_module_dirs(self) -> Set[str]:
+        return {os.path.join(root, name) for root in self._roots if os.path.isdir(root)
+                for name in os.listdir(root) if os.path.isdir(os.path.join(root, name))}
+
+    def wait(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, every module may have changed
+                Log.w(TAG, "inotify queue overflowed, checking all modules")
+                changed |= self._all_module_dirs()
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR:
+                if name in IGNORED_DIRS:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path)
+            elif _is_ignored_file(name):
+                continue
+            module_dir = self._module_dir(path)
+            if module_dir and os.path.basename(module_dir) not in IGNORED_DIRS:
+                changed.add(module_dir)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class ModuleWatcher:
+    """
+    Watches the module directories and reports which module folders changed.
+    Changes are debounced and handed to on_change from the watcher thread, one set of folders at a time.
+    """
+
+    def __init__(self, roots: Iterable[str], on_change: Callable[[Set[str]], None], mode: str = WATCH_AUTO,
+                 debounce: float = DEBOUNCE_SECONDS):
+        """
+        :param roots: Directories holding one folder per module (default, external).
+        :param on_change: Called with the paths of the module folders that changed.
+        :param mode: One of WATCH_MODES.
+        """
+        self._roots = [os.path.abspath(root) for root in roots]
+        self._on_change = on_change
+        self._mode = mode if mode in WATCH_MODES else WATCH_AUTO
+        self._debounce = debounce
+        self._backend = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _create_backend(self):
+        if self._mode == WATCH_AUTO and sys.platform.startswith("linux"):
+            try:
+                return _InotifyBackend(self._roots)
+            except (OSError, AttributeError) as e:
+                Log.w(TAG, f"inotify unavailable, falling back to polling: {e}")
+        return _PollingBackend(self._roots)
+
+    def _run(self):
+        pending: Set[str] = set()
+        last_change = 0.0
+        while not self._stop.is_set():
+            try:
+                changed = self._backend.wait(self._debounce if pending else POLL_INTERVAL)
+            except Exception as e:
+                Log.e(TAG, "Failed to read module changes", error=e)
+                self._stop.wait(POLL_INTERVAL)
+                continue
+            if changed:
+                pending |= changed
+                last_change = time.time()
+                continue
+            if pending and time.time() - last_change >= self._debounce:
+                modules, pending = pending, set()
+                try:
+                    self._on_change(modules)
+                except Exception as e:
+                    Log.e(TAG, "Failed to handle module changes", error=e)
+
+    def start(self):
+        if self._thread or self._mode == WATCH_OFF:
+            return
+        self._backend = self._create_backend()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ScraperModuleWatcher", daemon=True)
+        self._thread.start()
+        Log.i(TAG, f"Watching modules with {type(self._backend).__name__.strip('_')}")
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self._backend.close()
+        self._backend = None
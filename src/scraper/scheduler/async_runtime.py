@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from src.scraper.modules.base_module import BaseModule
+from src.scraper.modules.module_manager import ModuleManager
+from src.scraper.scheduler.task_executor import KILL_GRACE
+from src.scraper.scheduler.task_run import TaskRun
+from src.utils.logger.logger import Log
+
+TAG = "ASYNC_RUNTIME"
+
+
+def is_async_module(instance) -> bool:
+    """
+    A module runs on the event loop when it overrides execute_schedule_task_async.
+    """
+    return type(instance).execute_schedule_task_async is not BaseModule.execute_schedule_task_async
+
+
+class _ChargedCoroutine(Coroutine):
+    """
+    Drives a coroutine and charges the CPU time of each of its steps to a task run.
+    """
+
+    def __init__(self, coro, run: TaskRun):
+        self._coro = coro
+        self._run = run
+
+    def send(self, value):
+        with self._run.charge_cpu():
+            return self._coro.send(value)
+
+    def throw(self, *args):
+        with self._run.charge_cpu():
+            return self._coro.throw(*args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+
+def _create_task(loop, coro, **kwargs):
+    # Tasks created while a run is current (gather, create_task inside a module) work for that run
+    run = TaskRun.current()
+    if run is not None and not isinstance(coro, _ChargedCoroutine):
+        coro = _ChargedCoroutine(coro, run)
+    return asyncio.Task(coro, loop=loop, **kwargs)
+
+
+class _ChargedExecutor(ThreadPoolExecutor):
+    """
+    Default executor of the loop (run_in_executor, asyncio.to_thread), charging the CPU time of each call to
+    the run current when it was submitted.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        run = TaskRun.current()
+        if run is None:
+            return super().submit(fn, *args, **kwargs)
+
+        def charged():
+            with run.charge_cpu():
+                return fn(*args, **kwargs)
+
+        return super().submit(charged)
+
+
+class AsyncTaskRuntime:
+    """
+    Shared event loop on a background thread of the scraper service.
+    I/O-bound modules overlap their tasks here instead of each holding a worker process.
+    The loop's task factory and default executor charge CPU time to the run each step or call works for.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run_loop, name="ScraperAsyncRuntime", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        Log.i(TAG, "Event loop started")
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_task_factory(_create_task)
+        self._loop.set_default_executor(_ChargedExecutor(thread_name_prefix="ScraperAsyncRuntimeExecutor"))
+        asyncio.set_event_loop(self._loop)
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+    async def _run_job(self, job: Dict) -> Dict:
+        module_id = job["module_id"]
+        task_key = job["task_key"]
+        with TaskRun(job, measure_resources=True, shared_process=True) as run:
+            try:
+                instance = ModuleManager().get_module_instance(module_id)
+                coro = _ChargedCoroutine(instance.execute_schedule_task_async(job["cron"], task_key, job["timestamp"]), run)
+                limit = job["timeout"] + KILL_GRACE if job.get("timeout") else None
+                run.finish(bool(await asyncio.wait_for(coro, limit)))
+            except asyncio.TimeoutError:
+                Log.e(TAG, f"[{module_id}] Async task '{task_key}' exceeded its {job['timeout']}s timeout, cancelled")
+                run.time_out()
+            except Exception as e:
+                Log.e(TAG, f"[{module_id}] Error executing async task '{task_key}'", error=e)
+                run.fail(e)
+            # The last batch of saved results is written in a thread, not on the loop other tasks share
+            await asyncio.to_thread(run.run_finalizers)
+        return run.to_result()
+
+    def submit(self, module_id: str, task_key: str, cron: str, timestamp: datetime, timeout: int = 0) -> Future:
+        """
+        :param timeout: Seconds the task may run, 0 for no limit. Past it the coroutine is cancelled.
+        """
+        job = {"module_id": module_id, "task_key": task_key, "cron": cron, "timestamp": timestamp, "timeout": timeout}
+        return asyncio.run_coroutine_threadsafe(self._run_job(job), self._loop)
+
+    def shutdown(self):
+        if not self._thread:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+        Log.i(TAG, "Event loop stopped")
@@ -0,0 +1,291 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+try:
+    import msgpack
+except ImportError:  # Optional, JSON is used without it
+    msgpack = None
+
+from src.scraper.modules.module_manager import ModuleContext, ModuleManager
+from src.scraper.scheduler.async_runtime import is_async_module
+from src.scraper.scheduler.task_run import TaskRun
+from src.utils.logger.logger import Log
+
+TAG = "MODULE_HOST"
+
+# Seconds an idle host waits on its pipe before checking that the scraper service is still alive.
+PARENT_CHECK_INTERVAL = 5
+# Seconds past a task's deadline before its host is killed, same grace as the worker pool.
+KILL_GRACE = 10
+# A host is replaced after running this many tasks, so slow leaks in a module never pile up.
+DEFAULT_MAX_TASKS = 100
+
+# ModuleManager methods a hosted module may call through its context, always for its own module ID.
+PROXIED_METHODS = {
+    "db_set_config", "db_set_configs", "db_get_config", "db_drop_config", "db_get_config_snapshot",
+    "db_get_config_version", "db_set_task", "db_set_tasks", "db_get_task", "db_drop_task",
+    "db_save_news_items", "db_filter_new_fingerprints", "install_module_requirements"
+}
+
+
+def encode(message: Dict) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(message, use_bin_type=True)
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode(data: bytes) -> Dict:
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data.decode("utf-8"))
+
+
+class _ManagerProxy:
+    """
+    Stands in for ModuleManager inside a host, forwarding the calls of ModuleContext to the service.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if name not in PROXIED_METHODS:
+            raise AttributeError(f"ModuleManager.{name} is not available to hosted modules")
+
+        def call(*args, **kwargs):
+            self._conn.send_bytes(encode({"op": "call", "method": name, "args": list(args), "kwargs": kwargs}))
+            reply = decode(self._conn.recv_bytes())
+            if reply["op"] == "error":
+                raise RuntimeError(reply["error"])
+            return reply["value"]
+
+        return call
+
+
+def _run_hosted(instance, job: Dict) -> Dict:
+    with TaskRun(job, measure_resources=True) as run:
+        try:
+            if is_async_module(instance):
+                success = asyncio.run(instance.execute_schedule_task_async(job["cron"], job["task_key"], job["timestamp"]))
+            else:
+                success = instance.execute_schedule_task(job["cron"], job["task_key"], job["timestamp"])
+            run.finish(bool(success))
+        except Exception as e:
+            Log.e(TAG, f"[{job['module_id']}] Error executing task '{job['task_key']}'", error=e)
+            run.fail(e)
+    return run.to_result()
+
+
+def _host_main(conn, module_id: str, module_path: str, parent_pid: int):
+    Log.i(TAG, f"[{module_id}] Host started (PID: {os.getpid()})")
+    instance = None
+    load_error = None
+    try:
+        proxy = _ManagerProxy(conn)
+        instance = ModuleManager()._load_module_instance(module_id, module_path, ModuleContext(module_id, proxy))
+    except Exception as e:
+        Log.e(TAG, f"[{module_id}] Failed to load module in host", error=e)
+        load_error = str(e)
+
+    while True:
+        if not conn.poll(PARENT_CHECK_INTERVAL):
+            if os.getppid() != parent_pid:
+                Log.w(TAG, f"[{module_id}] Scraper service is gone, host exiting")
+                break
+            continue
+        try:
+            message = decode(conn.recv_bytes())
+        except EOFError:
+            break
+        if message["op"] == "stop":
+            break
+        job = message["job"]
+        job["timestamp"] = datetime.fromtimestamp(job["timestamp"]).astimezone()
+        if instance is None:
+            with TaskRun(job) as run:
+                run.fail(RuntimeError(f"Module failed to load: {load_error}"))
+            result = run.to_result()
+        else:
+            result = _run_hosted(instance, job)
+        conn.send_bytes(encode({"op": "result", "value": result}))
+    Log.i(TAG, f"[{module_id}] Host stopped (PID: {os.getpid()})")
+
+
+class ModuleHost:
+    """
+    A spawned process running the tasks of one module, one at a time.
+    The module never shares an interpreter with the service or other modules; its context calls are
+    answered by the service over the pipe.
+    """
+
+    def __init__(self, module_id: str, module_path: str, max_tasks: int = DEFAULT_MAX_TASKS):
+        self.module_id = module_id
+        self.module_path = module_path
+        self.max_tasks = max(1, max_tasks)
+        self._process = None
+        self._conn = None
+        self._tasks = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        # Spawned rather than forked, so the host holds no code or sys.path entries of other modules
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_host_main,
+            args=(child_conn, self.module_id, self.module_path, os.getpid()),
+            name=f"ScraperModuleHost-{self.module_id}",
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._tasks = 0
+
+    def _handle_call(self, message: Dict) -> Dict:
+        method = message.get("method")
+        args = message.get("args") or []
+        if method not in PROXIED_METHODS:
+            return {"op": "error", "error": f"Method {method} is not allowed"}
+        if not args or args[0] != self.module_id:
+            return {"op": "error", "error": f"Module {self.module_id} may only access its own data"}
+        try:
+            return {"op": "value", "value": getattr(ModuleManager(), method)(*args, **(message.get("kwargs") or {}))}
+        except Exception as e:
+            Log.e(TAG, f"[{self.module_id}] Proxied call {method} failed", error=e)
+            return {"op": "error", "error": str(e)}
+
+    def run(self, job: Dict, limit: Optional[float] = None) -> Dict:
+        """
+        :param limit: Seconds to wait for the result before raising TimeoutError and killing the host.
+        :raises EOFError, OSError: The host died while running the job.
+        """
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self._start()
+            payload = dict(job, timestamp=job["timestamp"].timestamp())
+            deadline = time.monotonic() + limit if limit is not None else None
+            time_limit = None
+            try:
+                self._conn.send_bytes(encode({"op": "run", "job": payload}))
+                while True:
+                    if deadline is not None:
+                        time_limit = max(0.0, deadline - time.monotonic())
+                    if not self._conn.poll(time_limit):
+                        raise TimeoutError(f"No result within {limit} seconds")
+                    message = decode(self._conn.recv_bytes())
+                    if message["op"] == "call":
+                        self._conn.send_bytes(encode(self._handle_call(message)))
+                        continue
+                    result = message["value"]
+                    break
+            except BaseException:
+                self._kill()
+                raise
+
+            self._tasks += 1
+            if self._tasks >= self.max_tasks:
+                Log.i(TAG, f"[{self.module_id}] Host ran {self._tasks} tasks, recycling")
+                self._stop()
+            return result
+
+    def _kill(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join(timeout=2)
+        self._close()
+
+    def _stop(self, timeout: float = 2):
+        if self._process is None:
+            return
+        try:
+            self._conn.send_bytes(encode({"op": "stop"}))
+        except (OSError, ValueError):
+            pass
+        self._process.join(timeout=timeout)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join(timeout=timeout)
+        self._close()
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._process = None
+
+    def stop(self):
+        with self._lock:
+            self._stop()
+
+
+class ModuleHostRunner:
+    """
+    Runs tasks of sandboxed modules in one ModuleHost per module, with the same submit() as the worker pool.
+    Runs of the same module wait for each other, the host runs one task at a time.
+    """
+
+    def __init__(self, max_tasks: int = DEFAULT_MAX_TASKS):
+        self.max_tasks = max_tasks
+        self._hosts: Dict[str, ModuleHost] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(thread_name_prefix="ScraperModuleHostFeeder")
+
+    def _get_host(self, module_id: str) -> ModuleHost:
+        module_info = ModuleManager().get_module_info(module_id)
+        if not module_info:
+            raise ValueError(f"Module {module_id} not found")
+        with self._lock:
+            host = self._hosts.get(module_id)
+            if host is None or host.module_path != module_info["path"]:
+                if host:
+                    host.stop()
+                host = ModuleHost(module_id, module_info["path"], self.max_tasks)
+                self._hosts[module_id] = host
+            return host
+
+    def _run(self, job: Dict) -> Dict:
+        module_id = job["module_id"]
+        limit = job["timeout"] + KILL_GRACE if job.get("timeout") else None
+        with TaskRun(job) as fallback:
+            try:
+                return self._get_host(module_id).run(job, limit)
+            except TimeoutError:
+                Log.e(TAG, f"[{module_id}] Task '{job['task_key']}' exceeded its {job['timeout']}s timeout, host killed")
+                fallback.time_out()
+            except (EOFError, OSError) as e:
+                Log.e(TAG, f"[{module_id}] Host died while running '{job['task_key']}'", error=e)
+                fallback.fail(RuntimeError("Module host died"))
+            except Exception as e:
+                Log.e(TAG, f"[{module_id}] Failed to run task '{job['task_key']}' in host", error=e)
+                fallback.fail(e)
+        return fallback.to_result()
+
+    def submit(self, module_id: str, task_key: str, cron: str, timestamp: datetime, timeout: int = 0) -> Future:
+        """
+        :param timeout: Seconds the task may run, 0 for no limit.
+        """
+        job = {"module_id": module_id, "task_key": task_key, "cron": cron, "timestamp": timestamp, "timeout": timeout}
+        return self._pool.submit(self._run, job)
+
+    def recycle(self, module_id: str):
+        """
+        Stop the host of a module, the next task starts a fresh one with the module's current code.
+        """
+        with self._lock:
+            host = self._hosts.pop(module_id, None)
+        if host:
+            host.stop()
+
+    def shutdown(self):
+        with self._lock:
+            hosts, self._hosts = list(self._hosts.values()), {}
+        for host in hosts:
+            host.stop()
+        self._pool.shutdown(wait=False)
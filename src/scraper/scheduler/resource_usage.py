@@ -0,0 +1,159 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+PROC_STATUS = "/proc/self/status"
+PROC_IO = "/proc/self/io"
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _read_status_kb(field: str) -> Optional[int]:
+    try:
+        with open(PROC_STATUS) as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _read_io() -> Optional[Tuple[int, int]]:
+    """
+    Bytes the process read from and wrote to storage (read_bytes / write_bytes). Network traffic is not
+    included, modules report what they download through report_fetched_bytes.
+    """
+    try:
+        values = {}
+        with open(PROC_IO) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                values[key] = int(value)
+        return values["read_bytes"], values["write_bytes"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset VmHWM to the current RSS so the peak after the run belongs to the run (Linux 4.0+).
+    """
+    try:
+        with open(PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _cpu_times() -> Optional[Tuple[float, float]]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime, usage.ru_stime
+
+
+def _thread_cpu_times() -> Tuple[float, float]:
+    if resource is not None and hasattr(resource, "RUSAGE_THREAD"):
+        usage = resource.getrusage(resource.RUSAGE_THREAD)
+        return usage.ru_utime, usage.ru_stime
+    # Without a per thread split everything counts as user time
+    return time.thread_time(), 0.0
+
+
+def _max_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class ResourceUsage:
+    """
+    CPU time, peak RSS and I/O of the current process between start() and stop().
+    Only meaningful when the process runs one task at a time, as the executor workers do.
+    Unavailable values are reported as None.
+    """
+
+    def __init__(self):
+        self._cpu = None
+        self._io = None
+        self._rss_kb = None
+        self._max_rss_kb = None
+        self._peak_reset = False
+
+    def start(self):
+        self._rss_kb = _read_status_kb("VmRSS")
+        self._peak_reset = _reset_peak_rss()
+        self._max_rss_kb = _max_rss_kb()
+        self._io = _read_io()
+        self._cpu = _cpu_times()
+
+    def stop(self) -> Dict[str, Optional[int]]:
+        cpu = _cpu_times()
+        io = _read_io()
+        if self._peak_reset:
+            peak_kb = _read_status_kb("VmHWM")
+        else:
+            # ru_maxrss is the lifetime peak, it only tells something when the run set a new high.
+            max_rss = _max_rss_kb()
+            peak_kb = max_rss if max_rss is not None and self._max_rss_kb is not None and max_rss > self._max_rss_kb else None
+
+        return {
+            "cpu_user_ms": int((cpu[0] - self._cpu[0]) * 1000) if cpu and self._cpu else None,
+            "cpu_sys_ms": int((cpu[1] - self._cpu[1]) * 1000) if cpu and self._cpu else None,
+            "peak_rss_kb": peak_kb,
+            "rss_delta_kb": max(0, peak_kb - self._rss_kb) if peak_kb is not None and self._rss_kb is not None else None,
+            "io_read_bytes": io[0] - self._io[0] if io and self._io else None,
+            "io_write_bytes": io[1] - self._io[1] if io and self._io else None
+        }
+
+
+class SharedUsage:
+    """
+    Usage of a task sharing its process with other tasks, as coroutines on the event loop do. The CPU time of
+    the threads working for the task is charged to it piece by piece through charge(); memory is the growth
+    of the process RSS over the task, which overlapping tasks also contribute to. Peak RSS and disk I/O
+    cannot be told apart per task and are reported as None.
+    """
+
+    def __init__(self):
+        self._user = 0.0
+        self._sys = 0.0
+        self._rss_kb = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._rss_kb = _read_status_kb("VmRSS")
+
+    @contextmanager
+    def charge(self):
+        """
+        Charge the CPU time the current thread spends inside the block.
+        """
+        start = _thread_cpu_times()
+        try:
+            yield
+        finally:
+            end = _thread_cpu_times()
+            with self._lock:
+                self._user += end[0] - start[0]
+                self._sys += end[1] - start[1]
+
+    def stop(self) -> Dict[str, Optional[int]]:
+        rss_kb = _read_status_kb("VmRSS")
+        with self._lock:
+            cpu_user, cpu_sys = self._user, self._sys
+        return {
+            "cpu_user_ms": int(cpu_user * 1000),
+            "cpu_sys_ms": int(cpu_sys * 1000),
+            "peak_rss_kb": None,
+            "rss_delta_kb": max(0, rss_kb - self._rss_kb) if rss_kb is not None and self._rss_kb is not None else None,
+            "io_read_bytes": None,
+            "io_write_bytes": None
+        }
@@ -0,0 +1,279 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from src.scraper.scheduler.task_lease import TaskLeaseManager
+from src.utils.logger.logger import Log
+
+TAG = "TASK_DISPATCHER"
+
+# What happens to a fire that arrives while the pending queue is full.
+POLICY_COALESCE = "coalesce"        # merge into a pending fire of the same task, otherwise drop it
+POLICY_DROP_NEW = "drop_new"        # drop the new fire
+POLICY_DROP_OLDEST = "drop_oldest"  # evict the oldest pending fire to make room
+QUEUE_POLICIES = [POLICY_COALESCE, POLICY_DROP_NEW, POLICY_DROP_OLDEST]
+
+# Threads finishing fires (lease release, result handling). Futures complete on the event loop and feeder
+# threads, which must not wait on the database.
+COMPLETION_WORKERS = 4
+
+
+class DispatchLimits:
+    def __init__(self, max_concurrency: int = 1, module_max_concurrency: int = 1, queue_size: int = 100,
+                 queue_policy: str = POLICY_COALESCE):
+        self.max_concurrency = max(1, max_concurrency)
+        self.module_max_concurrency = max(1, module_max_concurrency)
+        self.queue_size = max(0, queue_size)
+        self.queue_policy = queue_policy if queue_policy in QUEUE_POLICIES else POLICY_COALESCE
+
+    def __eq__(self, other):
+        return isinstance(other, DispatchLimits) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return (f"max_concurrency={self.max_concurrency}, module_max_concurrency={self.module_max_concurrency}, "
+                f"queue_size={self.queue_size}, queue_policy={self.queue_policy}")
+
+
+class PendingFire:
+    __slots__ = ("module_id", "task_key", "cron", "fire_time", "timeout", "coalesced", "claimed", "merged_claims")
+
+    def __init__(self, module_id: str, task_key: str, cron: str, fire_time: datetime, timeout: int = 0,
+                 claimed: bool = False):
+        self.module_id = module_id
+        self.task_key = task_key
+        self.cron = cron
+        self.fire_time = fire_time
+        self.timeout = timeout
+        self.coalesced = 0
+        self.claimed = claimed
+        # Claimed fires coalesced into this one, their leases are released together with it.
+        self.merged_claims: List["PendingFire"] = []
+
+
+class TaskDispatcher:
+    """
+    Admission control between the scheduler and the runners.
+    Fires start immediately while the global and per-module caps allow it; the rest wait in a
+    bounded FIFO queue. A module at its cap does not block fires of other modules behind it.
+    With a lease manager, a fire is claimed only when a slot is free, so the least busy node wins it.
+    """
+
+    def __init__(self, route: Callable[[str], object], on_result: Callable[[Dict], None], limits: DispatchLimits,
+                 lease: Optional[TaskLeaseManager] = None):
+        """
+        :param route: Returns the runner (an object with submit()) for a module ID.
+        :param on_result: Called with the result dict of every finished fire.
+        :param limits: Initial limits, see set_limits.
+        :param lease: Claims fires against the other nodes sharing the database.
+        """
+        self._route = route
+        self._on_result = on_result
+        self._limits = limits
+        self._lease = lease
+        self._pending: Deque[PendingFire] = deque()
+        self._running_total = 0
+        self._running_by_module: Dict[str, int] = {}
+        # Modules being reloaded, their fires stay pending until resumed.
+        self._paused: Set[str] = set()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._completions = ThreadPoolExecutor(max_workers=COMPLETION_WORKERS, thread_name_prefix="ScraperDispatchDone")
+
+    def set_limits(self, limits: DispatchLimits):
+        with self._lock:
+            if limits == self._limits:
+                return
+            self._limits = limits
+        Log.i(TAG, f"Limits updated: {limits}")
+        self._pump()
+
+    def pause_module(self, module_id: str):
+        """
+        Stop starting fires of a module; new fires are queued as usual.
+        """
+        with self._lock:
+            self._paused.add(module_id)
+
+    def resume_module(self, module_id: str):
+        with self._lock:
+            self._paused.discard(module_id)
+        self._pump()
+
+    def shutdown(self):
+        """
+        Wait for the finished fires being handled, called after the runners are shut down.
+        """
+        self._completions.shutdown(wait=True)
+
+    def wait_module_idle(self, module_id: str, timeout: float) -> bool:
+        """
+        :return: False when fires of the module are still running after timeout seconds.
+        """
+        deadline = time.time() + timeout
+        with self._idle:
+            while self._running_by_module.get(module_id):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "running": self._running_total,
+                "pending": len(self._pending),
+                "running_by_module": dict(self._running_by_module)
+            }
+
+    def submit(self, module_id: str, task_key: str, cron: str, fire_time: datetime, timeout: int = 0,
+               claimed: bool = False) -> bool:
+        """
+        :param timeout: Seconds the task may run, 0 for no limit.
+        :param claimed: The fire is already leased to this node, e.g. after a takeover.
+        :return: False when the fire was dropped or merged into a pending one.
+        """
+        fire = PendingFire(module_id, task_key, cron, fire_time, timeout, claimed)
+        accepted = True
+        dropped: List[PendingFire] = []
+        with self._lock:
+            limits = self._limits
+            if len(self._pending) >= limits.queue_size and not self._can_start(module_id):
+                accepted = self._apply_queue_policy(fire, limits.queue_policy, dropped)
+            else:
+                self._pending.append(fire)
+        # A dropped fire never runs, so its lease would otherwise stay running and be kept alive by the heartbeat.
+        for dropped_fire in dropped:
+            self._finish_claim(dropped_fire)
+        if accepted:
+            self._pump()
+        return accepted
+
+    def _apply_queue_policy(self, fire: PendingFire, policy: str, dropped: List[PendingFire]) -> bool:
+        """
+        :param dropped: Receives the fires that will not run, their claims must be finished outside the lock.
+        """
+        if policy == POLICY_DROP_OLDEST and self._pending:
+            oldest = self._pending.popleft()
+            Log.w(TAG, f"[{oldest.module_id}] Queue full, dropped oldest fire of '{oldest.task_key}' ({oldest.fire_time})")
+            dropped.append(oldest)
+            self._pending.append(fire)
+            return True
+
+        if policy == POLICY_COALESCE:
+            for pending in self._pending:
+                if pending.module_id == fire.module_id and pending.task_key == fire.task_key:
+                    pending.coalesced += 1
+                    if fire.claimed:
+                        pending.merged_claims.append(fire)
+                    Log.w(TAG, f"[{fire.module_id}] Queue full, fire of '{fire.task_key}' at {fire.fire_time} coalesced into pending one")
+                    return False
+
+        Log.w(TAG, f"[{fire.module_id}] Queue full, dropped fire of '{fire.task_key}' at {fire.fire_time}")
+        dropped.append(fire)
+        return False
+
+    def _can_start(self, module_id: str) -> bool:
+        return (module_id not in self._paused and
+                self._running_total < self._limits.max_concurrency and
+                self._running_by_module.get(module_id, 0) < self._limits.module_max_concurrency)
+
+    def _pump(self):
+        to_start: List[PendingFire] = []
+        with self._lock:
+            if not self._pending:
+                return
+            remaining: Deque[PendingFire] = deque()
+            while self._pending:
+                fire = self._pending.popleft()
+                if self._can_start(fire.module_id):
+                    self._running_total += 1
+                    self._running_by_module[fire.module_id] = self._running_by_module.get(fire.module_id, 0) + 1
+                    to_start.append(fire)
+                else:
+                    remaining.append(fire)
+                    if self._running_total >= self._limits.max_concurrency:
+                        remaining.extend(self._pending)
+                        self._pending.clear()
+            self._pending = remaining
+
+        for fire in to_start:
+            self._start(fire)
+
+    def _release(self, module_id: str):
+        with self._lock:
+            self._running_total -= 1
+            count = self._running_by_module.get(module_id, 1) - 1
+            if count > 0:
+                self._running_by_module[module_id] = count
+            else:
+                self._running_by_module.pop(module_id, None)
+                self._idle.notify_all()
+
+    def _claim(self, fire: PendingFire) -> bool:
+        if not self._lease or fire.claimed:
+            return True
+        try:
+            fire.claimed = self._lease.claim(fire.module_id, fire.task_key, fire.fire_time)
+        except Exception as e:
+            # Running twice is preferred over losing the fire while the database is unreachable.
+            Log.e(TAG, f"[{fire.module_id}] Failed to claim fire of '{fire.task_key}', running it unclaimed", error=e)
+            return True
+        if not fire.claimed:
+            Log.d(TAG, f"[{fire.module_id}] Fire of '{fire.task_key}' at {fire.fire_time} claimed by another node")
+        return fire.claimed
+
+    def _finish_claim(self, fire: PendingFire):
+        """
+        Release the lease of a fire and of the claimed fires coalesced into it.
+        """
+        for merged in fire.merged_claims:
+            self._finish_claim(merged)
+        fire.merged_claims = []
+        if not self._lease or not fire.claimed:
+            return
+        try:
+            self._lease.release(fire.module_id, fire.task_key, fire.fire_time)
+        except Exception as e:
+            Log.e(TAG, f"[{fire.module_id}] Failed to release lease of '{fire.task_key}'", error=e)
+
+    def _start(self, fire: PendingFire):
+        if not self._claim(fire):
+            # Another node runs this fire, which also covers the fires coalesced into it.
+            self._finish_claim(fire)
+            self._release(fire.module_id)
+            self._pump()
+            return
+        try:
+            runner = self._route(fire.module_id)
+            future = runner.submit(fire.module_id, fire.task_key, fire.cron, fire.fire_time, fire.timeout)
+        except Exception as e:
+            Log.e(TAG, f"[{fire.module_id}] Failed to start task '{fire.task_key}'", error=e)
+            self._finish_claim(fire)
+            self._release(fire.module_id)
+            self._pump()
+            return
+
+        suffix = f" ({fire.coalesced} coalesced fires)" if fire.coalesced else ""
+        Log.i(TAG, f"[{fire.module_id}] Started task '{fire.task_key}' scheduled at {fire.fire_time}{suffix}")
+
+        def on_done(done: Future):
+            self._finish_claim(fire)
+            self._release(fire.module_id)
+            try:
+                self._on_result(done.result())
+            except Exception as e:
+                Log.e(TAG, f"[{fire.module_id}] Failed to handle result of task '{fire.task_key}'", error=e)
+            self._pump()
+
+        future.add_done_callback(lambda done: self._complete(on_done, done))
+
+    def _complete(self, on_done: Callable[[Future], None], done: Future):
+        try:
+            self._completions.submit(on_done, done)
+        except RuntimeError:
+            # Shut down while the service stops, finish on the calling thread
+            on_done(done)
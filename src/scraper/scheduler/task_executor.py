@@ -0,0 +1,224 @@
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from multiprocessing import forkserver
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from src.database.connection import system_db_manager, data_db_manager
+from src.scraper.modules.module_manager import ModuleManager
+from src.scraper.scheduler.task_run import TaskRun
+from src.scraper.storage.news_partitions import NewsPartitions
+from src.utils.logger.logger import Log
+
+TAG = "TASK_EXECUTOR"
+
+# Seconds an idle worker waits on its pipe before checking that the scraper service is still alive.
+PARENT_CHECK_INTERVAL = 5
+
+# Seconds past a task's deadline before its worker is killed, left for modules that poll should_stop().
+KILL_GRACE = 10
+
+# Imported once by the fork server, so replacement workers start with the service code loaded.
+FORKSERVER_PRELOAD = ["src.scraper.scheduler.task_executor"]
+
+
+def resolve_worker_count(value) -> int:
+    """
+    0 (or an invalid value) means one worker per CPU core.
+    """
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        count = 0
+    if count <= 0:
+        count = os.cpu_count() or 1
+    return count
+
+
+def _run_job(manager: ModuleManager, job: Dict) -> Dict:
+    module_id = job["module_id"]
+    task_key = job["task_key"]
+    with TaskRun(job, measure_resources=True) as run:
+        try:
+            instance = manager.get_module_instance(module_id)
+            run.finish(bool(instance.execute_schedule_task(job["cron"], task_key, job["timestamp"])))
+        except Exception as e:
+            Log.e(TAG, f"[{module_id}] Error executing task '{task_key}'", error=e)
+            run.fail(e)
+    return run.to_result()
+
+
+def _worker_main(conn):
+    system_db_manager.dispose_after_fork()
+    data_db_manager.dispose_after_fork()
+    NewsPartitions().dispose_after_fork()
+    manager = ModuleManager()
+    Log.i(TAG, f"Worker started (PID: {os.getpid()})")
+    while True:
+        if not conn.poll(PARENT_CHECK_INTERVAL):
+            # Not getppid(), the parent of a replacement worker is the fork server
+            if not multiprocessing.parent_process().is_alive():
+                Log.w(TAG, "Scraper service is gone, worker exiting")
+                break
+            continue
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        conn.send(_run_job(manager, job))
+    Log.i(TAG, f"Worker stopped (PID: {os.getpid()})")
+
+
+class _Worker:
+    def __init__(self, index: int, ctx=None):
+        """
+        :param ctx: multiprocessing context, a plain fork of the service by default.
+        """
+        ctx = ctx or multiprocessing.get_context("fork")
+        self.index = index
+        self._conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            name=f"ScraperWorker-{index}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, job: Dict, limit: Optional[float] = None) -> Dict:
+        """
+        :param limit: Seconds to wait for the result before raising TimeoutError.
+        """
+        self._conn.send(job)
+        if limit is not None and not self._conn.poll(limit):
+            raise TimeoutError(f"No result within {limit} seconds")
+        return self._conn.recv()
+
+    def stop(self, timeout: float = 2):
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=timeout)
+        self._conn.close()
+
+
+class TaskExecutor:
+    """
+    Bounded pool of forked worker processes running execute_schedule_task.
+    A slow task only occupies its own worker; the other workers keep serving the queue.
+    A task still running KILL_GRACE seconds after its deadline has its worker killed and replaced.
+
+    The first workers are forked in start(), before the service starts its other threads. Replacements are
+    needed later, while the event loop, lease and watcher threads may hold locks a plain fork would copy
+    in their held state, so they come from a fork server started alongside the first workers.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max(1, max_workers)
+        self._jobs = queue.Queue()
+        self._workers: List[Optional[_Worker]] = []
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._respawn_ctx = None
+
+    def warm(self, module_ids: Iterable[str]):
+        """
+        Import modules in the service process before the workers are forked. The module registry is
+        inherited by every worker, so workers start warm and share the imported code pages copy-on-write.
+        """
+        manager = ModuleManager()
+        for module_id in module_ids:
+            if manager.is_module_loaded(module_id):
+                continue
+            try:
+                manager.get_module_instance(module_id)
+                Log.i(TAG, f"[{module_id}] Module preloaded")
+            except Exception as e:
+                Log.e(TAG, f"[{module_id}] Failed to preload module", error=e)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._respawn_ctx = multiprocessing.get_context("forkserver")
+        self._respawn_ctx.set_forkserver_preload(FORKSERVER_PRELOAD)
+        # Every worker is forked before the first feeder thread exists
+        self._workers = [_Worker(index) for index in range(self.max_workers)]
+        for index in range(self.max_workers):
+            thread = threading.Thread(target=self._serve, args=(index,), name=f"ScraperWorkerFeeder-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        # Started from a fresh interpreter (fork + exec), so it holds none of the service's locks
+        forkserver.ensure_running()
+        Log.i(TAG, f"Started {self.max_workers} workers")
+
+    def _respawn(self, index: int) -> _Worker:
+        with self._lock:
+            old = self._workers[index]
+            if old:
+                old.stop(timeout=0.5)
+            # Modules are imported again on first use, the fork server does not have them
+            worker = _Worker(index, self._respawn_ctx)
+            self._workers[index] = worker
+            return worker
+
+    def _serve(self, index: int):
+        while self._running:
+            item = self._jobs.get()
+            if item is None:
+                break
+            job, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            worker = self._workers[index]
+            limit = job["timeout"] + KILL_GRACE if job.get("timeout") else None
+            with TaskRun(job) as fallback:
+                try:
+                    result = worker.run(job, limit)
+                except TimeoutError:
+                    Log.e(TAG, f"[{job['module_id']}] Task '{job['task_key']}' exceeded its {job['timeout']}s timeout, "
+                               f"killing worker {index}")
+                    fallback.time_out()
+                    result = None
+                except (EOFError, OSError) as e:
+                    Log.e(TAG, f"[{job['module_id']}] Worker {index} died while running '{job['task_key']}', respawning", error=e)
+                    fallback.fail(RuntimeError("Worker process died"))
+                    result = None
+            if result is None:
+                result = fallback.to_result()
+                self._respawn(index)
+            future.set_result(result)
+
+    def submit(self, module_id: str, task_key: str, cron: str, timestamp: datetime, timeout: int = 0) -> Future:
+        """
+        :param timeout: Seconds the task may run, 0 for no limit.
+        """
+        future = Future()
+        job = {"module_id": module_id, "task_key": task_key, "cron": cron, "timestamp": timestamp, "timeout": timeout}
+        self._jobs.put((job, future))
+        return future
+
+    def shutdown(self):
+        if not self._running:
+            return
+        self._running = False
+        for _ in self._threads:
+            self._jobs.put(None)
+        for worker in self._workers:
+            if worker:
+                worker.stop()
+        Log.i(TAG, "Workers stopped")
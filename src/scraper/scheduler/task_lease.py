@@ -0,0 +1,154 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from src.database.connection import system_db_manager, system_session_scope
+from src.database.models import ScraperTaskLease
+from src.utils.logger.logger import Log
+
+TAG = "TASK_LEASE"
+
+# Seconds a lease stays valid without a heartbeat; after that another node may take the fire over.
+LEASE_TTL = 60
+HEARTBEAT_INTERVAL = 20
+# A fire whose runs keep killing their node is given up after this many claims.
+MAX_LEASE_ATTEMPTS = 3
+# Finished leases are kept this long, well past any fire that could still be claimed.
+LEASE_RETENTION_SECONDS = 86400
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _fire_ms(fire_time: datetime) -> int:
+    return int(fire_time.timestamp() * 1000)
+
+
+class TaskLeaseManager:
+    """
+    Claims task fires in the system database so that scraper services sharing one database run
+    each fire exactly once. Every node schedules all tasks, the first one with a free slot claims
+    the fire, and leases of a node that stops heartbeating are taken over by the others.
+    """
+
+    def __init__(self, owner: Optional[str] = None, ttl: int = LEASE_TTL):
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._ttl_ms = ttl * 1000
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def claim(self, module_id: str, task_key: str, fire_time: datetime) -> bool:
+        """
+        :return: False when another node already holds this fire.
+        """
+        now = _now_ms()
+        session = system_db_manager.get_session()
+        try:
+            session.add(ScraperTaskLease(
+                module_id=module_id,
+                task_key=task_key,
+                fire_at=_fire_ms(fire_time),
+                owner=self.owner,
+                status=STATUS_RUNNING,
+                attempts=1,
+                heartbeat_at=now,
+                expires_at=now + self._ttl_ms
+            ))
+            session.commit()
+            return True
+        except IntegrityError:
+            # The unique (module_id, task_key, fire_at) key makes the insert the atomic claim.
+            session.rollback()
+            return False
+        finally:
+            session.close()
+
+    def release(self, module_id: str, task_key: str, fire_time: datetime):
+        with system_session_scope() as session:
+            session.query(ScraperTaskLease) \
+                .filter(ScraperTaskLease.module_id == module_id, ScraperTaskLease.task_key == task_key,
+                        ScraperTaskLease.fire_at == _fire_ms(fire_time), ScraperTaskLease.owner == self.owner) \
+                .update({ScraperTaskLease.status: STATUS_DONE}, synchronize_session=False)
+
+    def take_over_expired(self) -> List[Dict]:
+        """
+        Claim the unfinished fires of nodes that stopped heartbeating.
+        :return: The fires now owned by this node, as dicts with module_id, task_key and fire_time.
+        """
+        now = _now_ms()
+        taken = []
+        with system_session_scope() as session:
+            expired = session.query(ScraperTaskLease) \
+                .filter(ScraperTaskLease.status == STATUS_RUNNING, ScraperTaskLease.expires_at < now) \
+                .all()
+            for lease in expired:
+                if lease.attempts >= MAX_LEASE_ATTEMPTS:
+                    lease.status = STATUS_DONE
+                    Log.w(TAG, f"[{lease.module_id}] Fire of '{lease.task_key}' at {datetime.fromtimestamp(lease.fire_at / 1000)} "
+                               f"abandoned after {lease.attempts} attempts")
+                    continue
+                # Compare-and-set on the previous owner and expiry, so only one node wins the takeover.
+                updated = session.query(ScraperTaskLease) \
+                    .filter(ScraperTaskLease.id == lease.id, ScraperTaskLease.owner == lease.owner,
+                            ScraperTaskLease.expires_at == lease.expires_at) \
+                    .update({
+                        ScraperTaskLease.owner: self.owner,
+                        ScraperTaskLease.attempts: lease.attempts + 1,
+                        ScraperTaskLease.heartbeat_at: now,
+                        ScraperTaskLease.expires_at: now + self._ttl_ms
+                    }, synchronize_session=False)
+                if updated:
+                    Log.w(TAG, f"[{lease.module_id}] Took over fire of '{lease.task_key}' from {lease.owner}")
+                    taken.append({
+                        "module_id": lease.module_id,
+                        "task_key": lease.task_key,
+                        "fire_time": datetime.fromtimestamp(lease.fire_at / 1000).astimezone()
+                    })
+        return taken
+
+    def heartbeat(self):
+        now = _now_ms()
+        with system_session_scope() as session:
+            session.query(ScraperTaskLease) \
+                .filter(ScraperTaskLease.owner == self.owner, ScraperTaskLease.status == STATUS_RUNNING) \
+                .update({ScraperTaskLease.heartbeat_at: now, ScraperTaskLease.expires_at: now + self._ttl_ms},
+                        synchronize_session=False)
+
+    def prune(self):
+        cutoff = _now_ms() - LEASE_RETENTION_SECONDS * 1000
+        with system_session_scope() as session:
+            session.query(ScraperTaskLease) \
+                .filter(ScraperTaskLease.status == STATUS_DONE, ScraperTaskLease.fire_at < cutoff) \
+                .delete(synchronize_session=False)
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                Log.e(TAG, "Failed to renew leases", error=e)
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._heartbeat_loop, name="ScraperLeaseHeartbeat", daemon=True)
+        self._thread.start()
+        Log.i(TAG, f"Lease heartbeat started (owner: {self.owner})")
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
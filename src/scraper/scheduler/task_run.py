@@ -0,0 +1,126 @@
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from src.scraper.scheduler.resource_usage import ResourceUsage, SharedUsage
+
+_current_run: ContextVar[Optional["TaskRun"]] = ContextVar("current_task_run", default=None)
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+
+RESOURCE_FIELDS = ("cpu_user_ms", "cpu_sys_ms", "peak_rss_kb", "rss_delta_kb", "io_read_bytes", "io_write_bytes")
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class TaskRun:
+    """
+    Statistics of one scheduled task execution.
+    Entering the run makes it the current run of this thread / asyncio task, so the module
+    context can attribute saved items and fetched bytes to it and read its deadline.
+    """
+
+    def __init__(self, job: Dict, measure_resources: bool = False, shared_process: bool = False):
+        """
+        :param measure_resources: Record CPU, memory and I/O of the process, for runs that own their process.
+        :param shared_process: Record the CPU time charged to the run instead, see charge_cpu(). For runs
+                               overlapping with others in one process.
+        """
+        self.module_id = job["module_id"]
+        self.task_key = job["task_key"]
+        timestamp = job.get("timestamp")
+        self.scheduled_at = int(timestamp.timestamp() * 1000) if timestamp else None
+        self.timeout = job.get("timeout") or 0
+        self.deadline: Optional[float] = None
+        self.started_at = 0
+        self.finished_at = 0
+        self.item_count = 0
+        self.bytes_fetched = 0
+        self.status = STATUS_ERROR
+        self.error = None
+        self.resources = dict.fromkeys(RESOURCE_FIELDS)
+        # Results saved by the module and not yet written, see ModuleContext.save_structured_results
+        self.pending_items: List[Dict] = []
+        self._finalizers: Dict[str, Callable[[], None]] = {}
+        if shared_process:
+            self._usage = SharedUsage()
+        else:
+            self._usage = ResourceUsage() if measure_resources else None
+        self._token = None
+
+    @staticmethod
+    def current() -> Optional["TaskRun"]:
+        return _current_run.get()
+
+    def __enter__(self):
+        self.started_at = _now_ms()
+        if self.timeout > 0:
+            self.deadline = self.started_at / 1000 + self.timeout
+        self._token = _current_run.set(self)
+        if self._usage:
+            self._usage.start()
+        return self
+
+    def charge_cpu(self):
+        """
+        Context manager charging the CPU time the current thread spends inside it to a shared_process run.
+        """
+        return self._usage.charge() if isinstance(self._usage, SharedUsage) else nullcontext()
+
+    def on_exit(self, key: str, callback: Callable[[], None]):
+        """
+        Run callback when the run ends, once per key. A failing callback fails the run.
+        """
+        self._finalizers.setdefault(key, callback)
+
+    def run_finalizers(self):
+        """
+        Run the on_exit callbacks now rather than when the run is left, so a coroutine can run them in a thread.
+        """
+        finalizers, self._finalizers = self._finalizers, {}
+        for callback in finalizers.values():
+            try:
+                callback()
+            except Exception as e:
+                self.fail(e)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.run_finalizers()
+        if self._usage:
+            self.resources = self._usage.stop()
+        self.finished_at = _now_ms()
+        _current_run.reset(self._token)
+        return False
+
+    def finish(self, success: bool):
+        self.status = STATUS_SUCCESS if success else STATUS_FAILED
+
+    def fail(self, error: Exception):
+        self.status = STATUS_ERROR
+        self.error = str(error)
+
+    def time_out(self):
+        self.status = STATUS_TIMEOUT
+        self.error = f"Timed out after {self.timeout} seconds"
+
+    def to_result(self) -> Dict:
+        return {
+            "module_id": self.module_id,
+            "task_key": self.task_key,
+            "success": self.status == STATUS_SUCCESS,
+            "status": self.status,
+            "error": self.error,
+            "scheduled_at": self.scheduled_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": max(0, self.finished_at - self.started_at),
+            "item_count": self.item_count,
+            "bytes_fetched": self.bytes_fetched,
+            **self.resources
+        }
@@ -0,0 +1,241 @@
+import heapq
+import itertools
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from croniter import croniter
+
+from src.utils.logger.logger import Log
+
+TAG = "TASK_SCHEDULER"
+
+# Seconds between two reads of the task table, so changes made from the dashboard are picked up.
+RELOAD_INTERVAL = 60
+
+# What happens to fires missed while the scraper service was down.
+MISFIRE_SKIP = "skip"            # resume at the next regular fire
+MISFIRE_COALESCE = "coalesce"    # run once for all missed fires within the grace window
+MISFIRE_CATCH_UP = "catch_up"    # run every missed fire within the grace window
+MISFIRE_POLICIES = [MISFIRE_SKIP, MISFIRE_COALESCE, MISFIRE_CATCH_UP]
+DEFAULT_MISFIRE_GRACE = 3600
+
+# Upper bound of missed fires replayed for one task with the catch_up policy.
+MAX_CATCH_UP_FIRES = 100
+
+# Consecutive fires sampled to find the shortest interval of a cron, which bounds the spread offset.
+SPREAD_SAMPLE_FIRES = 4
+
+
+def stable_offset(module_id: str, task_key: str, window: int) -> int:
+    """
+    Offset in [0, window) derived from the task identity, identical across restarts and processes.
+    """
+    if window <= 0:
+        return 0
+    return zlib.crc32(f"{module_id}:{task_key}".encode("utf-8")) % window
+
+
+class ScheduledTask:
+    def __init__(self, module_id: str, task_key: str, cron: str, jitter: int = 0, spread: bool = False):
+        self.module_id = module_id
+        self.task_key = task_key
+        self.cron = cron
+        self.jitter = jitter
+        self.spread = spread
+        # Seconds a run may take, 0 for the service default; refreshed on every reload.
+        self.timeout = 0
+        self.cancelled = False
+        now = time.time()
+        self.offset = stable_offset(module_id, task_key, self._offset_window(now))
+        # The expression is parsed once, every later fire only advances the iterator.
+        # It starts one offset back so a slot whose shifted fire is still ahead is not lost.
+        self._iter = croniter(cron, datetime.fromtimestamp(now - self.offset).astimezone())
+        self.scheduled_at = self._iter.get_next(float)
+
+    def _offset_window(self, now: float) -> int:
+        """
+        Spread uses the whole cron interval, jitter its own window; neither may push a fire past the next slot.
+        """
+        if not self.spread and self.jitter <= 0:
+            return 0
+        it = croniter(self.cron, datetime.fromtimestamp(now).astimezone())
+        fires = [it.get_next(float) for _ in range(SPREAD_SAMPLE_FIRES + 1)]
+        interval = int(min(b - a for a, b in zip(fires, fires[1:])))
+        return interval if self.spread else min(self.jitter, interval)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.module_id, self.task_key
+
+    @property
+    def next_fire(self) -> float:
+        return self.scheduled_at + self.offset
+
+    def matches(self, cron: str, jitter: int, spread: bool) -> bool:
+        return self.cron == cron and self.jitter == jitter and self.spread == spread
+
+    def advance(self) -> float:
+        self.scheduled_at = self._iter.get_next(float)
+        return self.next_fire
+
+    def missed_fires(self, last_fire_at: Optional[float], policy: str, grace: int) -> List[float]:
+        """
+        Scheduled times between the last persisted fire and now that should still run under the policy.
+        :param last_fire_at: Last scheduled time in seconds, None when the task never fired.
+        """
+        if not last_fire_at or policy == MISFIRE_SKIP:
+            return []
+        now = time.time()
+        # Fires older than the grace window are dropped anyway, so the scan starts at its edge.
+        start = max(last_fire_at, now - self.offset - max(0, grace))
+        it = croniter(self.cron, datetime.fromtimestamp(start).astimezone())
+        missed = []
+        fire = it.get_next(float)
+        while fire + self.offset <= now and len(missed) < MAX_CATCH_UP_FIRES:
+            missed.append(fire)
+            fire = it.get_next(float)
+        if policy == MISFIRE_COALESCE:
+            return missed[-1:]
+        return missed
+
+
+class TaskScheduler:
+    """
+    Cron scheduler backed by a min-heap keyed by next fire time.
+    Each wakeup pops only the due entries (O(log n) each) and the loop sleeps until the earliest one.
+    Heap keys include each task's stable jitter/spread offset, while dispatch receives the cron slot.
+    """
+
+    def __init__(self, loader: Callable[[], List[Dict]], dispatch: Callable[[ScheduledTask, datetime], None],
+                 reload_interval: float = RELOAD_INTERVAL):
+        """
+        :param loader: Returns the schedulable tasks as dicts with module_id, task_key and cron, and optionally
+                       last_fire_at (ms), misfire_policy, misfire_grace, jitter (seconds), spread and timeout (seconds).
+        :param dispatch: Called with the task and its scheduled fire time when it is due.
+        :param reload_interval: Seconds between two calls of the loader.
+        """
+        self._loader = loader
+        self._dispatch = dispatch
+        self._reload_interval = reload_interval
+        self._tasks: Dict[Tuple[str, str], ScheduledTask] = {}
+        self._rejected = set()
+        self._heap = []
+        self._seq = itertools.count()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._next_reload = 0.0
+        self._first_load = True
+
+    def _push(self, task: ScheduledTask):
+        heapq.heappush(self._heap, (task.next_fire, next(self._seq), task))
+
+    def reload(self):
+        rows = self._loader()
+        seen = set()
+        for row in rows:
+            key = (row["module_id"], row["task_key"])
+            cron = row["cron"].strip()
+            jitter = max(0, row.get("jitter") or 0)
+            spread = bool(row.get("spread"))
+            seen.add(key)
+
+            timeout = max(0, row.get("timeout") or 0)
+            existing = self._tasks.get(key)
+            if existing and existing.matches(cron, jitter, spread):
+                existing.timeout = timeout
+                continue
+            if existing:
+                existing.cancelled = True
+                del self._tasks[key]
+
+            if not croniter.is_valid(cron):
+                if (key, cron) not in self._rejected:
+                    Log.w(TAG, f"[{key[0]}] Invalid cron '{cron}' for task '{key[1]}', skipped")
+                    self._rejected.add((key, cron))
+                continue
+
+            task = ScheduledTask(key[0], key[1], cron, jitter, spread)
+            task.timeout = timeout
+            self._tasks[key] = task
+            self._push(task)
+            Log.i(TAG, f"[{key[0]}] Task '{key[1]}' scheduled ({cron}, offset {task.offset}s), "
+                       f"next fire at {datetime.fromtimestamp(task.next_fire)}")
+            # Only fires missed while the service was down are recovered, not those of a cron edited at runtime.
+            if self._first_load:
+                self._recover_misfires(task, row)
+
+        self._first_load = False
+
+        for key in list(self._tasks.keys()):
+            if key not in seen:
+                self._tasks.pop(key).cancelled = True
+                Log.i(TAG, f"[{key[0]}] Task '{key[1]}' unscheduled")
+
+        # Cancelled entries are dropped lazily when popped, rebuild once they dominate the heap.
+        if len(self._heap) > 2 * len(self._tasks) + 16:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+
+    def _recover_misfires(self, task: ScheduledTask, row: Dict):
+        policy = row.get("misfire_policy") or MISFIRE_COALESCE
+        if policy not in MISFIRE_POLICIES:
+            Log.w(TAG, f"[{task.module_id}] Unknown misfire policy '{policy}' for task '{task.task_key}', using {MISFIRE_COALESCE}")
+            policy = MISFIRE_COALESCE
+        grace = row.get("misfire_grace")
+        grace = DEFAULT_MISFIRE_GRACE if grace is None else grace
+        last_fire_at = row.get("last_fire_at")
+        missed = task.missed_fires(last_fire_at / 1000 if last_fire_at else None, policy, grace)
+        if not missed:
+            return
+        Log.i(TAG, f"[{task.module_id}] Task '{task.task_key}' missed {len(missed)} fire(s) to recover ({policy}), "
+                   f"last fired at {datetime.fromtimestamp(last_fire_at / 1000)}")
+        for fire_at in missed:
+            self._fire(task, fire_at)
+
+    def _fire(self, task: ScheduledTask, fire_at: float):
+        try:
+            self._dispatch(task, datetime.fromtimestamp(fire_at).astimezone())
+        except Exception as e:
+            Log.e(TAG, f"[{task.module_id}] Failed to dispatch task '{task.task_key}'", error=e)
+
+    def request_reload(self):
+        self._next_reload = 0.0
+        self._wakeup.set()
+
+    def _fire_due(self, now: float):
+        while self._heap and self._heap[0][0] <= now:
+            _, _, task = heapq.heappop(self._heap)
+            if task.cancelled:
+                continue
+            self._fire(task, task.scheduled_at)
+            task.advance()
+            self._push(task)
+
+    def run_forever(self):
+        self._running = True
+        Log.i(TAG, "Scheduler started")
+        while self._running:
+            now = time.time()
+            if now >= self._next_reload:
+                try:
+                    self.reload()
+                except Exception as e:
+                    Log.e(TAG, "Failed to reload scheduled tasks", error=e)
+                self._next_reload = now + self._reload_interval
+
+            self._fire_due(time.time())
+
+            timeout = self._next_reload - time.time()
+            if self._heap:
+                timeout = min(timeout, self._heap[0][0] - time.time())
+            if timeout > 0:
+                self._wakeup.wait(timeout)
+            self._wakeup.clear()
+        Log.i(TAG, "Scheduler stopped")
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
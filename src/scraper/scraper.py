@@ -1,10 +1,73 @@
-import time
 import os
+import threading
+from datetime import datetime
+from src.database.connection import system_session_scope
+from src.database.models import SystemConfig
 from src.scraper.modules.module_manager import ModuleManager
+from src.scraper.modules.module_watcher import ModuleWatcher, WATCH_AUTO
+from src.scraper.scheduler.async_runtime import AsyncTaskRuntime, is_async_module
+from src.scraper.scheduler.module_host import ModuleHostRunner, DEFAULT_MAX_TASKS
+from src.scraper.scheduler.task_dispatcher import TaskDispatcher, DispatchLimits, POLICY_COALESCE
+from src.scraper.scheduler.task_lease import TaskLeaseManager
+from src.scraper.scheduler.task_executor import TaskExecutor, resolve_worker_count
+from src.scraper.scheduler.task_scheduler import TaskScheduler, ScheduledTask
+from src.scraper.storage.fingerprint_index import FingerprintIndex
+from src.scraper.storage.news_partitions import RETENTION_DROP
 from src.utils.logger.logger import Log
 
 TAG="SCRAPER_SERVICE"
 
+# Task run history older than this is removed, checked once a day.
+TASK_RUN_RETENTION_DAYS = 30
+# Seconds between runs of the housekeeping (run history, leases, news retention, blobs).
+MAINTENANCE_INTERVAL = 86400
+
+# Which modules run in their own host process instead of the shared workers and event loop.
+SANDBOX_OFF = "off"
+SANDBOX_EXTERNAL = "external"
+SANDBOX_ALL = "all"
+
+# Seconds a changed module waits for its running tasks before the new code is swapped in anyway.
+MODULE_DRAIN_TIMEOUT = 300
+
+
+def _get_system_configs(defaults):
+    """
+    Read several system configs in one query, falling back to the given defaults.
+    """
+    values = dict(defaults)
+    try:
+        with system_session_scope() as session:
+            for config in session.query(SystemConfig).filter(SystemConfig.key.in_(list(defaults.keys()))).all():
+                if config.value is not None:
+                    values[config.key] = config.value
+    except Exception as e:
+        Log.e(TAG, "Failed to read system configs", error=e)
+    return values
+
+
+def _to_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _load_dispatch_limits(worker_count) -> DispatchLimits:
+    configs = _get_system_configs({
+        "scraper_max_concurrency": "0",
+        "scraper_module_max_concurrency": "1",
+        "scraper_queue_size": "100",
+        "scraper_queue_policy": POLICY_COALESCE
+    })
+    max_concurrency = _to_int(configs["scraper_max_concurrency"], 0)
+    return DispatchLimits(
+        max_concurrency=max_concurrency if max_concurrency > 0 else worker_count,
+        module_max_concurrency=_to_int(configs["scraper_module_max_concurrency"], 1),
+        queue_size=_to_int(configs["scraper_queue_size"], 100),
+        queue_policy=configs["scraper_queue_policy"]
+    )
+
 
 def run_scraper_service():
     pid = os.getpid()
@@ -15,10 +78,155 @@ def run_scraper_service():
     for mod_id, info in available_modules.items():
         meta = info.get('meta', {})
         Log.i(TAG, f" - [{mod_id}] {meta.get('name', mod_id)}")
-    
-    Log.i(TAG,"Inited, starting loop...")
-    try:
+
+    configs = _get_system_configs({
+        "scraper_worker_count": "0",
+        "scraper_module_sandbox": SANDBOX_OFF,
+        "scraper_sandbox_max_tasks": str(DEFAULT_MAX_TASKS)
+    })
+    sandbox_mode = configs["scraper_module_sandbox"]
+
+    def is_sandboxed(module_id: str) -> bool:
+        if sandbox_mode == SANDBOX_ALL:
+            return True
+        info = manager.get_module_info(module_id)
+        return sandbox_mode == SANDBOX_EXTERNAL and bool(info) and info["source"] == "external"
+
+    executor = TaskExecutor(resolve_worker_count(configs["scraper_worker_count"]))
+    # Sandboxed modules are never imported into the service, they only exist in their host
+    executor.warm({task["module_id"] for task in manager.db_get_scheduled_tasks() if not is_sandboxed(task["module_id"])})
+    executor.start()
+    async_runtime = AsyncTaskRuntime()
+    async_runtime.start()
+    module_hosts = ModuleHostRunner(_to_int(configs["scraper_sandbox_max_tasks"], DEFAULT_MAX_TASKS))
+    lease = TaskLeaseManager()
+    lease.start()
+
+    maintenance_stop = threading.Event()
+
+    def maintenance_loop():
+        # Its own thread, retention and blob collection can take long and must not hold up finishing runs
         while True:
-            time.sleep(10)
+            try:
+                manager.db_prune_task_runs(TASK_RUN_RETENTION_DAYS)
+                lease.prune()
+                retention = _get_system_configs({
+                    "scraper_news_retention_months": "0",
+                    "scraper_news_retention_action": RETENTION_DROP
+                })
+                manager.db_apply_news_retention(_to_int(retention["scraper_news_retention_months"], 0),
+                                                retention["scraper_news_retention_action"])
+                manager.db_collect_blobs()
+            except Exception as e:
+                Log.e(TAG, "Failed to run maintenance", error=e)
+            if maintenance_stop.wait(MAINTENANCE_INTERVAL):
+                return
+
+    maintenance = threading.Thread(target=maintenance_loop, name="ScraperMaintenance", daemon=True)
+    maintenance.start()
+
+    def record_run(result):
+        try:
+            manager.db_record_task_run(result)
+        except Exception as e:
+            Log.e(TAG, f"[{result['module_id']}] Failed to record run of task '{result['task_key']}'", error=e)
+
+    def route(module_id: str):
+        if is_sandboxed(module_id):
+            return module_hosts
+        # Modules with a coroutine task share the event loop, the others get a worker process.
+        instance = manager.get_module_instance(module_id)
+        return async_runtime if is_async_module(instance) else executor
+
+    def on_result(result):
+        if result["success"]:
+            Log.i(TAG, f"[{result['module_id']}] Task '{result['task_key']}' finished in {result['duration_ms']} ms, {result['item_count']} items")
+        else:
+            Log.w(TAG, f"[{result['module_id']}] Task '{result['task_key']}' failed: {result.get('error') or 'returned False'}")
+        record_run(result)
+
+    dispatcher = TaskDispatcher(route, on_result, _load_dispatch_limits(executor.max_workers), lease)
+
+    default_timeout = 0
+
+    def resolve_timeout(timeout):
+        return timeout if timeout and timeout > 0 else default_timeout
+
+    def take_over_fires(tasks):
+        by_key = {(task["module_id"], task["task_key"]): task for task in tasks}
+        try:
+            taken = lease.take_over_expired()
+        except Exception as e:
+            Log.e(TAG, "Failed to take over expired leases", error=e)
+            return
+        for fire in taken:
+            task = by_key.get((fire["module_id"], fire["task_key"]), {})
+            dispatcher.submit(fire["module_id"], fire["task_key"], task.get("cron", ""), fire["fire_time"],
+                              timeout=resolve_timeout(task.get("timeout")), claimed=True)
+
+    def load_tasks():
+        # Runs on every scheduler reload, which also paces the takeover of fires from dead nodes.
+        nonlocal default_timeout
+        dispatcher.set_limits(_load_dispatch_limits(executor.max_workers))
+        default_timeout = _to_int(_get_system_configs({"scraper_task_timeout": "1800"})["scraper_task_timeout"], 1800)
+        tasks = manager.db_get_scheduled_tasks()
+        take_over_fires(tasks)
+        return tasks
+
+    def dispatch(task: ScheduledTask, fire_time: datetime):
+        dispatcher.submit(task.module_id, task.task_key, task.cron, fire_time, timeout=resolve_timeout(task.timeout))
+        # Persisted so that fires missed during a restart can be recovered by the misfire policy.
+        try:
+            manager.db_set_task_last_fire(task.module_id, task.task_key, int(fire_time.timestamp() * 1000))
+        except Exception as e:
+            Log.e(TAG, f"[{task.module_id}] Failed to save last fire time of task '{task.task_key}'", error=e)
+
+    scheduler = TaskScheduler(load_tasks, dispatch)
+
+    def on_modules_changed(module_dirs):
+        # Fires of the changed modules are held and their running tasks drained before the new code is loaded,
+        # the other modules keep running untouched.
+        affected = manager.get_module_ids_in_dirs(module_dirs)
+        Log.i(TAG, f"Module files changed: {', '.join(sorted(affected)) or ', '.join(sorted(module_dirs))}")
+        for module_id in affected:
+            dispatcher.pause_module(module_id)
+        try:
+            for module_id in affected:
+                if not dispatcher.wait_module_idle(module_id, MODULE_DRAIN_TIMEOUT):
+                    Log.w(TAG, f"[{module_id}] Tasks still running after {MODULE_DRAIN_TIMEOUT}s, reloading anyway")
+            manager.reload_modules()
+            for module_id in affected | manager.get_module_ids_in_dirs(module_dirs):
+                module_hosts.recycle(module_id)
+                was_loaded = manager.is_module_loaded(module_id)
+                manager.unload_module(module_id)
+                if was_loaded and manager.get_module_info(module_id):
+                    try:
+                        manager.get_module_instance(module_id)
+                        Log.i(TAG, f"[{module_id}] Module reloaded")
+                    except Exception as e:
+                        Log.e(TAG, f"[{module_id}] Failed to reload module", error=e)
+        finally:
+            for module_id in affected:
+                dispatcher.resume_module(module_id)
+        scheduler.request_reload()
+
+    watch_mode = _get_system_configs({"scraper_hot_reload": WATCH_AUTO})["scraper_hot_reload"]
+    watcher = ModuleWatcher(manager.dirs.values(), on_modules_changed, watch_mode)
+    watcher.start()
+
+    Log.i(TAG,"Inited, starting scheduler...")
+    try:
+        scheduler.run_forever()
     except KeyboardInterrupt:
         Log.w(TAG,"Interrupted, stopping service...")
+    finally:
+        watcher.stop()
+        scheduler.stop()
+        maintenance_stop.set()
+        lease.stop()
+        async_runtime.shutdown()
+        module_hosts.shutdown()
+        executor.shutdown()
+        dispatcher.shutdown()
+        maintenance.join(timeout=5)
+        FingerprintIndex().flush()
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+import time
+import zlib
+from typing import Iterable, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # Optional, zlib is used without it
+    zstandard = None
+
+from src.utils.cache_manage import cache_manager
+from src.utils.logger.logger import Log
+
+TAG = "BLOB_STORE"
+
+# First byte of every blob file, the codec it was written with. Blobs stay readable when zstandard is removed
+# only if they were written with zlib, so the codec is never guessed.
+CODEC_ZLIB = b"z"
+CODEC_ZSTD = b"s"
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Blobs younger than this are never collected, their items may still be buffered in a running task.
+COLLECT_GRACE_SECONDS = 86400
+
+
+class BlobStore:
+    """
+    Content-addressed store for large raw payloads (such as the raw HTML of a scraped post) kept out of the
+    item rows. A blob is addressed by the sha256 of its uncompressed content and written compressed to
+    cache/blobs/<2 hex>/<2 hex>/<sha256>; storing the same content twice writes it once.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(BlobStore, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self.root = cache_manager.get_cache_dir("blobs")
+        self._initialized = True
+
+    def _path(self, blob_hash: str) -> str:
+        return os.path.join(self.root, blob_hash[:2], blob_hash[2:4], blob_hash)
+
+    @staticmethod
+    def _compress(data: bytes) -> bytes:
+        if zstandard is not None:
+            return CODEC_ZSTD + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        return CODEC_ZLIB + zlib.compress(data, ZLIB_LEVEL)
+
+    @staticmethod
+    def _decompress(payload: bytes) -> bytes:
+        codec, body = payload[:1], payload[1:]
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(body)
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Blob was written with zstandard, which is not installed")
+            return zstandard.ZstdDecompressor().decompress(body)
+        raise ValueError(f"Unknown blob codec {codec!r}")
+
+    @staticmethod
+    def _is_hash(blob_hash: str) -> bool:
+        return len(blob_hash) == 64 and all(c in "0123456789abcdef" for c in blob_hash)
+
+    def put(self, data: Union[str, bytes]) -> str:
+        """
+        :return: The sha256 hex digest addressing the blob.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        blob_hash = hashlib.sha256(data).hexdigest()
+        path = self._path(blob_hash)
+        if os.path.exists(path):
+            # Touched so a re-stored blob is not collected before its new item is saved
+            os.utime(path)
+            return blob_hash
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written aside and renamed, readers never see a partial blob
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        with open(partial, "wb") as f:
+            f.write(self._compress(data))
+        os.replace(partial, path)
+        return blob_hash
+
+    def get(self, blob_hash: str) -> Optional[bytes]:
+        if not self._is_hash(blob_hash):
+            return None
+        try:
+            with open(self._path(blob_hash), "rb") as f:
+                return self._decompress(f.read())
+        except FileNotFoundError:
+            return None
+
+    def get_text(self, blob_hash: str) -> Optional[str]:
+        data = self.get(blob_hash)
+        return data.decode("utf-8") if data is not None else None
+
+    def collect(self, referenced: Iterable[str]) -> int:
+        """
+        Remove blobs no stored item references anymore.
+        :param referenced: Hashes of all blobs still in use.
+        :return: Number of removed blobs.
+        """
+        referenced = set(referenced)
+        cutoff = time.time() - COLLECT_GRACE_SECONDS
+        removed = 0
+        for root, dirs, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if name in referenced or os.path.getmtime(path) >= cutoff:
+                        continue
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    continue
+        if removed:
+            Log.i(TAG, f"Collected {removed} unreferenced blobs")
+        return removed
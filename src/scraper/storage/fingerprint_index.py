@@ -0,0 +1,277 @@
+import hashlib
+import math
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Set, Tuple
+
+from sqlalchemy import func, select
+
+from src.scraper.storage.news_partitions import NewsPartitions
+from src.utils.cache_manage import cache_manager
+from src.utils.logger.logger import Log
+
+TAG = "FINGERPRINT_INDEX"
+
+# Fingerprints the Bloom filter is sized for, it is rebuilt at twice the size once more are stored.
+BLOOM_CAPACITY = 1_000_000
+BLOOM_ERROR_RATE = 0.001
+# Seconds between writes of the filter to the cache directory.
+PERSIST_INTERVAL = 60
+# Seconds between scans for fingerprints other processes stored. A fingerprint stored in between is not
+# skipped by the filter but by the unique index on insert.
+CATCH_UP_INTERVAL = PERSIST_INTERVAL
+# Fingerprints known to be stored, kept exactly so repeats from the lookback window need no query.
+RECENT_CAPACITY = 50_000
+# Fingerprints per query when a Bloom hit is confirmed against the database.
+CONFIRM_CHUNK_SIZE = 500
+# Rows get their created_at before their transaction commits, each catch-up rescans this far back (ms)
+# so rows another process committed late are still picked up.
+CATCH_UP_MARGIN = 5 * 60 * 1000
+
+BLOOM_FILE = "bloom.bin"
+# magic, format version, bits, hashes, capacity, count, time (ms) of the last scan of stored fingerprints
+BLOOM_HEADER = struct.Struct("<4sIQIQQq")
+BLOOM_MAGIC = b"FPBF"
+BLOOM_VERSION = 1
+
+
+def _digest(module_id: str, fingerprint: str) -> bytes:
+    return hashlib.blake2b(f"{module_id}\0{fingerprint}".encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Bit array answering "definitely not added" or "maybe added", double hashing over a 128 bit digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE, bits: int = 0, hashes: int = 0,
+                 data: bytearray = None, count: int = 0):
+        self.capacity = capacity
+        self.bits = bits or max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = hashes or max(1, round(self.bits / capacity * math.log(2)))
+        self.data = data if data is not None else bytearray((self.bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, digest: bytes):
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, digest: bytes):
+        for position in self._positions(digest):
+            self.data[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class FingerprintIndex:
+    """
+    Answers whether a module already stored an item with a fingerprint, in front of the unique
+    (module_id, fingerprint) index of news_items.
+
+    A Bloom filter miss means the fingerprint is new, an exact set of recently stored fingerprints catches
+    the repeats every scrape of the lookback window brings; only Bloom hits outside that set (old items or
+    false positives) are confirmed with a query.
+
+    Every process (the service and each worker) keeps its own filter. The database is what they share: every
+    CATCH_UP_INTERVAL seconds, when a process records stored fingerprints, its filter also adds the ones stored
+    since its last scan, whichever process stored them. Lookups never scan, a repeat another process stored
+    since is dropped by the unique index on insert. The filter is persisted every PERSIST_INTERVAL seconds
+    along with the time of the last scan, so a filter loaded from any process's write is caught up from there.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(FingerprintIndex, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._path = os.path.join(cache_manager.get_cache_dir("fingerprints"), BLOOM_FILE)
+        self._bloom = None
+        self._indexed_until = 0
+        self._caught_up_at = 0.0
+        self._recent: "OrderedDict[bytes, None]" = OrderedDict()
+        self._dirty = False
+        self._persisted_at = time.time()
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    def _ensure_loaded(self):
+        if self._bloom is not None:
+            return
+        if not self._load():
+            self._rebuild(BLOOM_CAPACITY)
+            return
+        added = self._catch_up()
+        Log.i(TAG, f"Loaded fingerprint filter with {self._bloom.count} entries, {added} caught up")
+
+    def _catch_up(self) -> int:
+        """
+        Add the fingerprints stored since the last scan, by this or any other process.
+        :return: Number of fingerprints added.
+        """
+        scanned_at = int(time.time() * 1000)
+        self._caught_up_at = time.time()
+        added = 0
+        for module_id, fingerprint, _ in self._stream_fingerprints(max(0, self._indexed_until - CATCH_UP_MARGIN)):
+            digest = _digest(module_id, fingerprint)
+            # The margin rescans rows already added, they must not count twice
+            if digest not in self._bloom:
+                self._bloom.add(digest)
+                added += 1
+            self._remember(digest)
+        self._indexed_until = max(self._indexed_until, scanned_at)
+        if added:
+            self._dirty = True
+            if self._bloom.count > self._bloom.capacity:
+                self._rebuild(self._bloom.capacity * 2)
+        return added
+
+    def _load(self) -> bool:
+        try:
+            with open(self._path, "rb") as f:
+                header = f.read(BLOOM_HEADER.size)
+                magic, version, bits, hashes, capacity, count, indexed_until = BLOOM_HEADER.unpack(header)
+                if magic != BLOOM_MAGIC or version != BLOOM_VERSION:
+                    return False
+                data = bytearray(f.read())
+        except (OSError, struct.error):
+            return False
+        if len(data) != (bits + 7) // 8:
+            Log.w(TAG, "Fingerprint filter file is truncated, rebuilding")
+            return False
+        self._bloom = BloomFilter(capacity, bits=bits, hashes=hashes, data=data, count=count)
+        self._indexed_until = indexed_until
+        return True
+
+    @staticmethod
+    def _stream_fingerprints(since: int = 0):
+        for partition in NewsPartitions().partitions():
+            table = partition.table
+            query = select(table.c.module_id, table.c.fingerprint, table.c.created_at) \
+                .where(table.c.fingerprint.isnot(None), table.c.created_at >= since) \
+                .execution_options(yield_per=10_000)
+            with partition.engine.connect() as conn:
+                for row in conn.execute(query):
+                    yield row
+
+    def _rebuild(self, capacity: int):
+        stored = 0
+        for partition in NewsPartitions().partitions():
+            with partition.engine.connect() as conn:
+                stored += conn.execute(select(func.count()).select_from(partition.table)
+                                       .where(partition.table.c.fingerprint.isnot(None))).scalar() or 0
+        bloom = BloomFilter(max(capacity, stored * 2))
+        scanned_at = int(time.time() * 1000)
+        for module_id, fingerprint, _ in self._stream_fingerprints():
+            bloom.add(_digest(module_id, fingerprint))
+        self._bloom = bloom
+        self._indexed_until = scanned_at
+        self._caught_up_at = scanned_at / 1000
+        self._dirty = True
+        Log.i(TAG, f"Rebuilt fingerprint filter for {bloom.capacity} entries ({bloom.count} stored, "
+                   f"{len(bloom.data) // 1024} KB)")
+        self._persist()
+
+    def _persist(self):
+        header = BLOOM_HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self._bloom.bits, self._bloom.hashes,
+                                   self._bloom.capacity, self._bloom.count, self._indexed_until)
+        # Every process writes the filter, each through its own file
+        partial = f"{self._path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            with open(partial, "wb") as f:
+                f.write(header)
+                f.write(self._bloom.data)
+            os.replace(partial, self._path)
+            self._dirty = False
+        except OSError as e:
+            Log.e(TAG, "Failed to persist fingerprint filter", error=e)
+        self._persisted_at = time.time()
+
+    def _remember(self, digest: bytes):
+        self._recent[digest] = None
+        self._recent.move_to_end(digest)
+        if len(self._recent) > RECENT_CAPACITY:
+            self._recent.popitem(last=False)
+
+    def filter_new(self, module_id: str, fingerprints: Iterable[str]) -> List[str]:
+        """
+        :return: The fingerprints the module has not stored yet, in their original order. Empty fingerprints
+                 are never deduplicated and always returned.
+        """
+        fingerprints = list(fingerprints)
+        new: List[str] = []
+        to_confirm: List[Tuple[str, bytes]] = []
+        with self._lock:
+            self._ensure_loaded()
+            for fingerprint in fingerprints:
+                if not fingerprint:
+                    continue
+                digest = _digest(module_id, fingerprint)
+                if digest in self._recent:
+                    self._recent.move_to_end(digest)
+                elif digest in self._bloom:
+                    to_confirm.append((fingerprint, digest))
+
+        stored = self._query_stored(module_id, [fingerprint for fingerprint, _ in to_confirm]) if to_confirm else set()
+        with self._lock:
+            for fingerprint, digest in to_confirm:
+                if fingerprint in stored:
+                    self._remember(digest)
+            known = {fingerprint for fingerprint in fingerprints
+                     if fingerprint and _digest(module_id, fingerprint) in self._recent}
+        for fingerprint in fingerprints:
+            if not fingerprint or fingerprint not in known:
+                new.append(fingerprint)
+        return new
+
+    @staticmethod
+    def _query_stored(module_id: str, fingerprints: List[str]) -> Set[str]:
+        stored = set()
+        for partition in NewsPartitions().partitions():
+            table = partition.table
+            with partition.engine.connect() as conn:
+                for start in range(0, len(fingerprints), CONFIRM_CHUNK_SIZE):
+                    chunk = fingerprints[start:start + CONFIRM_CHUNK_SIZE]
+                    stored.update(conn.execute(
+                        select(table.c.fingerprint).where(table.c.module_id == module_id, table.c.fingerprint.in_(chunk))
+                    ).scalars())
+        return stored
+
+    def add(self, module_id: str, fingerprints: Iterable[str]):
+        """
+        Record fingerprints just stored by the module, so this process knows them before its next scan, and
+        scan for the ones other processes stored when CATCH_UP_INTERVAL has passed.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            for fingerprint in fingerprints:
+                if fingerprint:
+                    digest = _digest(module_id, fingerprint)
+                    if digest not in self._bloom:
+                        self._bloom.add(digest)
+                        self._dirty = True
+                    self._remember(digest)
+            if time.time() - self._caught_up_at >= CATCH_UP_INTERVAL:
+                self._catch_up()
+            if self._bloom.count > self._bloom.capacity:
+                self._rebuild(self._bloom.capacity * 2)
+            elif self._dirty and time.time() - self._persisted_at >= PERSIST_INTERVAL:
+                self._persist()
+
+    def flush(self):
+        """
+        Write the filter if it changed since the last write, called when the scraper service stops.
+        """
+        with self._lock:
+            if self._bloom is not None and self._dirty:
+                self._persist()
@@ -0,0 +1,213 @@
+import hashlib
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.scraper.storage.news_partitions import NewsPartitions
+from src.utils.logger.logger import Log
+
+TAG = "NEAR_DUPLICATES"
+
+SIGNATURE_BITS = 64
+# Items whose signatures differ in at most this many bits are the same story. Posts are short, a reposted text
+# with a source line appended lands a few bits further away than the 3 usual for web pages.
+MAX_DISTANCE = 5
+# The signature is split into MAX_DISTANCE + 1 bands, two signatures within MAX_DISTANCE bits share at least one
+# band exactly, so looking up the bands finds every candidate. (shift, mask) of each band.
+BANDS = MAX_DISTANCE + 1
+_BAND_EDGES = [SIGNATURE_BITS * band // BANDS for band in range(BANDS + 1)]
+BAND_RANGES = [(start, (1 << (end - start)) - 1) for start, end in zip(_BAND_EDGES, _BAND_EDGES[1:])]
+# Character n-grams, so wording changes shift few features and CJK text needs no word segmentation.
+SHINGLE_SIZE = 3
+# Texts shorter than this (after normalization) are too short to tell a repost from a different story.
+MIN_TEXT_LENGTH = 30
+# Only the start of longer texts is compared, which also keeps every bit count below 2 ** LANE_BITS.
+MAX_TEXT_LENGTH = 20_000
+# Reposts show up within days; older items and anything past MAX_ENTRIES leave the index, about 20 MB at most.
+WINDOW_SECONDS = 7 * 86400
+MAX_ENTRIES = 50_000
+# Rows get their created_at before their transaction commits, each catch-up rescans this far back (ms)
+# so rows another process committed late are still picked up.
+CATCH_UP_MARGIN = 5 * 60 * 1000
+# Seconds between scans for signatures other processes stored, reposts stored by two processes within it
+# are not clustered. Partitions are filed by release month, so every scan has to read all of them.
+CATCH_UP_INTERVAL = 30
+
+_NOISE = re.compile(r"https?://\S+|[\W_]+", re.UNICODE)
+
+# Bit-sliced counting: every signature bit gets a LANE_BITS wide lane in one big integer, so a shingle adds its
+# hash to all 64 counters with one addition. _SPREAD[k][v] is byte value v of hash byte k spread into its lanes.
+LANE_BITS = 20
+LANE_MASK = (1 << LANE_BITS) - 1
+_SPREAD = [[sum(1 << ((k * 8 + bit) * LANE_BITS) for bit in range(8) if value >> bit & 1) for value in range(256)]
+           for k in range(SIGNATURE_BITS // 8)]
+
+
+def _normalize(text: str) -> str:
+    # Links, punctuation and spacing differ between channels reposting the same text
+    return _NOISE.sub("", text).lower()
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    :return: 64 bit SimHash of the text, None when it is too short to compare.
+    """
+    text = _normalize(text)[:MAX_TEXT_LENGTH]
+    if len(text) < MIN_TEXT_LENGTH:
+        return None
+    shingles = Counter(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+    counters = 0
+    total = 0
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        spread = 0
+        for k, value in enumerate(digest):
+            spread += _SPREAD[k][value]
+        counters += spread * count
+        total += count
+    # A bit is set when more than half of the shingles (by count) have it set
+    signature = 0
+    for bit in range(SIGNATURE_BITS):
+        if 2 * (counters >> (bit * LANE_BITS) & LANE_MASK) > total:
+            signature |= 1 << bit
+    return signature
+
+
+def item_text(value: Dict) -> str:
+    return " ".join(str(value.get(field) or "") for field in ("title", "content"))
+
+
+def to_signed(signature: int) -> int:
+    # Stored in a signed 64 bit column
+    return signature - (1 << SIGNATURE_BITS) if signature >= 1 << (SIGNATURE_BITS - 1) else signature
+
+
+def to_unsigned(signature: int) -> int:
+    return signature + (1 << SIGNATURE_BITS) if signature < 0 else signature
+
+
+class NearDuplicateIndex:
+    """
+    Finds items telling the same story in other words, across all modules and channels, with SimHash
+    signatures in an LSH band index. Reposts are clustered under the first item seen (its canonical item).
+    The index is incremental and bounded by WINDOW_SECONDS and MAX_ENTRIES.
+
+    Only stored items enter the index: match() looks a batch up before it is inserted, add() records the
+    rows that were actually inserted once their transaction committed. Every process keeps its own index
+    and catches up from the simhash column of news_items every CATCH_UP_INTERVAL seconds, so items stored by
+    other workers or the event loop cluster too.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(NearDuplicateIndex, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        # item id -> (signature, canonical id, added at), oldest first
+        self._entries: "OrderedDict[str, Tuple[int, str, float]]" = OrderedDict()
+        self._bands: List[Dict[int, List[str]]] = [{} for _ in range(BANDS)]
+        # Time (ms) of the last scan of stored signatures
+        self._loaded_until = 0
+        self._caught_up_at = 0.0
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    @staticmethod
+    def _band_keys(signature: int):
+        for band, (shift, mask) in enumerate(BAND_RANGES):
+            yield band, signature >> shift & mask
+
+    def _catch_up(self):
+        """
+        Add the signatures stored since the last scan, by this or any other process.
+        """
+        scanned_at = int(time.time() * 1000)
+        self._caught_up_at = time.time()
+        since = max(int((time.time() - WINDOW_SECONDS) * 1000), self._loaded_until - CATCH_UP_MARGIN)
+        rows = []
+        for partition in NewsPartitions().partitions():
+            table = partition.table
+            with partition.engine.connect() as conn:
+                rows.extend(conn.execute(
+                    select(table.c.id, table.c.simhash, table.c.canonical_id, table.c.created_at)
+                    .where(table.c.simhash.isnot(None), table.c.created_at >= since)
+                    .order_by(table.c.created_at.desc()).limit(MAX_ENTRIES)
+                ).all())
+        rows = [row for row in sorted(rows, key=lambda row: row.created_at)[-MAX_ENTRIES:] if row.id not in self._entries]
+        for item_id, signature, canonical_id, created_at in rows:
+            self._add(item_id, to_unsigned(signature), canonical_id or item_id, created_at / 1000)
+        if not self._loaded_until:
+            Log.i(TAG, f"Loaded {len(rows)} signatures into the near-duplicate index")
+        self._loaded_until = scanned_at
+        if rows:
+            self._evict()
+
+    def _add(self, item_id: str, signature: int, canonical_id: str, added_at: float):
+        self._entries[item_id] = (signature, canonical_id, added_at)
+        for band, key in self._band_keys(signature):
+            self._bands[band].setdefault(key, []).append(item_id)
+
+    def _evict(self):
+        cutoff = time.time() - WINDOW_SECONDS
+        while self._entries:
+            item_id, (signature, _, added_at) = next(iter(self._entries.items()))
+            if len(self._entries) <= MAX_ENTRIES and added_at >= cutoff:
+                break
+            del self._entries[item_id]
+            for band, key in self._band_keys(signature):
+                bucket = self._bands[band].get(key)
+                if bucket:
+                    bucket.remove(item_id)
+                    if not bucket:
+                        del self._bands[band][key]
+
+    def _find(self, signature: int, entries: Dict[str, Tuple[int, str, float]],
+              bands: List[Dict[int, List[str]]]) -> Optional[str]:
+        best, best_distance = None, MAX_DISTANCE + 1
+        for band, key in self._band_keys(signature):
+            for candidate in bands[band].get(key, ()):
+                distance = bin(entries[candidate][0] ^ signature).count("1")
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        return entries[best][1] if best else None
+
+    def match(self, items: List[Tuple[str, int]]) -> Dict[str, Optional[str]]:
+        """
+        Look up a batch of (item id, signature) about to be stored, without adding it to the index.
+        An item may also repeat an earlier item of the same batch.
+        :return: Item id -> ID of the canonical item of its story when it repeats one, otherwise None.
+        """
+        result = {}
+        batch: Dict[str, Tuple[int, str, float]] = {}
+        batch_bands: List[Dict[int, List[str]]] = [{} for _ in range(BANDS)]
+        with self._lock:
+            if time.time() - self._caught_up_at >= CATCH_UP_INTERVAL:
+                self._catch_up()
+            for item_id, signature in items:
+                canonical_id = self._find(signature, self._entries, self._bands) \
+                    or self._find(signature, batch, batch_bands)
+                result[item_id] = canonical_id
+                batch[item_id] = (signature, canonical_id or item_id, 0)
+                for band, key in self._band_keys(signature):
+                    batch_bands[band].setdefault(key, []).append(item_id)
+        return result
+
+    def add(self, items: List[Tuple[str, int, str]]):
+        """
+        Record (item id, signature, canonical id) of items whose insert committed.
+        """
+        with self._lock:
+            now = time.time()
+            for item_id, signature, canonical_id in items:
+                if item_id not in self._entries:
+                    self._add(item_id, signature, canonical_id, now)
+            self._evict()
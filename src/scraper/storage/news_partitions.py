@@ -0,0 +1,240 @@
+import os
+import re
+import shutil
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import MetaData, Table, inspect, text
+from sqlalchemy.exc import OperationalError
+
+from src.database.connection import DATA_DB_DIR, DatabaseManager, data_db_manager
+from src.database.models import NewsItem
+from src.utils.logger.logger import Log
+
+TAG = "NEWS_PARTITIONS"
+
+# SQLite: one database file per month, opened when first used. Other databases: one table per month.
+PARTITION_DIR = os.path.join(DATA_DB_DIR, "news")
+ARCHIVE_DIR = os.path.join(DATA_DB_DIR, "archive")
+PARTITION_FILE = re.compile(r"^news_(\d{6})\.db$")
+PARTITION_TABLE = re.compile(r"^news_items_(\d{6})$")
+
+RETENTION_DROP = "drop"
+RETENTION_ARCHIVE = "archive"
+RETENTION_ACTIONS = [RETENTION_DROP, RETENTION_ARCHIVE]
+
+FTS_TABLE = "news_items_fts"
+# Rows reference news_items by id rather than by rowid, VACUUM may renumber the rowids of news_items.
+CREATE_STATEMENTS = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"item_id UNINDEXED, title, summary, content, source, tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON news_items BEGIN "
+    f"INSERT INTO {FTS_TABLE} (item_id, title, summary, content, source) "
+    f"VALUES (new.id, new.title, new.summary, new.content, new.source); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON news_items BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE item_id = old.id; END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, summary, content, source ON news_items BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE item_id = old.id; "
+    f"INSERT INTO {FTS_TABLE} (item_id, title, summary, content, source) "
+    f"VALUES (new.id, new.title, new.summary, new.content, new.source); END",
+]
+
+
+def create_search_index(conn) -> bool:
+    """
+    Create the FTS5 table and the triggers keeping it in sync with news_items, and index existing rows.
+    :return: False when the database is not SQLite or SQLite lacks FTS5 / the trigram tokenizer (before 3.34).
+    """
+    if conn.dialect.name != "sqlite":
+        return False
+    exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                          {"name": FTS_TABLE}).first() is not None
+    try:
+        for statement in CREATE_STATEMENTS:
+            conn.execute(text(statement))
+    except OperationalError as e:
+        Log.w(TAG, f"Full-text search unavailable, falling back to LIKE: {e}")
+        return False
+    if not exists:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE} (item_id, title, summary, content, source) "
+                          f"SELECT id, title, summary, content, source FROM news_items"))
+    return True
+
+
+def partition_key(epoch_ms: Optional[int]) -> Optional[str]:
+    """
+    :return: "YYYYMM" (UTC) of the month holding the timestamp, None for a missing or invalid one.
+    """
+    if epoch_ms is None:
+        return None
+    try:
+        return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).strftime("%Y%m")
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def row_partition_key(row: Dict) -> str:
+    # Items are filed by release time, so an edition of a period reads one partition
+    return partition_key(row.get("datetime_released")) or partition_key(row["created_at"])
+
+
+def months_back(key: str, months: int) -> str:
+    year, month = int(key[:4]), int(key[4:])
+    index = year * 12 + month - 1 - months
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+class NewsPartition:
+    """
+    The news items of one month: the engine to reach them and the news_items table inside it.
+    """
+
+    def __init__(self, key: str, engine, table: Table, manager: Optional[DatabaseManager] = None):
+        self.key = key
+        self.engine = engine
+        self.table = table
+        self.has_fts = False
+        self._manager = manager
+
+    def dispose(self, close: bool = True):
+        if self._manager and self._manager._engine:
+            self._manager._engine.dispose(close=close)
+
+
+class NewsPartitions:
+    """
+    Month partitions of the news items. Writes go to the partition of an item's release month, reads only
+    open the partitions of the months they ask for, and retention retires whole partitions (removing or
+    moving a file, dropping or renaming a table) instead of deleting rows.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(NewsPartitions, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._sqlite = data_db_manager.db_url.startswith("sqlite")
+        self._partitions: Dict[str, NewsPartition] = {}
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(PARTITION_DIR, f"news_{key}.db")
+
+    def keys(self) -> List[str]:
+        """
+        Keys of the existing partitions, newest first. Read from disk / the catalog on every call, so
+        partitions created or retired by another process are seen.
+        """
+        if self._sqlite:
+            if not os.path.isdir(PARTITION_DIR):
+                return []
+            matches = (PARTITION_FILE.match(name) for name in os.listdir(PARTITION_DIR))
+        else:
+            data_db_manager.init_db()
+            matches = (PARTITION_TABLE.match(name) for name in inspect(data_db_manager._engine).get_table_names())
+        return sorted((match.group(1) for match in matches if match), reverse=True)
+
+    def _open(self, key: str) -> NewsPartition:
+        if self._sqlite:
+            # Same table and index names in every file, the full-text triggers refer to news_items
+            manager = DatabaseManager(f"sqlite:///{self._file_path(key)}", f"NEWS_{key}")
+            manager.init_db()
+            table = NewsItem.__table__.to_metadata(MetaData())
+            partition = NewsPartition(key, manager._engine, table, manager)
+        else:
+            data_db_manager.init_db()
+            name = f"news_items_{key}"
+            table = NewsItem.__table__.to_metadata(MetaData(), name=name)
+            for index in table.indexes:
+                # Index names are unique per database
+                index.name = index.name.replace("ix_news_items", f"ix_{name}")
+            partition = NewsPartition(key, data_db_manager._engine, table)
+
+        table.create(partition.engine, checkfirst=True)
+        if self._sqlite:
+            with partition.engine.begin() as conn:
+                partition.has_fts = create_search_index(conn)
+        return partition
+
+    def get(self, key: str, create: bool = False) -> Optional[NewsPartition]:
+        with self._lock:
+            partition = self._partitions.get(key)
+            if partition is not None:
+                return partition
+            if not create and key not in self.keys():
+                return None
+            partition = self._open(key)
+            self._partitions[key] = partition
+            return partition
+
+    def partitions(self, since_key: Optional[str] = None) -> List[NewsPartition]:
+        """
+        Existing partitions from since_key (inclusive, all when None) on, newest first.
+        """
+        keys = self.keys()
+        with self._lock:
+            # Retired by another process
+            for key in set(self._partitions) - set(keys):
+                self._partitions.pop(key).dispose()
+        return [partition for partition in (self.get(key) for key in keys if since_key is None or key >= since_key)
+                if partition is not None]
+
+    def retire_before(self, key: str, action: str = RETENTION_DROP) -> List[str]:
+        """
+        Drop or archive every partition older than key.
+        :return: Keys of the retired partitions.
+        """
+        retired = [old for old in self.keys() if old < key]
+        for old in retired:
+            partition = self.get(old)
+            with self._lock:
+                self._partitions.pop(old, None)
+            if self._sqlite:
+                self._retire_file(partition, action)
+            else:
+                self._retire_table(partition, action)
+            Log.i(TAG, f"{'Archived' if action == RETENTION_ARCHIVE else 'Dropped'} news partition {old}")
+        return retired
+
+    def _retire_file(self, partition: NewsPartition, action: str):
+        path = self._file_path(partition.key)
+        if action == RETENTION_ARCHIVE:
+            # Fold the WAL into the file first, the archived file is then complete on its own
+            with partition.engine.connect() as conn:
+                conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        partition.dispose()
+        if action == RETENTION_ARCHIVE:
+            os.makedirs(ARCHIVE_DIR, exist_ok=True)
+            shutil.move(path, os.path.join(ARCHIVE_DIR, os.path.basename(path)))
+        else:
+            os.remove(path)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    @staticmethod
+    def _retire_table(partition: NewsPartition, action: str):
+        if action == RETENTION_ARCHIVE:
+            with partition.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {partition.table.name} RENAME TO archived_{partition.table.name}"))
+        else:
+            partition.table.drop(partition.engine)
+
+    def dispose_after_fork(self):
+        """Drop pooled connections inherited from the parent process. Call first thing in a forked child."""
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.dispose(close=False)
+
+    def close(self):
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.dispose()
+            self._partitions.clear()
@@ -0,0 +1,95 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, text
+
+from src.database.models import NewsItem
+from src.scraper.storage.news_partitions import FTS_TABLE, NewsPartition, NewsPartitions
+
+TAG = "NEWS_SEARCH"
+
+# The trigram tokenizer indexes every 3 characters, which works for CJK text without word segmentation.
+# Query terms shorter than this cannot use the index and are matched with LIKE on the indexed rows.
+MIN_INDEXED_TERM_LENGTH = 3
+# bm25 weights of item_id, title, summary, content, source
+RANK_WEIGHTS = "0.0, 10.0, 5.0, 1.0, 2.0"
+MAX_SEARCH_LIMIT = 100
+
+SEARCH_COLUMNS = ("title", "summary", "content", "source")
+
+
+def _quote_term(term: str) -> str:
+    # A quoted FTS5 string matches the term literally, operators and punctuation included
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term: str) -> str:
+    # "!" rather than a backslash, which MySQL would read as an escape inside the ESCAPE literal itself
+    return term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def _like_clause(alias: str, index: int) -> str:
+    return "(" + " OR ".join(f"{alias}.{column} LIKE :like_{index} ESCAPE '!'" for column in SEARCH_COLUMNS) + ")"
+
+
+def _search_partition(partition: NewsPartition, terms: List[str], indexed_terms: List[str],
+                      module_id: Optional[str], count: int) -> List[Tuple[float, int, str]]:
+    """
+    :return: Up to count (score, -released, id) of the best matches in the partition, lower sorts first.
+    """
+    # Without an indexed term news_items is walked newest first, which stops as soon as the page is full
+    alias = FTS_TABLE if indexed_terms else "n"
+    conditions = []
+    params = {"limit": count}
+    for index, term in enumerate(term for term in terms if term not in indexed_terms):
+        conditions.append(_like_clause(alias, index))
+        params[f"like_{index}"] = f"%{_escape_like(term)}%"
+    if indexed_terms:
+        conditions.append(f"{FTS_TABLE} MATCH :match")
+        params["match"] = " ".join(_quote_term(term) for term in indexed_terms)
+    if module_id:
+        conditions.append("n.module_id = :module_id")
+        params["module_id"] = module_id
+
+    table = partition.table.name
+    score = f"bm25({FTS_TABLE}, {RANK_WEIGHTS})" if indexed_terms else "0"
+    source = f"{FTS_TABLE} JOIN {table} AS n ON n.id = {FTS_TABLE}.item_id" if indexed_terms else f"{table} AS n"
+    sql = (f"SELECT {score} AS score, n.datetime_released, n.id FROM {source} WHERE {' AND '.join(conditions)} "
+           f"ORDER BY score, n.datetime_released DESC LIMIT :limit")
+    with partition.engine.connect() as conn:
+        return [(score, -(released or 0), item_id) for score, released, item_id in conn.execute(text(sql), params)]
+
+
+def search_news_items(query: str, module_id: Optional[str] = None, limit: int = 20, offset: int = 0) -> Dict:
+    """
+    Items containing every whitespace separated term of query in their title, summary, content or source,
+    best matches first (title hits weigh most), newest first among equals.
+    Ranked searches merge the best matches of every month partition; unranked ones read partitions newest
+    first and stop once the page is full.
+    :return: {"items": [...], "has_more": bool}
+    """
+    terms = [term for term in query.split() if term]
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    offset = max(0, offset)
+    if not terms:
+        return {"items": [], "has_more": False}
+
+    partitions = NewsPartitions().partitions()
+    use_fts = bool(partitions) and all(partition.has_fts for partition in partitions)
+    indexed_terms = [term for term in terms if len(term) >= MIN_INDEXED_TERM_LENGTH] if use_fts else []
+    needed = offset + limit + 1
+
+    matches: List[Tuple[float, int, str, NewsPartition]] = []
+    for partition in partitions:
+        matches.extend(hit + (partition,) for hit in _search_partition(partition, terms, indexed_terms, module_id, needed))
+        if not indexed_terms and len(matches) >= needed:
+            break
+    matches.sort(key=lambda match: match[:2])
+    page = matches[offset:offset + limit]
+
+    items = {}
+    for partition in {match[3] for match in page}:
+        ids = [match[2] for match in page if match[3] is partition]
+        with partition.engine.connect() as conn:
+            for row in conn.execute(select(partition.table).where(partition.table.c.id.in_(ids))):
+                items[row.id] = NewsItem.row_to_dict(row)
+    return {"items": [items[match[2]] for match in page if match[2] in items], "has_more": len(matches) > offset + limit}
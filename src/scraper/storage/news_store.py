@@ -0,0 +1,227 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.database.models.base_model import get_utc_timestamp_ms
+from src.database.models import NewsItem
+from src.scraper.storage.blob_store import BlobStore
+from src.scraper.storage.fingerprint_index import FingerprintIndex
+from src.scraper.storage.near_duplicates import NearDuplicateIndex, item_text, simhash, to_signed, to_unsigned
+from src.scraper.storage.news_partitions import RETENTION_DROP, NewsPartitions, months_back, partition_key, row_partition_key
+from src.utils.logger.logger import Log
+
+TAG = "NEWS_STORE"
+
+# Results buffered per task run before they are written in one transaction.
+SAVE_BATCH_SIZE = 200
+
+# Metadata fields moved into the blob store on save, the row keeps their hash under "<field>_blob".
+BLOB_FIELDS = ("raw_html",)
+
+
+def _to_epoch_ms(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        # Seconds or milliseconds, anything past year 33658 in seconds is already milliseconds
+        return int(value if value > 1e12 else value * 1000)
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    try:
+        return int(datetime.fromisoformat(str(value)).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+def _offload_blobs(meta):
+    if not isinstance(meta, dict) or not any(meta.get(field) for field in BLOB_FIELDS):
+        return meta
+    meta = dict(meta)
+    for field in BLOB_FIELDS:
+        data = meta.pop(field, None)
+        if data:
+            meta[f"{field}_blob"] = BlobStore().put(data)
+    return meta
+
+
+def to_row(module_id: str, value: Dict, fingerprint: str = "") -> Dict:
+    """
+    Map a structured result (see save_structured_results) to a news_items row. canonical_id is filled in by
+    save_news_items.
+    """
+    now = get_utc_timestamp_ms()
+    item_id = str(uuid.uuid4())
+    signature = simhash(item_text(value))
+    return {
+        "id": item_id,
+        "is_deleted": False,
+        "created_at": now,
+        "updated_at": now,
+        "module_id": module_id,
+        "fingerprint": fingerprint or None,
+        "title": value.get("title") or "",
+        "summary": value.get("summary"),
+        "source": value.get("source"),
+        "from_url": value.get("from_url"),
+        "content": value.get("content"),
+        "content_type": value.get("content_type"),
+        "datetime_released": _to_epoch_ms(value.get("datetime_released")),
+        "quotation": value.get("quotation"),
+        "tags": value.get("tags"),
+        "meta": _offload_blobs(value.get("metadata")),
+        "simhash": to_signed(signature) if signature is not None else None,
+        "canonical_id": None
+    }
+
+
+def _insert_skipping_duplicates(dialect: str, table):
+    """
+    INSERT that skips rows conflicting with the unique (module_id, fingerprint) index.
+    """
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=["module_id", "fingerprint"])
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=["module_id", "fingerprint"])
+    return insert(table).prefix_with("IGNORE")
+
+
+def _repoint_rejected_canonicals(stored_rows: List[Dict], rejected_ids: Set[str]):
+    """
+    Rows clustered under an item of their own batch whose insert was skipped would point at a row that does
+    not exist. The first stored row of such a cluster becomes its canonical item instead.
+    """
+    replacements = {}
+    for row in stored_rows:
+        if row["canonical_id"] not in rejected_ids:
+            continue
+        rejected_id = row["canonical_id"]
+        row["canonical_id"] = replacements.get(rejected_id)
+        replacements.setdefault(rejected_id, row["id"])
+        partition = NewsPartitions().get(row_partition_key(row))
+        with partition.engine.begin() as conn:
+            conn.execute(update(partition.table).where(partition.table.c.id == row["id"])
+                         .values(canonical_id=row["canonical_id"]))
+
+
+def save_news_items(module_id: str, items: List[Dict]) -> int:
+    """
+    Insert a batch of results, one transaction per month partition (normally one), clustered with earlier
+    items of the same story. Results whose fingerprint the module already stored are skipped.
+    :param items: Dicts with "item" (the structured result) and "fingerprint".
+    :return: Number of inserted rows.
+    """
+    if not items:
+        return 0
+    rows = [to_row(module_id, entry["item"], entry.get("fingerprint") or "") for entry in items]
+    near_duplicates = NearDuplicateIndex()
+    canonical_ids = near_duplicates.match([(row["id"], to_unsigned(row["simhash"])) for row in rows
+                                           if row["simhash"] is not None])
+    by_partition = defaultdict(list)
+    for row in rows:
+        row["canonical_id"] = canonical_ids.get(row["id"])
+        by_partition[row_partition_key(row)].append(row)
+
+    stored = set()
+    for key, partition_rows in by_partition.items():
+        partition = NewsPartitions().get(key, create=True)
+        with partition.engine.begin() as conn:
+            # executemany of one prepared statement, a single commit for the whole batch
+            count = conn.execute(_insert_skipping_duplicates(conn.dialect.name, partition.table), partition_rows).rowcount
+            ids = [row["id"] for row in partition_rows]
+            if count < len(partition_rows):
+                ids = conn.execute(select(partition.table.c.id).where(partition.table.c.id.in_(ids))).scalars()
+            stored.update(ids)
+    inserted = len(stored)
+
+    _repoint_rejected_canonicals([row for row in rows if row["id"] in stored],
+                                 {row["id"] for row in rows} - stored)
+    near_duplicates.add([(row["id"], to_unsigned(row["simhash"]), row["canonical_id"] or row["id"])
+                         for row in rows if row["id"] in stored and row["simhash"] is not None])
+    FingerprintIndex().add(module_id, [row["fingerprint"] for row in rows])
+    if inserted < len(rows):
+        Log.i(TAG, f"[{module_id}] Saved {inserted} items, {len(rows) - inserted} already stored")
+    else:
+        Log.i(TAG, f"[{module_id}] Saved {inserted} items")
+    return inserted
+
+
+def filter_new_fingerprints(module_id: str, fingerprints: List[str]) -> List[str]:
+    return FingerprintIndex().filter_new(module_id, fingerprints)
+
+
+def get_item_blob(item_id: str, field: str) -> Optional[str]:
+    """
+    Load a metadata field of a stored item that was moved into the blob store, such as its raw_html.
+    """
+    if field not in BLOB_FIELDS:
+        return None
+    for partition in NewsPartitions().partitions():
+        with partition.engine.connect() as conn:
+            row = conn.execute(select(partition.table.c.meta).where(partition.table.c.id == item_id)).first()
+        if row is not None:
+            blob_hash = (row.meta or {}).get(f"{field}_blob")
+            return BlobStore().get_text(blob_hash) if blob_hash else None
+    return None
+
+
+def get_item_duplicates(item_id: str) -> List[Dict]:
+    """
+    Items clustered under item_id as the same story, oldest first.
+    """
+    items = []
+    for partition in NewsPartitions().partitions():
+        table = partition.table
+        with partition.engine.connect() as conn:
+            items.extend(NewsItem.row_to_dict(row) for row in conn.execute(select(table).where(table.c.canonical_id == item_id)))
+    return sorted(items, key=lambda item: item["created_at"])
+
+
+def get_latest_news_items(since_ms: int, limit: int = 50) -> List[Dict]:
+    """
+    Items released (saved, when they have no release time) since since_ms, newest first. Only the partitions
+    of the months since then are read, today's edition touches the current month alone.
+    """
+    items = []
+    for partition in NewsPartitions().partitions(since_key=partition_key(since_ms)):
+        table = partition.table
+        released = func.coalesce(table.c.datetime_released, table.c.created_at)
+        query = select(table).where(or_(table.c.datetime_released >= since_ms,
+                                        and_(table.c.datetime_released.is_(None), table.c.created_at >= since_ms))) \
+            .order_by(released.desc()).limit(limit - len(items))
+        with partition.engine.connect() as conn:
+            items.extend(NewsItem.row_to_dict(row) for row in conn.execute(query))
+        if len(items) >= limit:
+            break
+    return items
+
+
+def apply_retention(months: int, action: str = RETENTION_DROP) -> List[str]:
+    """
+    Retire the partitions of months before the last `months` months (the current one included).
+    :param months: 0 keeps everything.
+    :return: Keys of the retired partitions.
+    """
+    if months <= 0:
+        return []
+    cutoff = months_back(partition_key(get_utc_timestamp_ms()), months - 1)
+    return NewsPartitions().retire_before(cutoff, action)
+
+
+def collect_blobs() -> int:
+    """
+    Remove blobs no stored item references anymore, run after the retention policy retired partitions.
+    Archived partitions keep their items but not their raw blobs.
+    """
+    referenced = set()
+    for partition in NewsPartitions().partitions():
+        table = partition.table
+        with partition.engine.connect() as conn:
+            for field in BLOB_FIELDS:
+                blob = table.c.meta[f"{field}_blob"].as_string()
+                query = select(blob).where(blob.isnot(None)).execution_options(yield_per=10_000)
+                referenced.update(conn.execute(query).scalars())
+    return BlobStore().collect(referenced)
@@ -23,6 +23,8 @@ class I18nManager:
         self.current_locale = self.default_locale
         self.translations: Dict[str, Dict[str, str]] = {}
         self.base_locales_dir = os.path.join(os.path.dirname(__file__), "locales")
+        # Parsed locale files per directory from the last compile, loaded from cache on first use
+        self._sources: Optional[Dict] = None
         self._load_from_cache()
         if not self.translations:
             self._load_locales_from_dir(self.base_locales_dir, "base")
@@ -56,33 +58,70 @@ class I18nManager:
                 except Exception as e:
                     Log.e(TAG, f"Failed to load locale {filename} from {source_name}", error=e)
 
-    def compile_locales(self, module_locale_dirs: List[str]):
-        Log.i(TAG, "Compiling locales...")
-        merged_translations = {}
-        if os.path.exists(self.base_locales_dir):
-            for filename in os.listdir(self.base_locales_dir):
-                if filename.endswith(".json"):
-                    locale_code = filename[:-5]
-                    with open(os.path.join(self.base_locales_dir, filename), 'r', encoding='utf-8') as f:
-                        merged_translations[locale_code] = json.load(f)
+    def _read_locale_dir(self, directory: str) -> Dict[str, Dict[str, str]]:
+        result = {}
+        if not os.path.exists(directory):
+            return result
+        for filename in os.listdir(directory):
+            if filename.endswith(".json"):
+                locale_code = filename[:-5]
+                try:
+                    with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                        result[locale_code] = json.load(f)
+                except Exception as e:
+                    Log.w(TAG, f"Failed to merge locale from {directory}/{filename}: {e}")
+        return result
+
+    def _dir_signature(self, directory: str) -> List[List]:
+        if not os.path.exists(directory):
+            return []
+        signature = []
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".json"):
+                stat = os.stat(os.path.join(directory, filename))
+                signature.append([filename, stat.st_mtime_ns, stat.st_size])
+        return signature
+
+    def compile_locales(self, module_locale_dirs: List[str], changed_dirs: Optional[List[str]] = None):
+        """
+        Merge the base locales with the module locales, later directories overriding earlier ones.
+        :param changed_dirs: Module locale directories to re-read; the others reuse what was parsed
+                             by the previous compile. None re-reads everything.
+        """
+        if self._sources is None:
+            self._sources = cache_manager.get("locale_sources") or {}
+        sources = self._sources
+
+        reread = []
+        base_signature = self._dir_signature(self.base_locales_dir)
+        if sources.get("base_signature") != base_signature or "base" not in sources:
+            sources["base"] = self._read_locale_dir(self.base_locales_dir)
+            sources["base_signature"] = base_signature
+            reread.append(self.base_locales_dir)
+
+        modules = sources.setdefault("modules", {})
+        for module_dir in module_locale_dirs:
+            if changed_dirs is None or module_dir in changed_dirs or module_dir not in modules:
+                modules[module_dir] = self._read_locale_dir(module_dir)
+                reread.append(module_dir)
+        for module_dir in list(modules.keys()):
+            if module_dir not in module_locale_dirs:
+                del modules[module_dir]
+
+        if not reread and sources.get("order") == module_locale_dirs and self.translations:
+            Log.i(TAG, "Locales up to date, compile skipped.")
+            return
 
+        Log.i(TAG, f"Compiling locales ({len(reread)} directories re-read)...")
+        merged_translations = {locale_code: dict(trans) for locale_code, trans in sources["base"].items()}
         for module_dir in module_locale_dirs:
-            if not os.path.exists(module_dir):
-                continue
-            for filename in os.listdir(module_dir):
-                if filename.endswith(".json"):
-                    locale_code = filename[:-5]
-                    try:
-                        with open(os.path.join(module_dir, filename), 'r', encoding='utf-8') as f:
-                            module_trans = json.load(f)
-                            if locale_code not in merged_translations:
-                                merged_translations[locale_code] = {}
-                            merged_translations[locale_code].update(module_trans)
-                    except Exception as e:
-                        Log.w(TAG, f"Failed to merge locale from {module_dir}/{filename}: {e}")
+            for locale_code, module_trans in modules.get(module_dir, {}).items():
+                merged_translations.setdefault(locale_code, {}).update(module_trans)
+        sources["order"] = list(module_locale_dirs)
 
         for locale_code, trans in merged_translations.items():
             cache_manager.set(f"locales/{locale_code}", trans)
+        cache_manager.set("locale_sources", sources)
 
         self.translations = merged_translations
         Log.i(TAG, "Locales compiled and cached.")
@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
+import asyncio
 import re
+import time
 from src.database.connection import system_db_manager
-from src.database.models import ScraperModule, ScraperModuleConfig, ScraperModuleTask
-from src.web.dashboard.schemas import ScraperModuleResponse, ScraperModuleDetailResponse, TestModuleResponse, ScraperModuleConfigItem, ScraperModuleTaskResponse, ScraperModuleTaskItem
+from src.database.models import ScraperModule, ScraperModuleConfig, ScraperModuleTask, ScraperTaskRun
+from src.web.dashboard.schemas import ScraperModuleResponse, ScraperModuleDetailResponse, TestModuleResponse, ScraperModuleConfigItem, ScraperModuleTaskResponse, ScraperModuleTaskItem, ScraperTaskStatsResponse, ScraperModuleResourceResponse, ModuleTestResultsResponse
 from src.utils.logger.logger import Log
 from src.scraper.modules.module_manager import ModuleManager
+from src.scraper.modules.module_tester import ModuleTester
 from src.web.dependencies import get_db
 from src.utils.event import EventManager
 
@@ -17,6 +22,70 @@ async def get_modules(db: Session = Depends(get_db)):
     modules = db.query(ScraperModule).filter(ScraperModule.is_deleted == False).all()
     return modules
 
+@router.get("/resources", response_model=ScraperModuleResourceResponse)
+async def get_module_resources(days: int = 7, db: Session = Depends(get_db)):
+    """
+    Resource usage of scheduled task runs aggregated per module. Runs on the shared event loop report
+    the CPU time charged to them and the process RSS growth, but no peak RSS or disk I/O.
+    io_read_bytes / io_write_bytes are disk I/O, network traffic is bytes_fetched.
+    """
+    since = int((time.time() - max(1, days) * 86400) * 1000)
+    cpu_ms = func.coalesce(ScraperTaskRun.cpu_user_ms, 0) + func.coalesce(ScraperTaskRun.cpu_sys_ms, 0)
+    rows = db.query(
+        ScraperModule.module_id,
+        ScraperModule.name,
+        func.count(ScraperTaskRun.id),
+        func.count(ScraperTaskRun.cpu_user_ms),
+        func.sum(cpu_ms),
+        func.max(ScraperTaskRun.peak_rss_kb),
+        func.avg(ScraperTaskRun.rss_delta_kb),
+        func.sum(ScraperTaskRun.io_read_bytes),
+        func.sum(ScraperTaskRun.io_write_bytes),
+        func.sum(ScraperTaskRun.bytes_fetched),
+        func.sum(ScraperTaskRun.duration_ms)
+    ).join(ScraperTaskRun, ScraperTaskRun.module_id == ScraperModule.id).filter(
+        ScraperModule.is_deleted == False,
+        ScraperTaskRun.started_at >= since
+    ).group_by(ScraperModule.id, ScraperModule.module_id, ScraperModule.name).all()
+
+    module_list = []
+    for module_id, name, runs, measured, total_cpu, max_rss, avg_delta, io_read, io_write, fetched, duration in rows:
+        module_list.append({
+            "module_id": module_id,
+            "module_name": name,
+            "runs": runs,
+            "measured_runs": measured,
+            "total_cpu_ms": int(total_cpu or 0),
+            "avg_cpu_ms": int(total_cpu / measured) if measured else None,
+            "max_peak_rss_kb": max_rss,
+            "avg_rss_delta_kb": int(avg_delta) if avg_delta is not None else None,
+            "io_read_bytes": int(io_read or 0),
+            "io_write_bytes": int(io_write or 0),
+            "bytes_fetched": int(fetched or 0),
+            "total_duration_ms": int(duration or 0)
+        })
+    # Heaviest modules first
+    module_list.sort(key=lambda m: m["total_cpu_ms"], reverse=True)
+    return ScraperModuleResourceResponse(days=days, modules=module_list)
+
+@router.get("/tests", response_model=ModuleTestResultsResponse)
+async def get_module_test_results():
+    """
+    Last test result of every module, without running any test.
+    """
+    results = ModuleTester().get_results()
+    return ModuleTestResultsResponse(results=[dict(entry, module_id=module_id) for module_id, entry in results.items()])
+
+@router.post("/tests", response_model=ModuleTestResultsResponse)
+async def test_all_modules(force: bool = False, db: Session = Depends(get_db)):
+    """
+    Test every module concurrently. Results younger than the cache TTL are reused unless force is set.
+    """
+    module_ids = [m.module_id for m in db.query(ScraperModule.module_id).filter(ScraperModule.is_deleted == False).all()]
+    futures = ModuleTester().test_modules(module_ids, use_cache=not force)
+    entries = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+    return ModuleTestResultsResponse(results=[dict(entry, module_id=module_id) for module_id, entry in zip(module_ids, entries)])
+
 @router.get("/{module_id}", response_model=ScraperModuleDetailResponse)
 async def get_module_detail(module_id: str, db: Session = Depends(get_db)):
     # Do NOT reload modules here. Only read from DB and local cache.
@@ -69,7 +138,14 @@ async def get_module_tasks(module_id: str, db: Session = Depends(get_db)):
             "id": task.id,
             "key": task.task_key,
             "name": task.name,
-            "description": task.description
+            "description": task.description,
+            "cron": task.cron,
+            "last_fire_at": task.last_fire_at,
+            "misfire_policy": task.misfire_policy,
+            "misfire_grace": task.misfire_grace,
+            "jitter": task.jitter,
+            "spread": task.spread,
+            "timeout": task.timeout
         })
     
     return ScraperModuleTaskResponse(
@@ -78,14 +154,84 @@ async def get_module_tasks(module_id: str, db: Session = Depends(get_db)):
         tasks=task_list
     )
 
+def _percentile(sorted_values, pct):
+    # Nearest-rank percentile over an ascending list
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+@router.get("/{module_id}/tasks/stats", response_model=ScraperTaskStatsResponse)
+async def get_module_task_stats(module_id: str, days: int = 7, db: Session = Depends(get_db)):
+    module = db.query(ScraperModule).filter(ScraperModule.module_id == module_id, ScraperModule.is_deleted == False).first()
+    if not module:
+        raise HTTPException(status_code=404, detail="Module not found")
+
+    since = int((time.time() - max(1, days) * 86400) * 1000)
+    tasks = db.query(ScraperModuleTask).filter(ScraperModuleTask.module_id == module.id).all()
+    runs = db.query(
+        ScraperTaskRun.task_id,
+        ScraperTaskRun.started_at,
+        ScraperTaskRun.duration_ms,
+        ScraperTaskRun.item_count,
+        ScraperTaskRun.bytes_fetched,
+        ScraperTaskRun.status,
+        ScraperTaskRun.cpu_user_ms,
+        ScraperTaskRun.cpu_sys_ms,
+        ScraperTaskRun.peak_rss_kb,
+        ScraperTaskRun.rss_delta_kb
+    ).filter(
+        ScraperTaskRun.module_id == module.id,
+        ScraperTaskRun.started_at >= since
+    ).order_by(ScraperTaskRun.started_at.asc()).all()
+
+    runs_by_task = {}
+    for run in runs:
+        runs_by_task.setdefault(run.task_id, []).append(run)
+
+    task_list = []
+    for task in tasks:
+        task_runs = runs_by_task.get(task.id, [])
+        durations = sorted(r.duration_ms for r in task_runs)
+        total_items = sum(r.item_count for r in task_runs)
+        total_seconds = sum(durations) / 1000
+        measured = [r for r in task_runs if r.cpu_user_ms is not None]
+        peaks = [r.peak_rss_kb for r in task_runs if r.peak_rss_kb is not None]
+        rss_deltas = [r.rss_delta_kb for r in task_runs if r.rss_delta_kb is not None]
+        task_list.append({
+            "id": task.id,
+            "key": task.task_key,
+            "name": task.name,
+            "runs": len(task_runs),
+            "success_runs": sum(1 for r in task_runs if r.status == "success"),
+            "failed_runs": sum(1 for r in task_runs if r.status != "success"),
+            "p50_duration_ms": _percentile(durations, 50),
+            "p95_duration_ms": _percentile(durations, 95),
+            "total_items": total_items,
+            "items_per_sec": round(total_items / total_seconds, 3) if total_seconds > 0 else None,
+            "bytes_fetched": sum(r.bytes_fetched for r in task_runs),
+            "avg_cpu_ms": sum(r.cpu_user_ms + (r.cpu_sys_ms or 0) for r in measured) // len(measured) if measured else None,
+            "max_peak_rss_kb": max(peaks) if peaks else None,
+            "avg_rss_delta_kb": sum(rss_deltas) // len(rss_deltas) if rss_deltas else None,
+            "last_run_at": task_runs[-1].started_at if task_runs else None,
+            "last_status": task_runs[-1].status if task_runs else None
+        })
+
+    return ScraperTaskStatsResponse(
+        module_id=module.module_id,
+        module_name=module.name,
+        days=days,
+        tasks=task_list
+    )
+
 @router.post("/{module_id}/test_config", response_model=TestModuleResponse)
 async def test_module_config(module_id: str, config: Dict[str, Any] = Body(...)):
     """
     Test the provided configuration against the module's validation logic.
     """
-    local_manager = ModuleManager()
-    success, message = local_manager.test_module_config(module_id, config)
-    
+    result = await asyncio.wrap_future(ModuleTester().test_config(module_id, config))
+    success, message = result["success"], result["message"]
+
     if not success:
         EventManager.record(
             level=EventManager.LEVEL_WARNING,
@@ -129,7 +275,8 @@ async def update_module_config(module_id: str, req: Request, config: Dict[str, A
                     Log.w("CONFIG_UPDATE", f"Invalid regex for config {key}: {cfg_item.regex}")
 
     local_manager = ModuleManager()
-    success, message = local_manager.test_module_config(module_id, config)
+    result = await asyncio.wrap_future(ModuleTester().test_config(module_id, config))
+    success, message = result["success"], result["message"]
     if not success:
         EventManager.record(
             level=EventManager.LEVEL_WARNING,
@@ -149,8 +296,11 @@ async def update_module_config(module_id: str, req: Request, config: Dict[str, A
         ).first()
         if cfg_item:
             cfg_item.value = value
+    ModuleManager.bump_config_version(module)
     
     db.commit()
+    local_manager.invalidate_module_config(module_id)
+    ModuleTester().invalidate(module_id)
     
     current_user = getattr(req.state, "user", None)
     EventManager.record(
@@ -169,7 +319,10 @@ async def enable_module(module_id: str, req: Request):
     local_manager = ModuleManager()
     
     try:
-        if local_manager.enable_module(module_id):
+        # Enabling runs the module test, which may block on the network
+        enabled = await run_in_threadpool(local_manager.enable_module, module_id)
+        ModuleTester().invalidate(module_id)
+        if enabled:
             current_user = getattr(req.state, "user", None)
             EventManager.record(
                 level=EventManager.LEVEL_NORMAL,
@@ -214,15 +367,14 @@ async def disable_module(module_id: str, req: Request):
 
 @router.post("/{module_id}/test", response_model=TestModuleResponse)
 async def test_module(module_id: str):
-    local_manager = ModuleManager()
-    
-    success, message = local_manager.test_module(module_id)
-    return TestModuleResponse(success=success, message=message)
+    result = await asyncio.wrap_future(ModuleTester().test_module(module_id, use_cache=False))
+    return TestModuleResponse(success=result["success"], message=result["message"])
 
 @router.post("/reload")
 async def reload_modules(req: Request):
     local_manager = ModuleManager()
     local_manager.reload_modules()
+    ModuleTester().invalidate()
     
     current_user = getattr(req.state, "user", None)
     EventManager.record(
@@ -51,6 +51,13 @@ class ScraperModuleTaskItem(BaseModel):
     key: str
     name: str
     description: str
+    cron: Optional[str] = None
+    last_fire_at: Optional[int] = None
+    misfire_policy: Optional[str] = None
+    misfire_grace: Optional[int] = None
+    jitter: Optional[int] = None
+    spread: Optional[bool] = None
+    timeout: Optional[int] = None
 
 class ScraperModuleDetailResponse(ScraperModuleResponse):
     config: Dict[str, ScraperModuleConfigItem]
@@ -60,10 +67,64 @@ class ScraperModuleTaskResponse(BaseModel):
     module_name: str
     tasks: List[ScraperModuleTaskItem]
 
+class ScraperTaskStatsItem(BaseModel):
+    id: str
+    key: str
+    name: str
+    runs: int
+    success_runs: int
+    failed_runs: int
+    p50_duration_ms: Optional[int] = None
+    p95_duration_ms: Optional[int] = None
+    total_items: int
+    items_per_sec: Optional[float] = None
+    bytes_fetched: int
+    avg_cpu_ms: Optional[int] = None
+    max_peak_rss_kb: Optional[int] = None
+    avg_rss_delta_kb: Optional[int] = None
+    last_run_at: Optional[int] = None
+    last_status: Optional[str] = None
+
+class ScraperTaskStatsResponse(BaseModel):
+    module_id: str
+    module_name: str
+    days: int
+    tasks: List[ScraperTaskStatsItem]
+
+class ScraperModuleResourceItem(BaseModel):
+    module_id: str
+    module_name: str
+    runs: int
+    measured_runs: int
+    total_cpu_ms: int
+    avg_cpu_ms: Optional[int] = None
+    max_peak_rss_kb: Optional[int] = None
+    avg_rss_delta_kb: Optional[int] = None
+    io_read_bytes: int
+    io_write_bytes: int
+    bytes_fetched: int
+    total_duration_ms: int
+
+class ScraperModuleResourceResponse(BaseModel):
+    days: int
+    modules: List[ScraperModuleResourceItem]
+
 class TestModuleResponse(BaseModel):
     success: bool
     message: str
 
+class ModuleTestResultItem(BaseModel):
+    module_id: str
+    success: bool
+    message: str
+    tested_at: int
+    duration_ms: int
+    timed_out: bool = False
+    expired: bool = False
+
+class ModuleTestResultsResponse(BaseModel):
+    results: List[ModuleTestResultItem]
+
 class SystemEventResponse(BaseModel):
     id: str
     level: str
@@ -1,7 +1,39 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from src.scraper.storage.news_search import search_news_items, MAX_SEARCH_LIMIT
+from src.scraper.storage.news_store import get_item_blob, get_item_duplicates, get_latest_news_items
+from src.database.models.base_model import get_utc_timestamp_ms
 
 router = APIRouter(prefix="/api/newspaper", tags=["Newspaper"])
 
 @router.get("/latest")
-async def get_latest_news():
-    return {"news": []}
+def get_latest_news(
+    hours: int = Query(24, ge=1, le=24 * 31),
+    limit: int = Query(50, ge=1, le=200)
+):
+    # Reads only the month partitions the window reaches into
+    since = get_utc_timestamp_ms() - hours * 3600 * 1000
+    return {"news": get_latest_news_items(since, limit=limit)}
+
+@router.get("/search")
+def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    module_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(0, ge=0)
+):
+    return search_news_items(q, module_id=module_id, limit=limit, offset=offset)
+
+@router.get("/items/{item_id}/raw_html")
+def get_item_raw_html(item_id: str):
+    # Loaded on demand, item listings only carry metadata.raw_html_blob. Returned as JSON rather than
+    # text/html so scraped markup is never rendered on this origin.
+    raw_html = get_item_blob(item_id, "raw_html")
+    if raw_html is None:
+        raise HTTPException(status_code=404, detail="Raw HTML not found")
+    return {"raw_html": raw_html}
+
+@router.get("/items/{item_id}/duplicates")
+def get_item_duplicates_list(item_id: str):
+    # Reposts of the story in other channels, see NewsItem.canonical_id
+    return {"items": get_item_duplicates(item_id)}